@@ -0,0 +1,39 @@
+"""Benchmark :func:`clean_text_batch` against ``Series.apply(clean_text)``.
+
+Usage::
+
+    python -m nlp_pipeline.benchmarks.bench_clean_text [CORPUS] [--rows N]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from ..preprocess import clean_text, clean_text_batch
+from . import best_of, load_corpus
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", default=None)
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    texts = load_corpus(args.corpus, args.rows).fillna("").astype(str)
+    ascii_share = (~texts.str.contains(r"[^\x00-\x7f]|&", regex=True)).mean()
+
+    t_apply, expected = best_of(lambda: texts.apply(clean_text), args.repeat)
+    t_batch, result = best_of(lambda: clean_text_batch(texts), args.repeat)
+    if result.tolist() != expected.tolist():
+        raise SystemExit("clean_text_batch output differs from clean_text")
+
+    print(f"rows:              {len(texts):,}")
+    print(f"fast-path rows:    {ascii_share:.1%}")
+    print(f"apply(clean_text): {t_apply:.3f}s")
+    print(f"clean_text_batch:  {t_batch:.3f}s  ({t_apply / t_batch:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
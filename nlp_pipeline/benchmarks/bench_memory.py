@@ -0,0 +1,108 @@
+"""Peak memory of Stages 0-2 with and without per-stage copies.
+
+Each mode runs in a fresh process: the corpus is loaded, the stages are
+warmed up on a few rows, the resident set size noted, then ``validate_schema`` -> ``preprocess_dataframe`` ->
+``RuleMiner.match_dataframe`` run with ``copy=True`` (the default) or
+``copy=False`` (copy-on-write views, Arrow-backed text and column-wise
+validation, as used by the streaming pipeline).  Rules collect spans for
+matched labels only, as ``run_stages`` does.  Reported is the growth of the peak RSS over that
+baseline, next to the in-memory size of the input.
+
+Usage::
+
+    python -m nlp_pipeline.benchmarks.bench_memory [CORPUS] [--rows N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import multiprocessing as mp
+import resource
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from . import load_corpus
+
+_MODES = {"copy": True, "shared": False}
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (Linux ``/proc``; else the peak)."""
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return _peak_mb()
+
+
+def _peak_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def _measure(
+    corpus: str | None, rows: int | None, copy: bool, stage: str,
+) -> dict[str, float]:
+    from ..data_ingest import validate_schema
+    from ..preprocess import preprocess_dataframe
+    from ..rule_miner import RuleMiner
+    from ..utils import set_log_level
+
+    set_log_level("WARNING")
+    miner = RuleMiner()
+    texts = load_corpus(corpus, rows)
+    raw = pd.DataFrame({"text": texts.to_numpy(dtype=object)})
+    raw["comment_id"] = [f"c{i}" for i in range(len(raw))]
+    data_mb = raw.memory_usage(deep=True).sum() / 2**20
+
+    def run(frame: pd.DataFrame) -> pd.DataFrame:
+        df = validate_schema(frame, copy=copy) if stage == "pipeline" else frame
+        # Language detection is slow and allocates nothing that is kept.
+        df = preprocess_dataframe(df, detect_language=False, memoize=True, copy=copy)
+        if stage == "pipeline":
+            df = miner.match_dataframe(df, memoize=True, copy=copy, spans="matched")
+        return df
+
+    # Warm up on a few rows, so one-time setup (compiled patterns, the
+    # emoji tables) is not counted as a cost of the data.
+    run(raw.head(100))
+    gc.collect()
+    baseline = _rss_mb()
+    run(raw)
+    return {"data_mb": data_mb, "peak_mb": _peak_mb() - baseline}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", default=None)
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--stage", choices=("pipeline", "preprocess"), default="pipeline")
+    args = parser.parse_args(argv)
+
+    # A fresh process per mode, so one run's peak cannot mask the other's.
+    ctx = mp.get_context("spawn")
+    results = {}
+    for name, copy in _MODES.items():
+        with ctx.Pool(1) as pool:
+            results[name] = pool.apply(
+                _measure, (args.corpus, args.rows, copy, args.stage),
+            )
+
+    data_mb = results["copy"]["data_mb"]
+    print(f"input text:        {data_mb:,.1f} MB")
+    for name, copy in _MODES.items():
+        peak = results[name]["peak_mb"]
+        print(
+            f"copy={str(copy):<5}  peak: {peak:,.1f} MB "
+            f"({peak / data_mb:.1f}x input)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
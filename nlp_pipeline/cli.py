@@ -0,0 +1,406 @@
+"""Command-line interface for the critique detection pipeline.
+
+Run ``python -m nlp_pipeline --help`` for the list of sub-commands.
+
+Examples
+--------
+Run all stages over a JSONL export, four worker processes::
+
+    python -m nlp_pipeline run data/comments.jsonl --out results.parquet --workers 4
+
+Only validate and preprocess, in chunks of 2,000 rows::
+
+    python -m nlp_pipeline run data/comments.jsonl --out clean.jsonl \\
+        --stages ingest,preprocess --chunk-size 2000
+
+Process each duplicate comment only once (results are copied to every copy)::
+
+    python -m nlp_pipeline run data/comments.jsonl --out results.parquet \\
+        --stages ingest,dedup,preprocess,rules
+
+Scrape every video in the URL list; a rerun skips finished videos and the
+comments already written for unfinished ones::
+
+    python -m nlp_pipeline scrape data/youtube_urls.csv --out-dir data/raw_comments \\
+        --workers 4 --rate 2 --merge data/comments.jsonl
+
+Index preprocessed comments and preview a candidate phrase::
+
+    python -m nlp_pipeline index data/results.parquet --out-dir data/index
+    python -m nlp_pipeline query data/index --all "sounds the same" --not "not"
+
+Split the merged export into one Parquet partition per song::
+
+    python -m nlp_pipeline partition data/comments_merged.json --out data/comments
+
+Label comments while a release-week scrape is still running::
+
+    python -m nlp_pipeline scrape data/youtube_urls.csv --out-dir data/raw_comments \\
+        --classify-out data/live_labels.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Optional, Sequence
+
+from .pipeline import (
+    DEFAULT_STAGES,
+    STAGES,
+    ChunkWriter,
+    classify_stream,
+    run_pipeline,
+)
+from .utils import set_log_level
+
+
+def _parse_stages(value: str) -> list[str]:
+    """argparse type for a comma-separated list of stage names."""
+    stages = [s.strip().lower() for s in value.split(",") if s.strip()]
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown stage(s) {unknown}; choose from {','.join(STAGES)}"
+        )
+    if not stages:
+        raise argparse.ArgumentTypeError("at least one stage is required")
+    return stages
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for a strictly positive integer."""
+    try:
+        n = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}") from exc
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {n}")
+    return n
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the top-level argument parser."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Logging verbosity (default: INFO).",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp_pipeline",
+        description="Adorno critique detection pipeline.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    # -- run ---------------------------------------------------------------
+    run = sub.add_parser(
+        "run",
+        parents=[common],
+        help="Stream an input file through ingest -> preprocess -> rules.",
+    )
+    run.add_argument(
+        "input",
+        help="Input comments file (.csv, .json, .jsonl).  CSV and JSONL are "
+             "streamed; a .json array is loaded whole before chunking, so "
+             "convert large ones to JSONL first (e.g. jq -c '.[]').",
+    )
+    run.add_argument(
+        "--out", required=True,
+        help="Output file (.parquet, .jsonl, or .csv); written incrementally.",
+    )
+    run.add_argument(
+        "--stages", type=_parse_stages, default=list(DEFAULT_STAGES),
+        help=f"Comma-separated stages to run, from {','.join(STAGES)} "
+             f"(default: {','.join(DEFAULT_STAGES)}).",
+    )
+    run.add_argument(
+        "--chunk-size", type=_positive_int, default=5_000,
+        help="Rows per chunk (default: 5000).",
+    )
+    run.add_argument(
+        "--workers", type=_positive_int, default=1,
+        help="Worker processes; 1 runs in-process (default: 1).",
+    )
+    run.add_argument(
+        "--format", default="auto", choices=["auto", "csv", "json", "jsonl"],
+        help="Input format (default: inferred from extension).",
+    )
+    run.add_argument(
+        "--out-format", default="auto", choices=["auto", "parquet", "jsonl", "csv"],
+        help="Output format (default: inferred from extension).",
+    )
+    run.add_argument("--rules", default=None, help="Alternative regex_rules.yaml.")
+    run.add_argument(
+        "--text-col", default="text",
+        help="Column holding the comment text (default: text).",
+    )
+    run.add_argument(
+        "--reference-time", default=None,
+        help="When the comments were scraped (ISO-8601, UTC if no offset); "
+             "needed to date relative 'time' strings in published_ts.",
+    )
+    run.set_defaults(func=_cmd_run)
+
+    # -- scrape ------------------------------------------------------------
+    scrape = sub.add_parser(
+        "scrape",
+        parents=[common],
+        help="Concurrently scrape YouTube comments with resumable checkpoints.",
+    )
+    scrape.add_argument(
+        "urls", help="CSV with 'YouTube URL', 'Song Title' and 'Artists' columns.",
+    )
+    scrape.add_argument(
+        "--out-dir", required=True,
+        help="Directory for per-video JSONL files and the checkpoint.",
+    )
+    scrape.add_argument(
+        "--workers", type=_positive_int, default=4,
+        help="Videos fetched concurrently (default: 4).",
+    )
+    scrape.add_argument(
+        "--rate", type=float, default=2.0,
+        help="Global requests per second; 0 disables limiting (default: 2).",
+    )
+    scrape.add_argument(
+        "--max-comments", type=_positive_int, default=None,
+        help="Global cap on comments written in this run.",
+    )
+    scrape.add_argument(
+        "--sort", default="recent", choices=["popular", "recent"],
+        help="Comment sort order (default: recent).  Rerunning after an "
+             "interruption downloads each unfinished video's comments again "
+             "and skips the ones already written; only 'recent' supports "
+             "this.",
+    )
+    scrape.add_argument(
+        "--merge", default=None,
+        help="Also merge all per-video files into this JSONL file.",
+    )
+    scrape.add_argument(
+        "--classify-out", default=None,
+        help="Classify comments in micro-batches while scraping and write "
+             "the labelled rows to this file (.parquet, .jsonl, or .csv).",
+    )
+    scrape.add_argument(
+        "--batch-size", type=_positive_int, default=100,
+        help="Micro-batch size for --classify-out (default: 100).",
+    )
+    scrape.set_defaults(func=_cmd_scrape)
+
+    # -- report ------------------------------------------------------------
+    report = sub.add_parser(
+        "report",
+        parents=[common],
+        help="Write the per-song and matched-comment Markdown reports.",
+    )
+    report.add_argument(
+        "input", help="Pipeline output or comments file (.parquet, .jsonl, .json, .csv).",
+    )
+    report.add_argument(
+        "--out-dir", default="reports", help="Report directory (default: reports).",
+    )
+    report.add_argument(
+        "--top", type=_positive_int, default=25,
+        help="Comments per song (default: 25).",
+    )
+    report.add_argument(
+        "--metric", action="append", default=None,
+        help="Write an extra top-N report ranked by this metric (length, likes, "
+             "replies, confidence, confidence:<LABEL>, or a numeric column). "
+             "May be repeated.",
+    )
+    report.set_defaults(func=_cmd_report)
+
+    # -- partition ---------------------------------------------------------
+    partition = sub.add_parser(
+        "partition",
+        parents=[common],
+        help="Ingest a comments export into a Hive-partitioned Parquet dataset.",
+    )
+    partition.add_argument("input", help="Comments export (CSV, JSON, or JSONL).")
+    partition.add_argument("--out", required=True, help="Dataset directory.")
+    partition.add_argument(
+        "--by", default="song_title", choices=["song_title", "video_id"],
+        help="Partition column (default: song_title).",
+    )
+    partition.set_defaults(func=_cmd_partition)
+
+    # -- index / query -----------------------------------------------------
+    index = sub.add_parser(
+        "index",
+        parents=[common],
+        help="Build an inverted token/bigram index over a pipeline output.",
+    )
+    index.add_argument(
+        "input", help="Preprocessed comments (.parquet, .jsonl, .json, .csv).",
+    )
+    index.add_argument("--out-dir", required=True, help="Index directory.")
+    index.add_argument(
+        "--text-col", default="clean_text",
+        help="Column to index (default: clean_text).",
+    )
+    index.set_defaults(func=_cmd_index)
+
+    query = sub.add_parser(
+        "query",
+        parents=[common],
+        help="Query an index built with 'index'.",
+    )
+    query.add_argument("index_dir", help="Index directory.")
+    query.add_argument(
+        "--all", dest="all_of", action="append", default=[],
+        help="Term or phrase every row must contain (repeatable).",
+    )
+    query.add_argument(
+        "--any", dest="any_of", action="append", default=[],
+        help="Rows must contain at least one of these (repeatable).",
+    )
+    query.add_argument(
+        "--not", dest="none_of", action="append", default=[],
+        help="Term or phrase to exclude (repeatable).",
+    )
+    query.add_argument(
+        "--regex", default=None,
+        help="Regex run on the rows matched by the term filters only.",
+    )
+    query.add_argument(
+        "--facet", default="song_title",
+        help="Facet to count matches by (default: song_title).",
+    )
+    query.add_argument(
+        "--show", type=int, default=5, help="Example texts to print (default: 5).",
+    )
+    query.set_defaults(func=_cmd_query)
+
+    return parser
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    summary = run_pipeline(
+        args.input,
+        args.out,
+        stages=args.stages,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        format=args.format,
+        out_format=args.out_format,
+        rules_path=args.rules,
+        text_col=args.text_col,
+        reference_time=args.reference_time,
+    )
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+def _cmd_scrape(args: argparse.Namespace) -> int:
+    from .scraper import (
+        CommentScraper,
+        DownloaderPageSource,
+        load_video_tasks,
+        merge_video_files,
+    )
+
+    source = DownloaderPageSource(sort_by=0 if args.sort == "popular" else 1)
+    scraper = CommentScraper(
+        args.out_dir,
+        source,
+        workers=args.workers,
+        rate=args.rate,
+        max_comments=args.max_comments,
+    )
+    tasks = load_video_tasks(args.urls)
+    if args.classify_out:
+        coverage: dict = {}
+        with ChunkWriter(args.classify_out) as writer:
+            for update in classify_stream(
+                scraper.iter_comments(tasks), batch_size=args.batch_size,
+            ):
+                writer.write(update.batch)
+                coverage = update.coverage
+        summary = dict(scraper.last_summary or {})
+        summary["coverage"] = coverage
+    else:
+        summary = scraper.scrape(tasks)
+    if args.merge:
+        summary["merged"] = merge_video_files(args.out_dir, args.merge)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary.get("videos_failed") else 0
+
+
+def _cmd_report(args: argparse.Namespace) -> int:
+    from .reports import read_results, write_all_reports, write_top_report
+
+    df = read_results(args.input)
+    written = write_all_reports(df, args.out_dir, k=args.top)
+    for metric in args.metric or []:
+        name = metric.replace(":", "_").lower()
+        written[f"top_{name}"] = write_top_report(
+            df, f"{args.out_dir}/top_{name}_by_song.md", metric=metric, k=args.top,
+        )
+    print(json.dumps({k: str(v) for k, v in written.items()}, indent=2))
+    return 0
+
+
+def _cmd_partition(args: argparse.Namespace) -> int:
+    from .data_ingest import ingest, write_partitioned
+
+    df = ingest(args.input)
+    root = write_partitioned(df, args.out, partition_by=args.by)
+    print(json.dumps({
+        "rows": len(df),
+        "partitions": int(df[args.by].nunique(dropna=False)),
+        "output": str(root),
+    }, indent=2))
+    return 0
+
+
+def _cmd_index(args: argparse.Namespace) -> int:
+    from .reports import read_results
+    from .text_index import InvertedIndex
+
+    index = InvertedIndex.build(read_results(args.input), text_col=args.text_col)
+    index.save(args.out_dir)
+    print(json.dumps({
+        "rows": index.n_rows,
+        "terms": len(index.vocab),
+        "bigrams": len(index.bigrams),
+        "output": args.out_dir,
+    }, indent=2))
+    return 0
+
+
+def _cmd_query(args: argparse.Namespace) -> int:
+    from .text_index import InvertedIndex
+
+    index = InvertedIndex.load(args.index_dir)
+    rows = index.search(args.all_of, args.any_of, args.none_of)
+    if args.regex:
+        rows = index.preview_regex(args.regex, rows)
+    facets = (
+        index.facet_counts(rows, args.facet).head(10).to_dict()
+        if args.facet in index.facets else {}
+    )
+    print(json.dumps({
+        "hits": int(len(rows)),
+        "hit_pct": round(len(rows) / index.n_rows * 100, 2) if index.n_rows else 0.0,
+        f"top_{args.facet}": {str(k): int(v) for k, v in facets.items()},
+        "examples": index.texts(rows[:args.show]),
+    }, indent=2, ensure_ascii=False))
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """CLI entry point.  Returns the process exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    set_log_level(args.log_level)
+    try:
+        return args.func(args)
+    except (FileNotFoundError, ValueError, KeyError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
@@ -9,6 +9,10 @@ Responsibilities
   language distribution.
 * Handle edge cases: empty text, emoji-only, extremely long text, encoding
   issues.
+* Write and read Hive-partitioned Parquet datasets (one directory per song
+  or video), so one song can be loaded without the rest.
+* Turn YouTube's relative ``time`` strings ("3 months ago") into approximate
+  ``published_ts`` timestamps.
 * Return a clean :class:`pandas.DataFrame` ready for downstream stages.
 """
 
@@ -17,13 +21,25 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+from datetime import datetime
+from itertools import compress
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
 
+import numpy as np
 import pandas as pd
+from pandas.api.extensions import ExtensionArray
 from pydantic import BaseModel, Field, field_validator
 
-from .utils import get_logger, load_jsonl, load_json, project_root, save_json, ensure_dir
+from .utils import (
+    ensure_dir,
+    get_logger,
+    load_json,
+    load_jsonl,
+    project_root,
+    resolve_copy,
+    save_json,
+)
 
 logger = get_logger(__name__)
 
@@ -46,6 +62,7 @@ _OPTIONAL_FIELDS: list[str] = [
 _ALL_FIELDS: list[str] = _REQUIRED_FIELDS + _OPTIONAL_FIELDS
 
 _MAX_TEXT_LENGTH: int = 50_000  # characters; longer comments are truncated
+_DEFAULT_CHUNK_SIZE: int = 10_000  # rows per chunk for streaming ingestion
 
 # Common field name aliases from YouTube scraper exports.
 _FIELD_ALIASES: dict[str, str] = {
@@ -53,6 +70,28 @@ _FIELD_ALIASES: dict[str, str] = {
     "votes": "like_count",
     "time_parsed": "published_at",
 }
+TIMESTAMP_COL = "published_ts"
+
+# "3 months ago", "a day ago", "2 weeks ago (edited)", "Streamed 1 year ago".
+_RELATIVE_TIME_PATTERN = (
+    r"(?i)\b(\d+|an?|one)\s+(second|minute|hour|day|week|month|year)s?\s+ago\b"
+)
+_TIME_UNIT_SECONDS: dict[str, float] = {
+    "second": 1.0,
+    "minute": 60.0,
+    "hour": 3_600.0,
+    "day": 86_400.0,
+    "week": 7 * 86_400.0,
+    "month": 30.436875 * 86_400.0,  # mean Gregorian month
+    "year": 365.2425 * 86_400.0,
+}
+_TIME_COUNT_WORDS: dict[str, str] = {"a": "1", "an": "1", "one": "1"}
+
+# Watch, short, embed and youtu.be URLs all carry the 11-character video id.
+_VIDEO_ID_PATTERN = r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/)([A-Za-z0-9_-]{11})"
+
+_PARTITION_FILE = "part-{i}.parquet"
+
 _EMOJI_PATTERN: re.Pattern[str] = re.compile(
     "[\U00010000-\U0010ffff"   # supplementary multilingual plane
     "\U00002700-\U000027BF"    # dingbats
@@ -256,6 +295,80 @@ _LOADERS: dict[str, Any] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Chunked loading helpers
+# ---------------------------------------------------------------------------
+
+def _iter_csv_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield a CSV file in chunks of at most *chunk_size* rows."""
+    for encoding in ("utf-8", "utf-8-sig", "latin-1"):
+        try:
+            # Decode the first chunk eagerly so encoding errors surface
+            # before anything has been yielded downstream.
+            reader = pd.read_csv(path, encoding=encoding, dtype=str, chunksize=chunk_size)
+            first = next(reader, None)
+        except UnicodeDecodeError:
+            continue
+        logger.info("Streaming CSV with encoding=%s", encoding)
+        if first is None:
+            return
+        yield first
+        yield from reader
+        return
+    raise ValueError(f"Failed to decode CSV at {path} with any supported encoding.")
+
+
+def _iter_json_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield a JSON list file in chunks.
+
+    A JSON array cannot be parsed incrementally with the standard library, so
+    the file is loaded once and sliced; downstream stages still only see
+    *chunk_size* rows at a time.
+    """
+    logger.info(
+        "%s is a JSON array and is loaded whole; convert it to JSONL to "
+        "stream it in constant memory.",
+        path.name,
+    )
+    df = _load_json_file(path)
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def _iter_jsonl_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Yield a JSONL / NDJSON file in chunks without loading it whole."""
+    records: list[dict[str, Any]] = []
+    start = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as exc:
+                raise ValueError(
+                    f"Invalid JSON on line {line_no} of {path}: {exc}"
+                ) from exc
+            if len(records) >= chunk_size:
+                yield pd.DataFrame(
+                    records, index=range(start, start + len(records))
+                ).astype(str)
+                start += len(records)
+                records = []
+    if records:
+        yield pd.DataFrame(
+            records, index=range(start, start + len(records))
+        ).astype(str)
+
+
+_CHUNK_LOADERS: dict[str, Any] = {
+    "csv": _iter_csv_chunks,
+    "json": _iter_json_chunks,
+    "jsonl": _iter_jsonl_chunks,
+}
+
+
 # ---------------------------------------------------------------------------
 # Schema validation & coercion
 # ---------------------------------------------------------------------------
@@ -287,23 +400,107 @@ def _is_emoji_only(text: str) -> bool:
     return len(stripped) == 0 and len(text.strip()) > 0
 
 
-def validate_schema(df: pd.DataFrame) -> pd.DataFrame:
+def _validate_records(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """Validate every row of *df* through :class:`CommentRecord`.
+
+    Returns the valid rows (fields of :data:`_ALL_FIELDS` plus the
+    ``_empty_text`` / ``_emoji_only`` flags) and the number dropped.
+    """
+    valid_rows: list[dict[str, Any]] = []
+    n_invalid = 0
+    for idx, row in df.iterrows():
+        record_data = {
+            col: (row[col] if col in row and pd.notna(row[col]) else None)
+            for col in _ALL_FIELDS
+        }
+        try:
+            record = CommentRecord(**record_data)
+            validated = record.model_dump()
+            # Preserve the boolean flags (not part of pydantic model).
+            validated["_empty_text"] = row["_empty_text"]
+            validated["_emoji_only"] = row["_emoji_only"]
+            valid_rows.append(validated)
+        except Exception as exc:  # noqa: BLE001
+            n_invalid += 1
+            logger.debug("Row %s failed validation: %s", idx, exc)
+
+    return pd.DataFrame(valid_rows), n_invalid
+
+
+def _is_missing(value: Any) -> bool:
+    """``pd.isna`` for one cell; containers count as present."""
+    return pd.api.types.is_scalar(value) and bool(pd.isna(value))
+
+
+def _validate_columns(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """Column-wise equivalent of :func:`_validate_records`.
+
+    Applies the same coercions as :class:`CommentRecord` (reusing its field
+    validators) one column at a time, so no per-row dict or model is built
+    and the already-cleaned ``text`` column is passed through unchanged
+    rather than re-materialised as Python strings.
+    """
+    valid = np.ones(len(df), dtype=bool)
+    columns: dict[str, Any] = {}
+    for col in _ALL_FIELDS:
+        values = [None if _is_missing(v) else v for v in df[col].tolist()]
+        if col == "text":
+            columns[col] = df[col].array  # str-cast in step 3
+            continue
+        if col == "comment_id":
+            for i, v in enumerate(values):
+                if v is None or (isinstance(v, str) and not v.strip()):
+                    valid[i] = False
+                else:
+                    values[i] = CommentRecord.coerce_comment_id(v)
+        elif col == "like_count":
+            values = [CommentRecord.coerce_like_count(v) for v in values]
+        elif col == "language":
+            values = [CommentRecord.normalise_language(v) for v in values]
+        elif col != "replies":
+            # Optional[str]: pydantic does not coerce other types to str.
+            valid &= [v is None or isinstance(v, str) for v in values]
+        columns[col] = values
+    columns["_empty_text"] = df["_empty_text"].array
+    columns["_emoji_only"] = df["_emoji_only"].array
+
+    n_invalid = int(len(valid) - valid.sum())
+    if n_invalid:
+        # Filter before building the frame, so dtypes are inferred from the
+        # valid rows only (as pd.DataFrame(records) does).
+        columns = {
+            col: values[valid] if isinstance(values, ExtensionArray)
+            else list(compress(values, valid))
+            for col, values in columns.items()
+        }
+    return pd.DataFrame(columns, copy=False), n_invalid
+
+
+def validate_schema(df: pd.DataFrame, *, copy: bool = True) -> pd.DataFrame:
     """Validate, coerce, and clean a raw DataFrame against the comment schema.
 
     Steps performed:
 
     1. Ensure required columns exist (infer ``comment_id`` from hash if absent).
-    2. Add missing optional columns with ``None``.
+    2. Add missing optional columns with ``None``; derive a missing
+       ``video_id`` from ``youtube_url``.
     3. Fix encoding artefacts in *text*.
     4. Truncate extremely long texts.
     5. Flag emoji-only and empty-text rows.
-    6. Validate every row through :class:`CommentRecord`.
+    6. Validate every row against :class:`CommentRecord`.
     7. Drop duplicate ``comment_id`` values (keep first).
 
     Parameters
     ----------
     df:
         Raw DataFrame loaded from disk.
+    copy:
+        Deep-copy *df* before cleaning it and validate it row by row.
+        ``False`` takes a shallow, copy-on-write view instead (*df* is still
+        never modified, but its columns are not duplicated up front) and
+        validates column by column, without building a record per row; the
+        result is the same.  Without pandas copy-on-write (pandas < 3 with
+        the option off) ``False`` falls back to ``True``.
 
     Returns
     -------
@@ -311,7 +508,8 @@ def validate_schema(df: pd.DataFrame) -> pd.DataFrame:
         Cleaned DataFrame with all columns from :data:`_ALL_FIELDS` plus
         ``_emoji_only`` and ``_empty_text`` boolean flags.
     """
-    df = df.copy()
+    copy = resolve_copy(copy)
+    df = df.copy(deep=copy)
 
     # ---- 0. apply field aliases ----------------------------------------
     rename_map = {
@@ -344,15 +542,22 @@ def validate_schema(df: pd.DataFrame) -> pd.DataFrame:
             logger.info("Optional column '%s' not present; filling with None.", col)
             df[col] = None
 
+    if "youtube_url" in df.columns and df["video_id"].isna().any():
+        from_url = df["youtube_url"].astype("str").str.extract(_VIDEO_ID_PATTERN)[0]
+        df["video_id"] = df["video_id"].fillna(from_url)
+
     # ---- 3. encoding clean-up ------------------------------------------
-    df["text"] = (
-        df["text"]
-        .fillna("")
-        .astype(str)
-        .str.replace("\x00", "", regex=False)        # null bytes
-        .str.replace("\r\n", "\n", regex=False)       # normalise newlines
-        .str.replace("\r", "\n", regex=False)
-    )
+    text = df["text"].fillna("").astype(str)
+    # Rewrite only the rows that need it, not the whole text column.
+    dirty = text.str.contains("[\x00\r]", regex=True).to_numpy(dtype=bool)
+    if dirty.any():
+        text[dirty] = (
+            text[dirty]
+            .str.replace("\x00", "", regex=False)        # null bytes
+            .str.replace("\r\n", "\n", regex=False)       # normalise newlines
+            .str.replace("\r", "\n", regex=False)
+        )
+    df["text"] = text
 
     # ---- 4. truncate extreme lengths -----------------------------------
     long_mask = df["text"].str.len() > _MAX_TEXT_LENGTH
@@ -376,25 +581,9 @@ def validate_schema(df: pd.DataFrame) -> pd.DataFrame:
     if n_emoji:
         logger.info("%d rows contain emoji-only text.", n_emoji)
 
-    # ---- 6. per-row pydantic validation --------------------------------
-    valid_rows: list[dict[str, Any]] = []
-    n_invalid = 0
-    for idx, row in df.iterrows():
-        record_data = {
-            col: (row[col] if col in row and pd.notna(row[col]) else None)
-            for col in _ALL_FIELDS
-        }
-        try:
-            record = CommentRecord(**record_data)
-            validated = record.model_dump()
-            # Preserve the boolean flags (not part of pydantic model).
-            validated["_empty_text"] = row["_empty_text"]
-            validated["_emoji_only"] = row["_emoji_only"]
-            valid_rows.append(validated)
-        except Exception as exc:  # noqa: BLE001
-            n_invalid += 1
-            logger.debug("Row %s failed validation: %s", idx, exc)
-
+    # ---- 6. validation against CommentRecord ---------------------------
+    validate = _validate_records if copy else _validate_columns
+    result, n_invalid = validate(df)
     if n_invalid:
         logger.warning(
             "Dropped %d / %d rows that failed schema validation.",
@@ -402,8 +591,6 @@ def validate_schema(df: pd.DataFrame) -> pd.DataFrame:
             len(df),
         )
 
-    result = pd.DataFrame(valid_rows)
-
     # ---- 7. deduplicate ------------------------------------------------
     n_before = len(result)
     result = result.drop_duplicates(subset="comment_id", keep="first")
@@ -418,6 +605,103 @@ def validate_schema(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
+# ---------------------------------------------------------------------------
+# Timestamps
+# ---------------------------------------------------------------------------
+
+def _as_utc(reference: str | datetime | pd.Timestamp | None) -> pd.Timestamp:
+    """*reference* as a UTC timestamp; naive values are taken to be UTC."""
+    ts = pd.Timestamp.now(tz="UTC") if reference is None else pd.Timestamp(reference)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def parse_relative_time(
+    times: pd.Series,
+    reference: str | datetime | pd.Timestamp | None = None,
+) -> pd.Series:
+    """Convert YouTube's relative times ("3 months ago") to timestamps.
+
+    The count and unit are pulled out of every string in one vectorised
+    :meth:`~pandas.Series.str.extract` and turned into seconds through a
+    unit table (months and years at their mean Gregorian length), then
+    subtracted from *reference* -- the time the comments were scraped.
+    YouTube rounds these strings heavily ("1 year ago" covers a whole
+    year), so the result is approximate.
+
+    Parameters
+    ----------
+    times:
+        Relative time strings.  Suffixes such as ``"(edited)"`` are
+        ignored.
+    reference:
+        Scrape time.  Naive values are taken to be UTC; ``None`` means now.
+
+    Returns
+    -------
+    pd.Series
+        ``datetime64[ns, UTC]`` values, ``NaT`` where a string could not be
+        parsed.
+
+    Examples
+    --------
+    >>> parse_relative_time(pd.Series(["2 days ago", "a week ago (edited)", "?"]),
+    ...                     "2024-05-10").dt.date.tolist()
+    [datetime.date(2024, 5, 8), datetime.date(2024, 5, 3), NaT]
+    """
+    reference = _as_utc(reference)
+    parts = times.astype("str").str.extract(_RELATIVE_TIME_PATTERN)
+    count = pd.to_numeric(parts[0].str.lower().replace(_TIME_COUNT_WORDS))
+    seconds = count * parts[1].str.lower().map(_TIME_UNIT_SECONDS).astype(float)
+    stamps = reference - pd.to_timedelta(seconds.to_numpy(dtype=float), unit="s")
+    return pd.Series(stamps, index=times.index, name=TIMESTAMP_COL).astype(
+        "datetime64[ns, UTC]"
+    )
+
+
+def add_timestamps(
+    df: pd.DataFrame,
+    reference: str | datetime | pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """Add a ``published_ts`` (``datetime64[ns, UTC]``) column to *df*.
+
+    An absolute ``published_at`` (epoch seconds, as scraper exports carry
+    in ``time_parsed``, or an ISO-8601 string) wins; otherwise the relative
+    ``time`` string is parsed against *reference* with
+    :func:`parse_relative_time`.  A file carries no reliable record of when
+    it was scraped, so without *reference* rows that only have a relative
+    ``time`` stay ``NaT`` (and a warning is logged).  Returns a
+    copy-on-write view of *df*.
+    """
+    n = len(df)
+    stamps = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns, UTC]")
+    if "published_at" in df.columns:
+        published = df["published_at"]
+        epoch = pd.to_numeric(published, errors="coerce")
+        stamps = stamps.fillna(pd.to_datetime(epoch, unit="s", utc=True))
+        text = published.where(epoch.isna())
+        if text.notna().any():
+            stamps = stamps.fillna(
+                pd.to_datetime(text, format="ISO8601", errors="coerce", utc=True)
+            )
+    if "time" in df.columns and stamps.isna().any():
+        if reference is not None:
+            stamps = stamps.fillna(parse_relative_time(df["time"], reference))
+        else:
+            n_relative = int((stamps.isna() & df["time"].notna()).sum())
+            if n_relative:
+                logger.warning(
+                    "%d rows only have a relative time; pass reference_time "
+                    "(the scrape time) to date them.  Leaving %s as NaT.",
+                    n_relative,
+                    TIMESTAMP_COL,
+                )
+
+    logger.info(
+        "Timestamps: %d / %d rows dated", int(stamps.notna().sum()), n,
+    )
+    return df.assign(**{TIMESTAMP_COL: stamps.astype("datetime64[ns, UTC]")})
+
+
 # ---------------------------------------------------------------------------
 # Data profiling
 # ---------------------------------------------------------------------------
@@ -460,7 +744,7 @@ def profile_data(df: pd.DataFrame) -> dict[str, Any]:
 
     like_stats: dict[str, Any] = {}
     if "like_count" in df.columns:
-        numeric_likes = pd.to_numeric(df["like_count"], errors="coerce")
+        numeric_likes = pd.to_numeric(df["like_count"], errors="coerce").astype(float)
         if numeric_likes.notna().any():
             desc = numeric_likes.describe()
             like_stats = {k: float(v) for k, v in desc.items()}
@@ -521,11 +805,358 @@ def save_profile(profile: dict[str, Any], output_dir: str | Path) -> Path:
     return dest.resolve()
 
 
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+_SAMPLE_KEY = "_sample_key"
+
+
+def _strata(chunk: pd.DataFrame, stratify: Optional[str]) -> pd.Series:
+    """Stratum of every row of a raw chunk (one stratum if not stratified)."""
+    if stratify is None:
+        return pd.Series("", index=chunk.index)
+    if stratify not in chunk.columns:
+        raise KeyError(
+            f"Stratify column '{stratify}' not found. "
+            f"Available columns: {list(chunk.columns)}"
+        )
+    return chunk[stratify].fillna("").astype(str)
+
+
+class _SystematicSampler:
+    """Take every ``1 / fraction``-th row of each stratum, streaming.
+
+    Each stratum gets its own random start (derived from *seed* and the
+    stratum value), so a stratum of ``N`` rows contributes
+    ``floor(N * fraction)`` or ``ceil(N * fraction)`` rows -- proportional
+    allocation without knowing ``N`` in advance.
+    """
+
+    def __init__(self, fraction: float, seed: int, stratify: Optional[str]) -> None:
+        self.fraction = fraction
+        self.seed = seed
+        self.stratify = stratify
+        self.population = 0
+        self._seen: dict[str, int] = {}
+        self._kept: list[pd.DataFrame] = []
+
+    def _start(self, stratum: str) -> float:
+        digest = hashlib.sha1(f"{self.seed}:{stratum}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2**64
+
+    def feed(self, chunk: pd.DataFrame) -> None:
+        codes, uniques = pd.factorize(_strata(chunk, self.stratify))
+        within = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+        seen = np.array([self._seen.get(u, 0) for u in uniques], dtype=np.int64)
+        start = np.array([self._start(u) for u in uniques])
+        position = seen[codes] + within
+        offset = start[codes]
+        keep = (
+            np.floor((position + 1) * self.fraction + offset)
+            > np.floor(position * self.fraction + offset)
+        )
+        for stratum, n in zip(uniques, np.bincount(codes, minlength=len(uniques))):
+            self._seen[stratum] = self._seen.get(stratum, 0) + int(n)
+        self.population += len(chunk)
+        if keep.any():
+            self._kept.append(chunk.loc[keep])
+
+    def result(self) -> pd.DataFrame:
+        return pd.concat(self._kept) if self._kept else pd.DataFrame()
+
+
+class _ReservoirSampler:
+    """Keep a uniform random sample of *size* rows, streaming.
+
+    Every row gets a random key from a generator seeded with *seed*, drawn
+    in file order, and the rows with the smallest keys are kept (bottom-k
+    reservoir), so the sample does not depend on the chunk size.  With
+    *stratify*, *counts* (the rows per stratum, from a first pass over the
+    input) fixes each stratum's share of ``size`` up front (see
+    :func:`_allocate`), and each stratum keeps only that many smallest
+    keys -- never more than *size* rows in total.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        seed: int,
+        stratify: Optional[str],
+        counts: Optional[dict[str, int]] = None,
+    ) -> None:
+        if stratify is not None and counts is None:
+            raise ValueError("A stratified reservoir needs the stratum counts.")
+        self.size = size
+        self.stratify = stratify
+        self.population = 0
+        self._rng = np.random.default_rng(seed)
+        self._quotas = _allocate(size, counts) if stratify is not None else {"": size}
+        self._kept = pd.DataFrame()
+
+    def feed(self, chunk: pd.DataFrame) -> None:
+        chunk = chunk.assign(**{_SAMPLE_KEY: self._rng.random(len(chunk))})
+        self.population += len(chunk)
+        if len(self._kept):
+            # Only rows that beat the largest kept key of a full stratum
+            # can enter it, so most of a late chunk is dropped right away.
+            kept_strata = _strata(self._kept, self.stratify)
+            largest = self._kept[_SAMPLE_KEY].groupby(kept_strata).max()
+            full = kept_strata.value_counts()
+            full = full[full >= full.index.map(self._quotas).to_numpy()].index
+            bar = _strata(chunk, self.stratify).map(largest[largest.index.isin(full)])
+            chunk = chunk.loc[~(chunk[_SAMPLE_KEY] >= bar.to_numpy())]
+            if chunk.empty:
+                return
+        pool = pd.concat([self._kept, chunk]) if len(self._kept) else chunk
+        self._kept = self._smallest(pool)
+
+    def _smallest(self, pool: pd.DataFrame) -> pd.DataFrame:
+        """Rows of *pool* with each stratum's quota of smallest keys."""
+        pool = pool.sort_values(_SAMPLE_KEY, kind="stable")
+        strata = _strata(pool, self.stratify)
+        limits = strata.map(self._quotas).fillna(0).to_numpy()
+        return pool.loc[strata.groupby(strata).cumcount().to_numpy() < limits]
+
+    def result(self) -> pd.DataFrame:
+        if not len(self._kept):
+            return self._kept
+        return self._kept.drop(columns=_SAMPLE_KEY).sort_index()
+
+
+def _count_strata(chunks: Iterable[pd.DataFrame], stratify: str) -> dict[str, int]:
+    """Rows per stratum of *chunks* (the first pass of a stratified reservoir)."""
+    counts: dict[str, int] = {}
+    for chunk in chunks:
+        for stratum, n in _strata(chunk, stratify).value_counts().items():
+            counts[stratum] = counts.get(stratum, 0) + int(n)
+    return counts
+
+
+def _allocate(size: int, counts: dict[str, int]) -> dict[str, int]:
+    """Split *size* over strata in proportion to *counts* (largest remainder)."""
+    total = sum(counts.values())
+    if size >= total:
+        return dict(counts)
+    exact = {s: size * n / total for s, n in counts.items()}
+    quotas = {s: int(q) for s, q in exact.items()}
+    by_remainder = sorted(exact, key=lambda s: exact[s] - quotas[s], reverse=True)
+    for stratum in by_remainder[: size - sum(quotas.values())]:
+        quotas[stratum] += 1
+    return quotas
+
+
+def _sample_chunks(
+    open_chunks: Callable[[], Iterable[pd.DataFrame]],
+    sample: float | int,
+    seed: int,
+    stratify: Optional[str],
+) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """Sample rows from the chunks of *open_chunks()* as they stream past.
+
+    A stratified row-count sample reads the chunks twice: once to count
+    the strata, once to sample.  Returns the sampled rows (original row
+    positions as index) and the ``attrs["sample"]`` description.
+    """
+    if isinstance(sample, bool) or not isinstance(sample, (int, float)):
+        raise ValueError(f"sample must be a fraction or a row count, got {sample!r}.")
+    if isinstance(sample, float):
+        if not 0.0 < sample <= 1.0:
+            raise ValueError(f"A sample fraction must be in (0, 1], got {sample}.")
+        sampler: Any = _SystematicSampler(sample, seed, stratify)
+        method = "systematic"
+    else:
+        if sample < 1:
+            raise ValueError(f"A sample size must be positive, got {sample}.")
+        counts = _count_strata(open_chunks(), stratify) if stratify else None
+        sampler = _ReservoirSampler(sample, seed, stratify, counts)
+        method = "reservoir"
+
+    for chunk in open_chunks():
+        sampler.feed(chunk)
+    raw = sampler.result()
+    info = {
+        "method": method,
+        "sample": sample,
+        "seed": seed,
+        "stratify": stratify,
+        "population": sampler.population,
+        "fraction": len(raw) / sampler.population if sampler.population else 0.0,
+    }
+    logger.info(
+        "Sampled %d of %d raw rows (%s%s)",
+        len(raw),
+        sampler.population,
+        method,
+        f", stratified by {stratify}" if stratify else "",
+    )
+    return raw, info
+
+
+# ---------------------------------------------------------------------------
+# Partitioned datasets
+# ---------------------------------------------------------------------------
+
+def _require_pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover -- optional dependency
+        raise ImportError(
+            "Partitioned datasets require pyarrow; install it with "
+            "'pip install pyarrow' or 'pip install -r pipeline_requirements.txt'."
+        ) from exc
+    return pa, pq
+
+
+def write_partitioned(
+    df: pd.DataFrame,
+    root: str | Path,
+    *,
+    partition_by: str = "song_title",
+) -> Path:
+    """Write *df* as a Hive-partitioned Parquet dataset under *root*.
+
+    Every distinct value of *partition_by* gets its own directory
+    (``root/song_title=<value>/part-0.parquet``, values URI-encoded), so
+    :func:`read_partitioned` can load one song or video without opening the
+    others.  Partitions present in *df* replace those already on disk;
+    other partitions are left alone, so a dataset can be updated song by
+    song.  Rows with a missing *partition_by* value go to pyarrow's
+    default partition.
+
+    Parameters
+    ----------
+    df:
+        Ingested comments, e.g. the output of :func:`ingest`.
+    root:
+        Dataset directory.  Created as needed.
+    partition_by:
+        Column to partition by, typically ``"song_title"`` or
+        ``"video_id"``.
+
+    Returns
+    -------
+    Path
+        *root*.
+
+    Raises
+    ------
+    KeyError
+        If *partition_by* is not a column of *df*.
+    """
+    pa, pq = _require_pyarrow()
+    if partition_by not in df.columns:
+        raise KeyError(
+            f"Partition column '{partition_by}' not found. "
+            f"Available columns: {list(df.columns)}"
+        )
+    root = ensure_dir(root)
+    # Mixed-type object columns (e.g. replies) have no Arrow type; store
+    # them as strings, as the file loaders read them.
+    out = df.assign(**{
+        col: df[col].astype("str")
+        for col in df.columns
+        if df[col].dtype == object and col not in (partition_by, "like_count")
+    })
+    out[partition_by] = out[partition_by].astype("str")
+    if "like_count" in out.columns:
+        out["like_count"] = pd.to_numeric(out["like_count"], errors="coerce").astype("Int64")
+    pq.write_to_dataset(
+        pa.Table.from_pandas(out, preserve_index=False),
+        root,
+        partition_cols=[partition_by],
+        basename_template=_PARTITION_FILE,
+        existing_data_behavior="delete_matching",
+    )
+    logger.info(
+        "Wrote %d rows in %d %s partitions to %s",
+        len(df),
+        out[partition_by].nunique(dropna=False),
+        partition_by,
+        root,
+    )
+    return root
+
+
+def partition_column(root: str | Path) -> str:
+    """Name of the Hive partition column of the dataset at *root*."""
+    for child in sorted(Path(root).iterdir()):
+        if child.is_dir() and "=" in child.name:
+            return child.name.split("=", 1)[0]
+    raise ValueError(f"{root} is not a Hive-partitioned dataset.")
+
+
+def read_partitioned(
+    root: str | Path,
+    *,
+    songs: Optional[Sequence[str]] = None,
+    videos: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Load (part of) a dataset written by :func:`write_partitioned`.
+
+    Filters on the partition column prune whole directories: with a
+    ``song_title`` dataset, ``songs=["X"]`` reads only ``X``'s files, and
+    *columns* reads only those column chunks, so a per-song analysis costs
+    in proportion to that song's data.  Filters on other columns are still
+    applied, but need every partition to be scanned.
+
+    Parameters
+    ----------
+    root:
+        Dataset directory.
+    songs, videos:
+        Keep only these ``song_title`` / ``video_id`` values.
+    columns:
+        Columns to load (default: all).
+
+    Returns
+    -------
+    pd.DataFrame
+        The matching rows, grouped by partition, with a fresh index.
+    """
+    pa, pq = _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    filters = [
+        (col, "in", list(values))
+        for col, values in (("song_title", songs), ("video_id", videos))
+        if values is not None
+    ]
+    key = partition_column(root)
+    table = pq.read_table(
+        root,
+        columns=list(columns) if columns is not None else None,
+        filters=filters or None,
+        # Declared as strings, so an all-missing key still has a type.
+        partitioning=ds.partitioning(pa.schema([(key, pa.string())]), flavor="hive"),
+    )
+    df = table.to_pandas()
+    logger.info(
+        "Read %d rows from %s (%s)",
+        len(df),
+        Path(root).name,
+        ", ".join(f"{c} in {len(v)} values" for c, _, v in filters) or "all partitions",
+    )
+    return df
+
+
 # ---------------------------------------------------------------------------
 # Main entry point
 # ---------------------------------------------------------------------------
 
-def ingest(path: str | Path, *, format: str = "auto") -> pd.DataFrame:
+def ingest(
+    path: str | Path,
+    *,
+    format: str = "auto",
+    sample: float | int | None = None,
+    seed: int = 0,
+    stratify: Optional[str] = None,
+    reference_time: str | datetime | pd.Timestamp | None = None,
+    songs: Optional[Sequence[str]] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
     """Load, validate, and profile YouTube comment data.
 
     This is the single entry point for Stage 0 of the pipeline.
@@ -533,25 +1164,53 @@ def ingest(path: str | Path, *, format: str = "auto") -> pd.DataFrame:
     Parameters
     ----------
     path:
-        Path to the input file (CSV, JSON, or JSONL).
+        Path to the input file (CSV, JSON, or JSONL), or the directory of
+        a dataset written by :func:`write_partitioned`.  A dataset was
+        validated when it was written and is loaded as stored.
     format:
         File format.  ``"auto"`` (default) detects from the file extension.
         Explicit values: ``"csv"``, ``"json"``, ``"jsonl"``.
+    sample:
+        Load only a deterministic sample of the raw rows, chosen while the
+        file is streamed, so the rest is never held in memory.  A float
+        in ``(0, 1]`` is a fraction (systematic sampling with a random
+        start); an int is a row count (reservoir sampling).  CSV and JSONL
+        are streamed; a JSON array still has to be parsed whole.
+    seed:
+        Seed for the sample.  The same seed gives the same rows.
+    stratify:
+        Raw column to stratify the sample by (e.g. ``"song_title"``): every
+        value gets its proportional share of rows.  A stratified row count
+        reads the file twice, counting the values first.
+    reference_time:
+        When the comments were scraped, for turning relative ``time``
+        strings into ``published_ts`` (see :func:`add_timestamps`).
+        Without it, rows with only a relative time get ``NaT``.
+    songs:
+        Keep only comments on these ``song_title`` values.  On a dataset
+        partitioned by song, only their partitions are read.
+    columns:
+        Return only these columns.  On a dataset, only these are read.
 
     Returns
     -------
     pd.DataFrame
         Validated and cleaned DataFrame.  The profiling report is attached as
         the ``attrs["profile"]`` dict on the returned DataFrame, making it
-        accessible without a separate call.
+        accessible without a separate call.  A sampled frame also carries
+        ``attrs["sample"]`` (method, seed, ``population`` and achieved
+        ``fraction``), which :meth:`RuleMiner.coverage_report` uses to add
+        confidence intervals.
 
     Raises
     ------
     FileNotFoundError
-        If *path* does not point to an existing file.
+        If *path* does not point to an existing file or directory.
     ValueError
-        If the format cannot be determined or the data is fundamentally
-        malformed.
+        If the format cannot be determined, the data is fundamentally
+        malformed, or *sample* is out of range.
+    KeyError
+        If the *stratify* column or one of *columns* does not exist.
 
     Examples
     --------
@@ -560,6 +1219,8 @@ def ingest(path: str | Path, *, format: str = "auto") -> pd.DataFrame:
     1523
     """
     path = Path(path).resolve()
+    if path.is_dir():
+        return _ingest_dataset(path, sample, seed, stratify, songs, columns)
     if not path.is_file():
         raise FileNotFoundError(f"Input file not found: {path}")
 
@@ -575,17 +1236,30 @@ def ingest(path: str | Path, *, format: str = "auto") -> pd.DataFrame:
         )
 
     # -- load ------------------------------------------------------------
-    raw_df = loader(path)
+    sample_info: Optional[dict[str, Any]] = None
+    if sample is None:
+        raw_df = loader(path)
+    else:
+        raw_df, sample_info = _sample_chunks(
+            lambda: iter_raw_chunks(path, format=fmt), sample, seed, stratify,
+        )
     if raw_df.empty:
         logger.warning("Input file yielded an empty DataFrame.")
         return raw_df
 
     # -- validate --------------------------------------------------------
     validated_df = validate_schema(raw_df)
+    validated_df = add_timestamps(validated_df, reference_time)
+    if songs is not None:
+        validated_df = validated_df.loc[validated_df["song_title"].isin(list(songs))]
 
     # -- profile ---------------------------------------------------------
     profile = profile_data(validated_df)
     validated_df.attrs["profile"] = profile
+    if sample_info is not None:
+        validated_df.attrs["sample"] = sample_info
+    if columns is not None:
+        validated_df = validated_df[list(columns)]
 
     logger.info(
         "Ingestion complete: %d rows ingested from %s.",
@@ -593,3 +1267,143 @@ def ingest(path: str | Path, *, format: str = "auto") -> pd.DataFrame:
         path.name,
     )
     return validated_df
+
+
+def _ingest_dataset(
+    root: Path,
+    sample: float | int | None,
+    seed: int,
+    stratify: Optional[str],
+    songs: Optional[Sequence[str]],
+    columns: Optional[Sequence[str]],
+) -> pd.DataFrame:
+    """:func:`ingest` for a partitioned dataset directory."""
+    logger.info("Ingesting dataset %s", root.name)
+    df = read_partitioned(root, songs=songs, columns=columns)
+    sample_info = None
+    if sample is not None:
+        df, sample_info = _sample_chunks(lambda: [df], sample, seed, stratify)
+        df = df.reset_index(drop=True)
+    if columns is None and not df.empty:
+        df.attrs["profile"] = profile_data(df)
+    if sample_info is not None:
+        df.attrs["sample"] = sample_info
+    logger.info("Ingestion complete: %d rows ingested from %s.", len(df), root.name)
+    return df
+
+
+# ---------------------------------------------------------------------------
+# Streaming entry points
+# ---------------------------------------------------------------------------
+
+def iter_raw_chunks(
+    path: str | Path,
+    *,
+    format: str = "auto",
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yield the raw (unvalidated) contents of *path* in row chunks.
+
+    Each chunk keeps the row positions of the original file as its index, so
+    IDs generated by :func:`validate_schema` match those of a full
+    :func:`ingest` call.
+
+    Parameters
+    ----------
+    path:
+        Path to the input file (CSV, JSON, or JSONL).  CSV and JSONL are
+        read incrementally; a JSON array is loaded whole and then sliced,
+        so peak memory is that of the full file.
+    format:
+        File format, as for :func:`ingest`.
+    chunk_size:
+        Maximum number of rows per yielded chunk.
+
+    Raises
+    ------
+    FileNotFoundError
+        If *path* does not point to an existing file.
+    ValueError
+        If the format is unsupported or *chunk_size* is not positive.
+    """
+    path = Path(path).resolve()
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file not found: {path}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+
+    fmt = (format if format != "auto" else detect_format(path)).lower()
+    loader = _CHUNK_LOADERS.get(fmt)
+    if loader is None:
+        raise ValueError(
+            f"Unsupported format '{fmt}'. Choose from: {list(_CHUNK_LOADERS)}"
+        )
+
+    logger.info(
+        "Streaming %s  (format=%s, chunk_size=%d)", path.name, fmt, chunk_size
+    )
+    yield from loader(path, chunk_size)
+
+
+def iter_ingest(
+    path: str | Path,
+    *,
+    format: str = "auto",
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    reference_time: str | datetime | pd.Timestamp | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Streaming counterpart of :func:`ingest`.
+
+    Loads and validates *path* one chunk at a time so the whole file never
+    has to be held in memory.  Duplicate ``comment_id`` values are dropped
+    across chunk boundaries as well as within them.  No profiling report is
+    attached, since it would only describe a single chunk.
+
+    Parameters
+    ----------
+    path:
+        Path to the input file (CSV, JSON, or JSONL).
+    format:
+        File format, as for :func:`ingest`.
+    chunk_size:
+        Maximum number of raw rows per chunk.
+    reference_time:
+        Scrape time for ``published_ts``, as for :func:`ingest`.
+
+    Yields
+    ------
+    pd.DataFrame
+        Validated chunks (see :func:`validate_schema`).  Chunks that end up
+        empty after validation are skipped.
+    """
+    seen_ids: set[str] = set()
+    n_rows = 0
+    for raw_chunk in iter_raw_chunks(path, format=format, chunk_size=chunk_size):
+        chunk = add_timestamps(validate_schema(raw_chunk), reference_time)
+        chunk = drop_seen_ids(chunk, seen_ids)
+        if chunk.empty:
+            continue
+        n_rows += len(chunk)
+        yield chunk
+
+    logger.info("Streaming ingestion complete: %d rows ingested.", n_rows)
+
+
+def drop_seen_ids(df: pd.DataFrame, seen_ids: set[str]) -> pd.DataFrame:
+    """Drop rows whose ``comment_id`` is in *seen_ids*, then record the rest.
+
+    Used to deduplicate ``comment_id`` across independently validated
+    chunks.  *seen_ids* is updated in place.
+    """
+    if df.empty or "comment_id" not in df.columns:
+        return df
+    dup_mask = df["comment_id"].isin(seen_ids)
+    n_dupes = int(dup_mask.sum())
+    if n_dupes:
+        logger.warning(
+            "Removed %d comment_id entries already seen in earlier chunks.",
+            n_dupes,
+        )
+        df = df.loc[~dup_mask]
+    seen_ids.update(df["comment_id"])
+    return df
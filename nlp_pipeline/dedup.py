@@ -0,0 +1,357 @@
+"""Duplicate and near-duplicate comment clustering.
+
+YouTube comment sections are full of copies: copypasta, "who's here in
+2025", lyric quotes.  This module groups them so that the expensive stages
+(:func:`~nlp_pipeline.preprocess.preprocess_dataframe`,
+:meth:`~nlp_pipeline.rule_miner.RuleMiner.match_dataframe`) run once per
+group and the results are broadcast back to every member.
+
+Two levels of grouping are supported:
+
+* **exact** -- comments whose text is identical character for character,
+  so every per-row feature a stage derives from it (``clean_text``,
+  ``caps_ratio``, ...) is the same for all members;
+* **near** (optional) -- exact groups whose normalized text (case-folded,
+  whitespace collapsed) has character-shingle MinHash signatures that
+  collide in a banded LSH index and agree on at least ``threshold`` of
+  their hash slots (an estimate of Jaccard similarity).
+
+Each row gets three columns:
+
+* ``dup_cluster_id`` (``int64``) -- cluster identifier, numbered in order
+  of first appearance;
+* ``dup_cluster_size`` (``int64``) -- number of rows in the cluster, a
+  useful "copypasta volume" feature in its own right;
+* ``dup_is_representative`` (``bool``) -- ``True`` for the first row of
+  each cluster, the one that is actually processed.
+
+Typical usage
+-------------
+>>> from nlp_pipeline.dedup import dedup_apply
+>>> out = dedup_apply(df, lambda reps: miner.match_dataframe(
+...     preprocess_dataframe(reps)), near=True)
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+CLUSTER_ID_COL = "dup_cluster_id"
+CLUSTER_SIZE_COL = "dup_cluster_size"
+REPRESENTATIVE_COL = "dup_is_representative"
+
+_DEFAULT_NUM_PERM: int = 64
+_DEFAULT_BANDS: int = 16
+_DEFAULT_SHINGLE: int = 5
+_DEFAULT_THRESHOLD: float = 0.8
+
+_MERSENNE_61 = np.uint64((1 << 61) - 1)
+_SHINGLE_BASE = np.uint64(1_000_003)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+# ---------------------------------------------------------------------------
+# Exact duplicates
+# ---------------------------------------------------------------------------
+
+def exact_key(texts: pd.Series) -> pd.Series:
+    """Return the exact-grouping key for *texts*: the text itself.
+
+    Missing values become the empty string.  The text is deliberately not
+    normalized: members of an exact group receive the representative's
+    derived columns, which are only valid for byte-identical texts.
+    """
+    return texts.fillna("").astype(str)
+
+
+def normalize_for_dedup(texts: pd.Series) -> pd.Series:
+    """Return the near-duplicate key for *texts*: case-folded, whitespace collapsed.
+
+    Missing values become the empty string.
+    """
+    return (
+        texts.fillna("")
+        .astype(str)
+        .str.casefold()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _exact_codes(keys: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Factorize *keys* (hash-based); return ``(codes, first_row_per_code)``."""
+    codes, _ = pd.factorize(keys, sort=False)
+    _, first = np.unique(codes, return_index=True)
+    return codes.astype(np.int64), first
+
+
+# ---------------------------------------------------------------------------
+# MinHash / LSH
+# ---------------------------------------------------------------------------
+
+def _shingle_hashes(text: str, k: int) -> np.ndarray:
+    """64-bit polynomial hashes of every *k*-character shingle of *text*."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) == 0:
+        return np.zeros(1, dtype=np.uint64)
+    if len(codes) < k:
+        k = len(codes)
+    windows = np.lib.stride_tricks.sliding_window_view(codes, k)
+    powers = _SHINGLE_BASE ** np.arange(k - 1, -1, -1, dtype=np.uint64)
+    return np.unique(windows @ powers)
+
+
+def minhash_signatures(
+    texts: list[str],
+    *,
+    num_perm: int = _DEFAULT_NUM_PERM,
+    shingle: int = _DEFAULT_SHINGLE,
+    seed: int = 0,
+) -> np.ndarray:
+    """MinHash signatures of character shingles, shape ``(len(texts), num_perm)``.
+
+    Each permutation is a universal hash ``(a * x + b) mod (2**61 - 1)``
+    truncated to 32 bits; all permutations of one text are computed in a
+    single broadcast.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MERSENNE_61), size=(num_perm, 1), dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_61), size=(num_perm, 1), dtype=np.uint64)
+
+    sigs = np.empty((len(texts), num_perm), dtype=np.uint32)
+    for i, text in enumerate(texts):
+        shingles = _shingle_hashes(text, shingle) % _MERSENNE_61
+        # uint64 arithmetic wraps, which is fine for hashing purposes.
+        permuted = ((a * shingles + b) % _MERSENNE_61) & _MAX_HASH
+        sigs[i] = permuted.min(axis=1)
+    return sigs
+
+
+def _lsh_pairs(sigs: np.ndarray, bands: int, threshold: float) -> list[tuple[int, int]]:
+    """Candidate pairs from banded LSH, verified by signature agreement."""
+    n, num_perm = sigs.shape
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands}).")
+    rows = num_perm // bands
+
+    pairs: set[tuple[int, int]] = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(sigs[:, band * rows:(band + 1) * rows])
+        _, bucket = np.unique(block, axis=0, return_inverse=True)
+        bucket = bucket.ravel()
+        order = np.argsort(bucket, kind="stable")
+        sorted_buckets = bucket[order]
+        starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+        for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+            members = order[start:start + size]
+            leader = members[0]
+            # Star-join every member to the bucket leader if they agree.
+            agree = (sigs[members[1:]] == sigs[leader]).mean(axis=1)
+            for member in members[1:][agree >= threshold]:
+                pairs.add((int(leader), int(member)))
+    return sorted(pairs)
+
+
+def _union_find(n: int, pairs: list[tuple[int, int]]) -> np.ndarray:
+    """Connected components of *pairs*; each node maps to its smallest member."""
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in pairs:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    return np.array([find(i) for i in range(n)], dtype=np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def find_duplicates(
+    df: pd.DataFrame,
+    text_col: str = "text",
+    *,
+    near: bool = False,
+    threshold: float = _DEFAULT_THRESHOLD,
+    num_perm: int = _DEFAULT_NUM_PERM,
+    bands: int = _DEFAULT_BANDS,
+    shingle: int = _DEFAULT_SHINGLE,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Assign duplicate clusters to the rows of *df*.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input DataFrame.  Must contain a column named *text_col*.
+    text_col : str
+        Column holding the comment text.
+    near : bool
+        Also merge near-duplicates via MinHash/LSH, including texts that
+        differ only in case or whitespace.  Only the exact-group
+        representatives are hashed, so the cost scales with the number of
+        distinct texts.
+    threshold : float
+        Minimum estimated Jaccard similarity (fraction of agreeing MinHash
+        slots) for two texts to be merged.
+    num_perm, bands : int
+        MinHash signature length and number of LSH bands.  More bands
+        (fewer rows per band) find more candidates at lower similarity.
+    shingle : int
+        Character shingle length.
+    seed : int
+        Seed for the MinHash permutations.
+
+    Returns
+    -------
+    pd.DataFrame
+        A **copy** of *df* with ``dup_cluster_id``, ``dup_cluster_size`` and
+        ``dup_is_representative`` columns added.
+
+    Raises
+    ------
+    KeyError
+        If *text_col* is not present in *df*.
+    """
+    if text_col not in df.columns:
+        raise KeyError(
+            f"Column '{text_col}' not found in DataFrame. "
+            f"Available columns: {list(df.columns)}"
+        )
+
+    out = df.copy()
+    n = len(out)
+    keys = exact_key(out[text_col])
+    codes, first = _exact_codes(keys)
+    n_exact = len(first)
+
+    if near and n_exact > 1:
+        unique_texts = normalize_for_dedup(keys.iloc[first]).tolist()
+        sigs = minhash_signatures(
+            unique_texts, num_perm=num_perm, shingle=shingle, seed=seed,
+        )
+        roots = _union_find(n_exact, _lsh_pairs(sigs, bands, threshold))
+        # Roots are the smallest exact code in each component, i.e. the
+        # earliest-appearing one, so factorizing keeps first-appearance order.
+        cluster_of_code, _ = pd.factorize(roots, sort=False)
+        cluster = cluster_of_code[codes].astype(np.int64)
+    else:
+        cluster = codes
+
+    sizes = np.bincount(cluster, minlength=int(cluster.max()) + 1 if n else 0)
+    representative = np.zeros(n, dtype=bool)
+    if n:
+        _, first_rows = np.unique(cluster, return_index=True)
+        representative[first_rows] = True
+
+    out[CLUSTER_ID_COL] = cluster
+    out[CLUSTER_SIZE_COL] = sizes[cluster].astype(np.int64)
+    out[REPRESENTATIVE_COL] = representative
+
+    n_clusters = len(sizes)
+    logger.info(
+        "Dedup: %d rows -> %d exact groups -> %d clusters (%.1f%% duplicates)",
+        n,
+        n_exact,
+        n_clusters,
+        (1 - n_clusters / n) * 100 if n else 0.0,
+    )
+    return out
+
+
+def broadcast(
+    processed: pd.DataFrame,
+    df: pd.DataFrame,
+    text_col: str = "text",
+) -> pd.DataFrame:
+    """Copy results computed on the representatives back to every row.
+
+    Parameters
+    ----------
+    processed : pd.DataFrame
+        Output of a stage run on ``df[df["dup_is_representative"]]``; its
+        index must be the representatives' index in *df*.
+    df : pd.DataFrame
+        Output of :func:`find_duplicates`.
+    text_col : str
+        Source text column.  If the stage added ``raw_text``, it is
+        rebuilt from each row's own *text_col* rather than broadcast.
+
+    Returns
+    -------
+    pd.DataFrame
+        *df* (one row per original row, original order) with every column
+        that *processed* added.
+    """
+    new_cols = [c for c in processed.columns if c not in df.columns]
+    cluster = df[CLUSTER_ID_COL].to_numpy()
+    rep_cluster = df.loc[processed.index, CLUSTER_ID_COL].to_numpy()
+
+    # Row position in *processed* for every cluster id.
+    position = np.full(int(cluster.max()) + 1 if len(cluster) else 0, -1, dtype=np.int64)
+    position[rep_cluster] = np.arange(len(processed), dtype=np.int64)
+    take = position[cluster]
+    if (take < 0).any():
+        raise ValueError("processed is missing the representative of some clusters.")
+
+    gathered = processed[new_cols].iloc[take].set_axis(df.index)
+    out = pd.concat([df, gathered], axis=1)
+    if "raw_text" in new_cols and text_col in df.columns:
+        out["raw_text"] = df[text_col]
+    return out
+
+
+def dedup_apply(
+    df: pd.DataFrame,
+    fn: Callable[[pd.DataFrame], pd.DataFrame],
+    text_col: str = "text",
+    *,
+    near: bool = False,
+    **kwargs: object,
+) -> pd.DataFrame:
+    """Cluster *df*, run *fn* on one representative per cluster, broadcast.
+
+    Extra keyword arguments are passed to :func:`find_duplicates`.  Exact
+    groups only join identical texts, so broadcasting is lossless.  With
+    ``near=True`` members inherit the representative's derived columns
+    (including ``clean_text`` and ``caps_ratio``), which then describe the
+    representative's wording rather than their own.
+    """
+    clustered = find_duplicates(df, text_col, near=near, **kwargs)
+    reps = clustered[clustered[REPRESENTATIVE_COL]]
+    processed = fn(reps) if len(reps) else reps
+    return broadcast(processed, clustered, text_col)
+
+
+def cluster_summary(
+    df: pd.DataFrame,
+    text_col: str = "text",
+    top: Optional[int] = 20,
+) -> pd.DataFrame:
+    """Largest clusters of a :func:`find_duplicates` result.
+
+    Returns one row per cluster with its size and representative text,
+    sorted by size (descending).
+    """
+    reps = df.loc[df[REPRESENTATIVE_COL], [CLUSTER_ID_COL, CLUSTER_SIZE_COL, text_col]]
+    summary = reps.sort_values(CLUSTER_SIZE_COL, ascending=False, kind="stable")
+    summary = summary.reset_index(drop=True)
+    return summary.head(top) if top is not None else summary
@@ -0,0 +1,948 @@
+"""Streaming pipeline runner: Stage 0 -> Stage 1 -> Stage 2 over chunks.
+
+Chains :func:`~nlp_pipeline.data_ingest.validate_schema`,
+:func:`~nlp_pipeline.preprocess.preprocess_dataframe` and
+:meth:`~nlp_pipeline.rule_miner.RuleMiner.match_dataframe` as a generator
+pipeline, so only a bounded number of chunks is ever held in memory and
+results can be written out as they are produced.
+
+It also provides a streaming *classification* mode, :func:`classify_stream`,
+which takes comment dicts as they arrive (e.g. straight from the scraper)
+and labels them in micro-batches while keeping running coverage counters.
+
+Typical usage
+-------------
+>>> from nlp_pipeline.pipeline import run_pipeline
+>>> summary = run_pipeline("comments.jsonl", "results.parquet", workers=4)
+>>> summary["rows_out"]
+85012
+
+>>> with WorkerPool(4) as pool:      # warm workers, reused across runs
+...     for path in paths:
+...         run_pipeline(path, out_for(path), pool=pool)
+
+>>> for update in classify_stream(scraper.iter_comments(tasks)):
+...     print(update.coverage["any_rule_hit"])
+
+The batch runner is exposed on the command line as
+``python -m nlp_pipeline run comments.jsonl --out results.parquet``.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .data_ingest import add_timestamps, drop_seen_ids, iter_raw_chunks, validate_schema
+from .dedup import dedup_apply
+from .preprocess import (
+    FEATURE_DTYPES,
+    TextResults,
+    assemble_frame,
+    detect_language_safe,
+    prepare_frame,
+    preprocess_dataframe,
+    process_texts,
+)
+from .rule_miner import PROCESS_MINER_SLOTS, RuleMiner, RulesRef, RunningCoverage
+from .utils import SharedArray, SharedTexts, ensure_dir, get_logger
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+STAGES: tuple[str, ...] = ("ingest", "dedup", "preprocess", "rules")
+DEFAULT_STAGES: tuple[str, ...] = ("ingest", "preprocess", "rules")
+
+_DEFAULT_CHUNK_SIZE: int = 5_000
+_DEFAULT_BATCH_SIZE: int = 100  # comments per micro-batch in streaming mode
+_DEFAULT_MAX_WAIT: float = 5.0  # seconds before a partial micro-batch is flushed
+_OUTPUT_FORMATS: tuple[str, ...] = ("parquet", "jsonl", "csv")
+
+# Number of chunks each worker may have queued ahead of the writer.  Keeps
+# all workers busy without reading the whole input up front.
+_PREFETCH_PER_WORKER: int = 2
+
+
+# ---------------------------------------------------------------------------
+# Stage execution
+# ---------------------------------------------------------------------------
+
+def _validate_stages(stages: Iterable[str]) -> tuple[str, ...]:
+    """Return *stages* in canonical order, rejecting unknown names."""
+    requested = {s.strip().lower() for s in stages if s.strip()}
+    unknown = requested - set(STAGES)
+    if unknown:
+        raise ValueError(
+            f"Unknown stage(s) {sorted(unknown)}. Choose from: {list(STAGES)}"
+        )
+    if not requested:
+        raise ValueError("At least one stage must be selected.")
+    return tuple(s for s in STAGES if s in requested)
+
+
+def run_stages(
+    chunk: pd.DataFrame,
+    stages: Sequence[str],
+    miner: Optional[RuleMiner] = None,
+    text_col: str = "text",
+    reference_time: Optional[str | pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Run the selected *stages* on a single chunk of raw rows.
+
+    Parameters
+    ----------
+    chunk:
+        Raw rows as yielded by :func:`~nlp_pipeline.data_ingest.iter_raw_chunks`.
+    stages:
+        Stage names from :data:`STAGES`, in canonical order.
+    miner:
+        Rule miner used for the ``"rules"`` stage.  Required when that stage
+        is selected.
+    text_col:
+        Column holding the comment text for Stage 1.
+    reference_time:
+        Scrape time for the ``published_ts`` column the ``"ingest"`` stage
+        adds (see :func:`~nlp_pipeline.data_ingest.add_timestamps`).
+
+    Returns
+    -------
+    pd.DataFrame
+        The processed chunk.  Stages 1 and 2 run in memoize mode, so
+        repeated texts within a chunk are only processed once, and Stage 2
+        collects spans only for matched labels (``spans="matched"``, as
+        :class:`WorkerPool` does).  Each stage
+        appends its columns to a copy-on-write view of the previous
+        stage's output (``copy=False``), so text buffers are shared between
+        stages rather than copied at every step.
+    """
+    if "ingest" in stages:
+        chunk = add_timestamps(validate_schema(chunk, copy=False), reference_time)
+    if chunk.empty:
+        return chunk
+    if "dedup" in stages:
+        rest = [s for s in stages if s not in ("ingest", "dedup")]
+        return dedup_apply(
+            chunk,
+            lambda reps: run_stages(reps, rest, miner, text_col),
+            text_col,
+        )
+    if "preprocess" in stages:
+        chunk = preprocess_dataframe(
+            chunk, text_col=text_col, memoize=True, copy=False,
+        )
+    if "rules" in stages:
+        if miner is None:
+            raise ValueError("The 'rules' stage requires a RuleMiner.")
+        rule_col = "clean_text" if "clean_text" in chunk.columns else text_col
+        chunk = miner.match_dataframe(
+            chunk, text_col=rule_col, memoize=True, copy=False, spans="matched",
+        )
+    return chunk
+
+
+# ---------------------------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------------------------
+
+def _warm_worker(rules: RulesRef) -> None:
+    """Pool initializer: load what the first real task would otherwise pay
+    for -- langdetect's language profiles (seeded, as in the parent) and
+    the compiled rules."""
+    detect_language_safe("warming up the language profiles")
+    rules.resolve()
+
+
+def _pool_run_stages(
+    rules: RulesRef,
+    chunk: pd.DataFrame,
+    stages: tuple[str, ...],
+    text_col: str,
+    reference_time: Optional[str | pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Pool task: :func:`run_stages` with the worker's copy of *rules*."""
+    miner = rules.resolve() if "rules" in stages else None
+    return run_stages(chunk, stages, miner, text_col, reference_time)
+
+
+def _pool_process_texts(
+    handles: tuple,
+    start: int,
+    stop: int,
+    detect_language: bool,
+    skip_trivial: bool,
+) -> tuple[np.ndarray, list[str], Optional[list[str]]]:
+    """Pool task: Stage 1 on rows ``start:stop`` of the shared texts.
+
+    The trivial flags, features and language codes are written into the
+    shared arrays.  Only the cleaned texts that differ from their input and
+    the slice's language vocabulary are returned (pickled).
+    """
+    texts_handle, missing_handle, trivial_handle, language_handle, feature_handles = handles
+    with ExitStack() as stack:
+        texts = stack.enter_context(SharedTexts.attach(texts_handle))
+        missing = stack.enter_context(SharedArray.attach(missing_handle)).array
+        values = np.array(
+            [None if missing[i] else texts[i] for i in range(start, stop)], dtype=object,
+        )
+        results = process_texts(pd.Series(values, dtype=object), detect_language, skip_trivial)
+
+        stack.enter_context(SharedArray.attach(trivial_handle)).array[start:stop] = (
+            results.trivial
+        )
+        for name, handle in feature_handles.items():
+            shared = stack.enter_context(SharedArray.attach(handle))
+            shared.array[start:stop] = results.features[name]
+        vocab: Optional[list[str]] = None
+        if results.language is not None:
+            codes, uniques = pd.factorize(results.language)
+            stack.enter_context(SharedArray.attach(language_handle)).array[start:stop] = codes
+            vocab = list(uniques)
+
+    clean = results.clean.to_numpy(dtype=object)
+    changed = np.flatnonzero(clean != values)
+    return changed + start, clean[changed].tolist(), vocab
+
+
+class WorkerPool(ProcessPoolExecutor):
+    """Warm worker processes shared by every stage, across many runs.
+
+    A process pool created per call pays for starting the workers,
+    importing pandas / emoji / langdetect and compiling the rules every
+    time.  A ``WorkerPool`` pays once: its workers start (and warm up) in
+    the constructor and stay up until :meth:`shutdown`, so repeated runs
+    from a notebook or a long-lived service only pay for dispatch.
+
+    Rule sets are sent to the workers by content hash
+    (:attr:`RuleMiner.config_hash`): each task names the hash, and a
+    worker compiles a rule set the first time it sees that hash, reading
+    the config from shared memory.  :meth:`set_rules` switches the pool's
+    rule set without restarting anything.  The pool keeps the configs of
+    its most recent rule sets published, as many as each worker caches
+    compiled; older ones are released.
+
+    Parameters
+    ----------
+    processes:
+        Number of worker processes.
+    rules_path:
+        Optional path to an alternative ``regex_rules.yaml``.
+    engine:
+        Regex engine, see :class:`~nlp_pipeline.rule_miner.RuleMiner`.
+
+    Examples
+    --------
+    >>> with WorkerPool(4) as pool:
+    ...     df = pool.match(pool.preprocess(raw))
+    ...     pool.set_rules("experimental_rules.yaml")
+    ...     df2 = pool.run_stages(raw)
+    """
+
+    def __init__(
+        self,
+        processes: int = 2,
+        *,
+        rules_path: str | Path | None = None,
+        engine: str = "re",
+    ) -> None:
+        if processes < 1:
+            raise ValueError(f"processes must be at least 1, got {processes}.")
+        self._published: OrderedDict[tuple[str, str], tuple[RulesRef, ExitStack]] = (
+            OrderedDict()
+        )
+        self.miner = RuleMiner(rules_path, engine=engine)
+        self._rules = self._publish(self.miner)
+        super().__init__(
+            max_workers=processes,
+            initializer=_warm_worker,
+            initargs=(self._rules,),
+        )
+        # Start (and warm) every worker now rather than on first use.
+        for future in [self.submit(time.time) for _ in range(processes)]:
+            future.result()
+        logger.info("WorkerPool: %d warm worker processes", processes)
+
+    @property
+    def processes(self) -> int:
+        """Number of worker processes."""
+        return self._max_workers
+
+    @property
+    def rules_hash(self) -> str:
+        """:attr:`RuleMiner.config_hash` of the current rule set."""
+        return self._rules.digest
+
+    def _publish(self, miner: RuleMiner) -> RulesRef:
+        """Publish *miner*'s config in shared memory (once per hash).
+
+        Only the :data:`~nlp_pipeline.rule_miner.PROCESS_MINER_SLOTS` most
+        recently used configs stay published, matching the workers' cache
+        of compiled rule sets; the rest are released.
+        """
+        key = (miner.config_hash, miner.engine)
+        if key in self._published:
+            self._published.move_to_end(key)
+            return self._published[key][0]
+        stack = ExitStack()
+        ref = stack.enter_context(miner.shared_rules())
+        self._published[key] = (ref, stack)
+        while len(self._published) > PROCESS_MINER_SLOTS:
+            _, (_, stale) = self._published.popitem(last=False)
+            stale.close()
+        return ref
+
+    def set_rules(
+        self,
+        rules_path: str | Path | None = None,
+        *,
+        engine: Optional[str] = None,
+    ) -> str:
+        """Switch to the rules in *rules_path* and return their hash.
+
+        Workers compile the new rule set on their next task; an unchanged
+        config keeps its hash and is not recompiled.
+        """
+        miner = RuleMiner(rules_path, engine=engine or self.miner.engine)
+        if (miner.config_hash, miner.engine) != self._rules[:2]:
+            self._rules = self._publish(miner)
+            logger.info("WorkerPool: rules updated to %s", self._rules.digest[:12])
+        self.miner = miner
+        return self._rules.digest
+
+    def run_stages(
+        self,
+        chunk: pd.DataFrame,
+        stages: Sequence[str] = DEFAULT_STAGES,
+        text_col: str = "text",
+        reference_time: Optional[str | pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """:func:`run_stages` on one chunk, in a worker."""
+        selected = _validate_stages(stages)
+        return self.submit(
+            _pool_run_stages, self._rules, chunk, selected, text_col, reference_time,
+        ).result()
+
+    def map_stages(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        stages: Sequence[str] = DEFAULT_STAGES,
+        text_col: str = "text",
+        miner: Optional[RuleMiner] = None,
+        reference_time: Optional[str | pd.Timestamp] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """:func:`run_stages` over *chunks*, spread over the workers.
+
+        Chunks are consumed lazily and results keep input order.  *miner*
+        overrides the pool's rule set for this call only.
+        """
+        selected = _validate_stages(stages)
+        rules = self._rules
+        if miner is not None and (miner.config_hash, miner.engine) != rules[:2]:
+            rules = miner.published_rules()
+        yield from _ordered_map(
+            self,
+            partial(
+                _pool_run_stages, rules,
+                stages=selected, text_col=text_col, reference_time=reference_time,
+            ),
+            chunks,
+            max_pending=self.processes * _PREFETCH_PER_WORKER,
+        )
+
+    def preprocess(
+        self,
+        df: pd.DataFrame,
+        text_col: str = "text",
+        detect_language: bool = True,
+        memoize: bool = False,
+        skip_trivial: bool = True,
+        copy: bool = True,
+    ) -> pd.DataFrame:
+        """:func:`preprocess_dataframe`, with the texts split over the workers.
+
+        The parameters and the result are those of the in-process call.
+        Only the texts travel to the workers, through shared memory
+        (:class:`~nlp_pipeline.utils.SharedTexts`); the flags, features and
+        language codes come back through shared arrays, so the only
+        pickled payload is the cleaned texts that cleaning changed.
+        """
+        if text_col not in df.columns:
+            raise KeyError(
+                f"Column '{text_col}' not found in DataFrame. "
+                f"Available columns: {list(df.columns)}"
+            )
+        out, codes, source = prepare_frame(df, text_col, memoize, copy)
+        results = self._process_texts(source, detect_language, skip_trivial)
+        return assemble_frame(out, codes, results, text_col, copy)
+
+    def _process_texts(
+        self,
+        source: pd.Series,
+        detect_language: bool,
+        skip_trivial: bool,
+    ) -> TextResults:
+        """:func:`~nlp_pipeline.preprocess.process_texts` over the workers."""
+        n = len(source)
+        values = np.array(
+            [v if v is None or isinstance(v, str) else str(v)
+             for v in source.to_numpy(dtype=object, na_value=None)],
+            dtype=object,
+        )
+        n_parts = self.processes if n >= 2 * self.processes else 1
+        bounds = np.linspace(0, n, n_parts + 1, dtype=int).tolist()
+        with ExitStack() as stack:
+            texts = stack.enter_context(SharedTexts.create(values))
+            missing = stack.enter_context(SharedArray.create((n,), bool))
+            missing.array[:] = pd.isna(values)
+            trivial = stack.enter_context(SharedArray.create((n,), bool))
+            language = stack.enter_context(SharedArray.create((n,), np.int32))
+            features = {
+                name: stack.enter_context(SharedArray.create((n,), dtype))
+                for name, dtype in FEATURE_DTYPES.items()
+            }
+            handles = (
+                texts.handle, missing.handle, trivial.handle, language.handle,
+                {name: shared.handle for name, shared in features.items()},
+            )
+            futures = [
+                self.submit(
+                    _pool_process_texts, handles, lo, hi, detect_language, skip_trivial,
+                )
+                for lo, hi in zip(bounds, bounds[1:])
+            ]
+            clean = values.copy()
+            languages = np.empty(n, dtype=object) if detect_language else None
+            for lo, hi, future in zip(bounds, bounds[1:], futures):
+                changed, cleaned, vocab = future.result()
+                clean[changed] = np.array(cleaned, dtype=object)
+                if languages is not None:
+                    languages[lo:hi] = np.asarray(vocab, dtype=object)[language.array[lo:hi]]
+            return TextResults(
+                pd.Series(clean, index=source.index),
+                None if languages is None else pd.Series(languages, index=source.index),
+                trivial.array.copy(),
+                {name: shared.array.copy() for name, shared in features.items()},
+            )
+
+    def match(self, df: pd.DataFrame, **kwargs: Any) -> pd.DataFrame:
+        """:meth:`RuleMiner.match_dataframe` with the pool's rules and workers.
+
+        The texts and results travel through shared memory (see
+        :meth:`RuleMiner.match_texts`); ``spans=True`` is not available,
+        so *spans* defaults to ``"matched"`` here.
+        """
+        kwargs.setdefault("spans", "matched")
+        return self.miner.match_dataframe(df, processes=self, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop the workers and free the shared rule configs."""
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        while self._published:
+            _, (_, stack) = self._published.popitem()
+            stack.close()
+
+
+def _ordered_map(
+    executor: Executor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_pending: int,
+) -> Iterator[Any]:
+    """Like :meth:`Executor.map`, but with at most *max_pending* tasks in
+    flight, so *items* is consumed lazily.  Results keep input order."""
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# ---------------------------------------------------------------------------
+# Streaming pipeline
+# ---------------------------------------------------------------------------
+
+def iter_pipeline(
+    path: str | Path,
+    *,
+    stages: Iterable[str] = DEFAULT_STAGES,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    format: str = "auto",
+    rules_path: str | Path | None = None,
+    text_col: str = "text",
+    pool: Optional[WorkerPool] = None,
+    reference_time: Optional[str | pd.Timestamp] = None,
+) -> Iterator[pd.DataFrame]:
+    """Stream *path* through the selected pipeline stages chunk by chunk.
+
+    Parameters
+    ----------
+    path:
+        Input file (CSV, JSON, or JSONL).
+    stages:
+        Which of ``"ingest"``, ``"dedup"``, ``"preprocess"`` and ``"rules"``
+        to run.  They always execute in that order.  ``"dedup"`` is opt-in:
+        exact duplicates within a chunk are processed once and the results
+        copied to every copy (see :mod:`nlp_pipeline.dedup`).
+    chunk_size:
+        Number of raw rows per chunk.
+    workers:
+        Number of worker processes.  ``1`` runs every stage in the calling
+        process.
+    format:
+        Input format, as for :func:`~nlp_pipeline.data_ingest.ingest`.
+    rules_path:
+        Optional path to an alternative ``regex_rules.yaml``.
+    text_col:
+        Column holding the comment text.
+    pool:
+        Run the stages on this :class:`WorkerPool` instead (*workers* is
+        then ignored).  *rules_path*, if given, overrides the pool's rules
+        for this run only.
+    reference_time:
+        When the comments were scraped.  The ``"ingest"`` stage uses it to
+        turn relative ``time`` strings into ``published_ts``; without it
+        only rows with an absolute ``published_at`` are dated.
+
+    Yields
+    ------
+    pd.DataFrame
+        Processed chunks, in input order.  When ``"ingest"`` is selected,
+        ``comment_id`` duplicates are also removed across chunks.
+    """
+    selected = _validate_stages(stages)
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}.")
+
+    raw_chunks = iter_raw_chunks(path, format=format, chunk_size=chunk_size)
+    rules_arg = str(rules_path) if rules_path is not None else None
+
+    if pool is not None:
+        miner = RuleMiner(rules_arg) if rules_arg is not None else None
+        processed = pool.map_stages(
+            raw_chunks, selected, text_col, miner=miner, reference_time=reference_time,
+        )
+        yield from _dedup_chunks(processed, enabled="ingest" in selected)
+        return
+
+    if workers == 1:
+        miner = RuleMiner(rules_arg) if "rules" in selected else None
+        processed: Iterator[pd.DataFrame] = (
+            run_stages(chunk, selected, miner, text_col, reference_time)
+            for chunk in raw_chunks
+        )
+        yield from _dedup_chunks(processed, enabled="ingest" in selected)
+        return
+
+    logger.info("Starting pipeline with %d worker processes", workers)
+    with WorkerPool(workers, rules_path=rules_arg) as pool:
+        processed = pool.map_stages(
+            raw_chunks, selected, text_col, reference_time=reference_time,
+        )
+        yield from _dedup_chunks(processed, enabled="ingest" in selected)
+
+
+def _dedup_chunks(
+    chunks: Iterable[pd.DataFrame],
+    enabled: bool,
+) -> Iterator[pd.DataFrame]:
+    """Drop ``comment_id`` values already emitted by earlier chunks."""
+    seen_ids: set[str] = set()
+    for chunk in chunks:
+        if enabled:
+            chunk = drop_seen_ids(chunk, seen_ids)
+        if not chunk.empty:
+            yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Incremental writers
+# ---------------------------------------------------------------------------
+
+def detect_output_format(path: Path) -> str:
+    """Infer the output format from the file extension of *path*."""
+    suffix = path.suffix.lower()
+    if suffix in {".parquet", ".pq"}:
+        return "parquet"
+    if suffix in {".jsonl", ".ndjson"}:
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    raise ValueError(
+        f"Cannot infer output format from extension '{suffix}'. "
+        f"Choose one of: {list(_OUTPUT_FORMATS)}"
+    )
+
+
+def _flatten_for_output(chunk: pd.DataFrame, fmt: str) -> pd.DataFrame:
+    """Make *chunk* writable with a stable schema across chunks.
+
+    Span lists are JSON-encoded for tabular formats, and ``object`` columns
+    are cast to strings so that an all-``None`` column in one chunk does not
+    change the Parquet schema of the next.
+    """
+    if fmt == "jsonl":
+        return chunk
+    out = chunk.copy()
+    for col in out.columns:
+        if col.endswith("_spans"):
+            out[col] = [json.dumps(v, ensure_ascii=False) for v in out[col]]
+        elif col == "like_count":
+            out[col] = pd.to_numeric(out[col], errors="coerce").astype("Int64")
+        elif out[col].dtype == object:
+            out[col] = out[col].astype("string")
+    return out
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a single Parquet, JSONL, or CSV file.
+
+    Use as a context manager; the file is created on the first
+    :meth:`write` and finalised on exit.
+
+    Parameters
+    ----------
+    path:
+        Destination file.  Parent directories are created as needed.
+    format:
+        ``"auto"`` (infer from extension), ``"parquet"``, ``"jsonl"`` or
+        ``"csv"``.  Parquet output requires ``pyarrow``.
+    """
+
+    def __init__(self, path: str | Path, format: str = "auto") -> None:
+        self.path = Path(path)
+        self.format = (
+            format if format != "auto" else detect_output_format(self.path)
+        ).lower()
+        if self.format not in _OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unsupported output format '{self.format}'. "
+                f"Choose from: {list(_OUTPUT_FORMATS)}"
+            )
+        self.rows_written = 0
+        self._handle: Any = None
+        self._schema: Any = None
+
+    def __enter__(self) -> "ChunkWriter":
+        ensure_dir(self.path.parent)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """Append *chunk* to the output file."""
+        chunk = _flatten_for_output(chunk, self.format)
+        if self.format == "parquet":
+            self._write_parquet(chunk)
+        elif self.format == "jsonl":
+            if self._handle is None:
+                self._handle = open(self.path, "w", encoding="utf-8")
+            chunk.to_json(
+                self._handle, orient="records", lines=True, force_ascii=False,
+                date_format="iso",
+            )
+        else:
+            header = self._handle is None
+            if header:
+                self._handle = open(self.path, "w", encoding="utf-8", newline="")
+            chunk.to_csv(self._handle, index=False, header=header)
+        self.rows_written += len(chunk)
+
+    def _write_parquet(self, chunk: pd.DataFrame) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # pragma: no cover -- optional dependency
+            raise ImportError(
+                "Parquet output requires pyarrow; install it with 'pip install "
+                "pyarrow' (it is in pipeline_requirements.txt) or write to "
+                ".jsonl / .csv instead."
+            ) from exc
+
+        if self._handle is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            self._schema = table.schema
+            self._handle = pq.ParquetWriter(self.path, self._schema)
+        else:
+            chunk = chunk.reindex(columns=self._schema.names)
+            table = pa.Table.from_pandas(
+                chunk, schema=self._schema, preserve_index=False
+            )
+        self._handle.write_table(table)
+
+    def close(self) -> None:
+        """Flush and close the output file (idempotent)."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        elif self.rows_written == 0:
+            if self.format == "parquet":
+                logger.warning("No rows produced; %s was not written.", self.path)
+            else:
+                self.path.touch()
+
+
+# ---------------------------------------------------------------------------
+# Main entry point
+# ---------------------------------------------------------------------------
+
+def run_pipeline(
+    path: str | Path,
+    out: str | Path,
+    *,
+    stages: Iterable[str] = DEFAULT_STAGES,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    format: str = "auto",
+    out_format: str = "auto",
+    rules_path: str | Path | None = None,
+    text_col: str = "text",
+    pool: Optional[WorkerPool] = None,
+    reference_time: Optional[str | pd.Timestamp] = None,
+) -> dict[str, Any]:
+    """Run the streaming pipeline on *path* and write results to *out*.
+
+    Output is written incrementally, one chunk at a time.  See
+    :func:`iter_pipeline` for the meaning of the shared parameters.
+
+    Returns
+    -------
+    dict
+        Run summary with keys ``stages``, ``chunks``, ``rows_out``,
+        ``elapsed_s`` and ``output``.
+    """
+    selected = _validate_stages(stages)
+    start = time.perf_counter()
+    n_chunks = 0
+
+    with ChunkWriter(out, format=out_format) as writer:
+        for chunk in iter_pipeline(
+            path,
+            stages=selected,
+            chunk_size=chunk_size,
+            workers=workers,
+            format=format,
+            rules_path=rules_path,
+            text_col=text_col,
+            pool=pool,
+            reference_time=reference_time,
+        ):
+            writer.write(chunk)
+            n_chunks += 1
+            logger.info(
+                "Pipeline: wrote chunk %d (%d rows total)",
+                n_chunks,
+                writer.rows_written,
+            )
+
+    summary = {
+        "stages": list(selected),
+        "chunks": n_chunks,
+        "rows_out": writer.rows_written,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+        "output": str(Path(out).resolve()),
+    }
+    logger.info(
+        "Pipeline complete: %d rows in %d chunks written to %s (%.2fs)",
+        summary["rows_out"],
+        summary["chunks"],
+        summary["output"],
+        summary["elapsed_s"],
+    )
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# Streaming classification
+# ---------------------------------------------------------------------------
+
+class StreamUpdate(NamedTuple):
+    """One classified micro-batch plus the coverage report so far."""
+
+    batch: pd.DataFrame
+    coverage: dict[str, Any]
+
+
+def micro_batches(
+    records: Iterable[dict[str, Any]],
+    batch_size: int = _DEFAULT_BATCH_SIZE,
+    max_wait: Optional[float] = _DEFAULT_MAX_WAIT,
+) -> Iterator[list[dict[str, Any]]]:
+    """Group *records* into lists of at most *batch_size*.
+
+    A partial batch is also emitted once *max_wait* seconds have passed since
+    its first record arrived -- whether or not more records arrive -- so a
+    slow or stalled source is still classified promptly.  To notice an idle
+    source, *records* is read on a background thread (``max_wait=None``
+    reads it inline and only flushes on size and at the end).
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}.")
+    if max_wait is None:
+        batch: list[dict[str, Any]] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+    yield from _timed_batches(records, batch_size, max_wait)
+
+
+def _timed_batches(
+    records: Iterable[dict[str, Any]],
+    batch_size: int,
+    max_wait: float,
+) -> Iterator[list[dict[str, Any]]]:
+    """:func:`micro_batches` with a flush timer; see there."""
+    items: queue.Queue = queue.Queue(maxsize=batch_size)
+    done = object()
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def _put(item: Any) -> bool:
+        # Give up once the consumer has gone away, instead of blocking on a
+        # full queue forever.
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read() -> None:
+        try:
+            for record in records:
+                if not _put(record):
+                    return
+        except BaseException as exc:  # noqa: BLE001 -- re-raised below
+            errors.append(exc)
+        finally:
+            _put(done)
+
+    thread = threading.Thread(target=_read, name="micro-batches", daemon=True)
+    thread.start()
+    batch: list[dict[str, Any]] = []
+    deadline = 0.0
+    try:
+        while True:
+            timeout = max(deadline - time.monotonic(), 0.0) if batch else None
+            try:
+                item = items.get(timeout=timeout)
+            except queue.Empty:
+                yield batch
+                batch = []
+                continue
+            if item is done:
+                break
+            if not batch:
+                deadline = time.monotonic() + max_wait
+            batch.append(item)
+            if len(batch) >= batch_size or time.monotonic() >= deadline:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        if errors:
+            raise errors[0]
+    finally:
+        stop.set()
+
+
+def classify_batch(
+    records: Sequence[dict[str, Any]],
+    miner: RuleMiner,
+    detect_language: bool = False,
+    reference_time: Optional[str | pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Validate, preprocess and rule-match one micro-batch of comment dicts.
+
+    Records are stringified the same way the file loaders do, so scraper
+    output (``cid``, ``votes``, ...) is handled exactly like an ingested
+    export.  Relative ``time`` strings are dated against *reference_time*,
+    when the batch arrived -- the current time by default, since a live
+    batch was scraped just now (see
+    :func:`~nlp_pipeline.data_ingest.add_timestamps`).  Language detection
+    is off by default to keep latency low.
+    """
+    if not records:
+        return pd.DataFrame()
+    if reference_time is None:
+        reference_time = pd.Timestamp.now(tz="UTC")
+    df = validate_schema(pd.DataFrame(list(records)).astype(str))
+    if df.empty:
+        return df
+    df = add_timestamps(df, reference_time)
+    df = preprocess_dataframe(df, detect_language=detect_language)
+    return miner.match_dataframe(df)
+
+
+def classify_stream(
+    records: Iterable[dict[str, Any]],
+    *,
+    miner: Optional[RuleMiner] = None,
+    batch_size: int = _DEFAULT_BATCH_SIZE,
+    max_wait: Optional[float] = _DEFAULT_MAX_WAIT,
+    detect_language: bool = False,
+) -> Iterator[StreamUpdate]:
+    """Classify comments as they arrive, in micro-batches.
+
+    Parameters
+    ----------
+    records:
+        Any iterable of raw comment dicts, e.g. a
+        ``YoutubeCommentDownloader`` generator or
+        :meth:`~nlp_pipeline.scraper.CommentScraper.iter_comments`.
+    miner:
+        Rule miner to use.  Defaults to one built from the bundled rules.
+    batch_size, max_wait:
+        Micro-batching parameters, see :func:`micro_batches`.
+    detect_language:
+        Run ``langdetect`` on each comment (slower).
+
+    Yields
+    ------
+    StreamUpdate
+        The labelled batch and the running coverage report, in the format
+        of :meth:`~nlp_pipeline.rule_miner.RuleMiner.coverage_report`.
+        ``comment_id`` duplicates across batches are dropped.
+    """
+    miner = miner or RuleMiner()
+    coverage = RunningCoverage(miner.labels)
+    seen_ids: set[str] = set()
+
+    for batch in micro_batches(records, batch_size, max_wait):
+        arrived = pd.Timestamp.now(tz="UTC")
+        df = drop_seen_ids(
+            classify_batch(batch, miner, detect_language, arrived), seen_ids,
+        )
+        if df.empty:
+            continue
+        coverage.update(df)
+        report = coverage.report()
+        logger.info(
+            "Stream: %d comments classified, %d with a rule hit (%.2f%%)",
+            report["total_rows"],
+            report["any_rule_hit"],
+            report["any_rule_hit_pct"],
+        )
+        yield StreamUpdate(df, report)
@@ -22,13 +22,22 @@ from __future__ import annotations
 
 import html
 import re
+import string
 import unicodedata
-from typing import Optional
+
+from typing import NamedTuple, Optional
 
 import emoji
+import numpy as np
 import pandas as pd
 
-from .utils import get_logger
+from .utils import (
+    factorize_texts,
+    get_logger,
+    log_memo_ratio,
+    resolve_copy,
+    to_arrow_strings,
+)
 
 logger = get_logger(__name__)
 
@@ -42,16 +51,79 @@ _URL_RE = re.compile(
 _MENTION_RE = re.compile(r"@[\w.]+")
 _WHITESPACE_RE = re.compile(r"\s+")
 
+# Column-level equivalents used by :func:`clean_text_batch` on pure-ASCII
+# rows.  Character classes are spelled out so that the patterns mean the
+# same thing to Python ``re`` and to the RE2 engine behind Arrow-backed
+# strings (RE2's ``\s`` omits ``\v`` and ``\x1c``-``\x1f``; ``\w`` is
+# ASCII-only there).  These are the ASCII characters ``str.isspace`` accepts.
+_ASCII_WS_NOT_SPACE = r"\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+_ASCII_WS = " " + _ASCII_WS_NOT_SPACE
+_BATCH_URL_PAT = rf"(?i)https?://[^{_ASCII_WS}]+|www\.[^{_ASCII_WS}]+"
+_BATCH_MENTION_PAT = r"@[A-Za-z0-9_.]+"
+# Only rewrite runs that actually change: two or more whitespace characters,
+# or a lone non-space one.  A lone " " is left alone, which keeps the pass
+# cheap on ordinary prose.
+_BATCH_WHITESPACE_PAT = rf"[{_ASCII_WS}]{{2,}}|[{_ASCII_WS_NOT_SPACE}]"
+_NON_ASCII_PAT = r"[^\x00-\x7f]"
+# Rows per vectorized slice in clean_text_batch.  Every string kernel
+# allocates a new Arrow buffer, and the allocator keeps freed buffers
+# resident, so slicing bounds that working set to a few slices' worth.
+_BATCH_SLICE = 8192
+# langdetect samples n-grams at random; a fixed seed makes each text's answer
+# the same in every process (and run).
+_LANGDETECT_SEED = 0
+
+
+# ---- ASCII fast path -------------------------------------------------------
+#
+# Most comments are plain ASCII.  For those, NFKC normalization is the
+# identity, no character is an emoji, and every per-character Unicode
+# property the features need is a fixed set of bytes, so counts reduce to
+# ``bytes.translate`` deletions.  Each helper below takes the result of
+# ``str.isascii`` (a C-level scan) as *is_ascii*, so callers that run several
+# helpers on one text scan it once; ``None`` means "check here".
+
+_ASCII_PUNCT = bytes(
+    c for c in range(128) if unicodedata.category(chr(c)).startswith("P")
+)
+_ASCII_LETTERS = string.ascii_letters.encode("ascii")
+_ASCII_UPPER = string.ascii_uppercase.encode("ascii")
+
+
+def _count_bytes(data: bytes, chars: bytes) -> int:
+    """Number of bytes in *data* that occur in *chars*."""
+    return len(data) - len(data.translate(None, chars))
+
+
+def count_alpha(text: str, *, is_ascii: Optional[bool] = None) -> int:
+    """Number of alphabetic characters in *text* (``str.isalpha``)."""
+    if text.isascii() if is_ascii is None else is_ascii:
+        return _count_bytes(text.encode("ascii"), _ASCII_LETTERS)
+    return sum(1 for ch in text if ch.isalpha())
+
+
+def count_emoji(text: str, *, is_ascii: Optional[bool] = None) -> int:
+    """Number of emoji in *text*; ``0`` for ASCII (every emoji is non-ASCII)."""
+    if text.isascii() if is_ascii is None else is_ascii:
+        return 0
+    try:
+        return emoji.emoji_count(text)
+    except Exception:  # pragma: no cover -- defensive against emoji lib changes
+        logger.warning("emoji.emoji_count failed; falling back to 0")
+        return 0
+
 
 # ---- low-level text helpers ------------------------------------------------
 
-def normalize_text(text: str) -> str:
+def normalize_text(text: str, *, is_ascii: Optional[bool] = None) -> str:
     """Apply NFKC unicode normalization and decode HTML entities.
 
     Parameters
     ----------
     text : str
         Raw input string.
+    is_ascii : bool | None
+        ``text.isascii()``, if the caller already knows it.
 
     Returns
     -------
@@ -60,7 +132,9 @@ def normalize_text(text: str) -> str:
         ``&``).  Two passes of ``html.unescape`` are used because YouTube
         sometimes double-encodes entities (``&amp;amp;``).
     """
-    text = unicodedata.normalize("NFKC", text)
+    if not (text.isascii() if is_ascii is None else is_ascii):
+        # NFKC leaves ASCII unchanged.
+        text = unicodedata.normalize("NFKC", text)
     # Double-unescape to handle double-encoded HTML entities from YouTube.
     text = html.unescape(html.unescape(text))
     return text
@@ -98,7 +172,7 @@ def remove_mentions(text: str) -> str:
     return _MENTION_RE.sub("", text)
 
 
-def clean_text(text: str) -> str:
+def clean_text(text: str, *, is_ascii: Optional[bool] = None) -> str:
     """Full cleaning pipeline: normalize, remove URLs & mentions, collapse whitespace.
 
     The cleaning steps are intentionally minimal to preserve the commenter's
@@ -108,13 +182,15 @@ def clean_text(text: str) -> str:
     ----------
     text : str
         Raw comment text.
+    is_ascii : bool | None
+        ``text.isascii()``, if the caller already knows it.
 
     Returns
     -------
     str
         Cleaned text ready for feature extraction or downstream modelling.
     """
-    text = normalize_text(text)
+    text = normalize_text(text, is_ascii=is_ascii)
     text = remove_urls(text)
     text = remove_mentions(text)
     # Collapse runs of whitespace (including newlines) into a single space.
@@ -122,9 +198,64 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
+def clean_text_batch(texts: pd.Series) -> pd.Series:
+    """Column-level :func:`clean_text`.
+
+    Rows that are pure ASCII and contain no ``&`` need neither NFKC
+    normalization nor HTML unescaping, so the URL, mention and whitespace
+    substitutions run on them as vectorized string kernels (Arrow-backed
+    when ``pyarrow`` is installed), a slice of rows at a time.  All other
+    rows go through
+    :func:`clean_text`.  The result is identical to applying
+    :func:`clean_text` row by row.
+
+    Parameters
+    ----------
+    texts : pd.Series
+        Raw comment texts.  Missing values become ``""`` and non-string
+        values are converted with ``str`` (uncleaned), as in
+        :func:`preprocess_dataframe`.
+
+    Returns
+    -------
+    pd.Series
+        Cleaned texts, aligned with *texts*.
+    """
+    values = texts.to_numpy(dtype=object, na_value=None)
+    n = len(values)
+    result = np.empty(n, dtype=object)
+    is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=n)
+
+    # Missing -> "", other non-strings -> str(v), matching _safe_clean.
+    for i in np.flatnonzero(~is_str):
+        v = values[i]
+        result[i] = "" if v is None or (isinstance(v, float) and pd.isna(v)) else str(v)
+
+    str_pos = np.flatnonzero(is_str)
+    for start in range(0, len(str_pos), _BATCH_SLICE):
+        pos = str_pos[start:start + _BATCH_SLICE]
+        strings = pd.Series(values[pos], dtype=pd.StringDtype())
+        non_ascii = strings.str.contains(_NON_ASCII_PAT, regex=True).to_numpy(dtype=bool)
+        fast = ~(non_ascii | strings.str.contains("&", regex=False).to_numpy(dtype=bool))
+
+        if fast.any():
+            cleaned = (
+                strings[fast]
+                .str.replace(_BATCH_URL_PAT, "", regex=True)
+                .str.replace(_BATCH_MENTION_PAT, "", regex=True)
+                .str.replace(_BATCH_WHITESPACE_PAT, " ", regex=True)
+                .str.strip(" ")
+            )
+            result[pos[fast]] = cleaned.to_numpy(dtype=object)
+        for i, is_ascii in zip(pos[~fast], ~non_ascii[~fast]):
+            result[i] = clean_text(values[i], is_ascii=bool(is_ascii))
+
+    return pd.Series(result, index=texts.index)
+
+
 # ---- feature extraction ----------------------------------------------------
 
-def extract_features(text: str) -> dict:
+def extract_features(text: str, *, is_ascii: Optional[bool] = None) -> dict:
     """Compute lightweight text-level features from *text*.
 
     Features
@@ -148,6 +279,8 @@ def extract_features(text: str) -> dict:
     ----------
     text : str
         Input string (typically the *cleaned* text, but works on raw text too).
+    is_ascii : bool | None
+        ``text.isascii()``, if the caller already knows it.
 
     Returns
     -------
@@ -158,26 +291,26 @@ def extract_features(text: str) -> dict:
     words = text.split()
     word_count = len(words)
 
-    # Punctuation ratio
-    if length > 0:
-        punct_count = sum(1 for ch in text if unicodedata.category(ch).startswith("P"))
-        punctuation_ratio = punct_count / length
+    if is_ascii is None:
+        is_ascii = text.isascii()
+    if is_ascii:
+        data = text.encode("ascii")
+        punct_count = _count_bytes(data, _ASCII_PUNCT)
+        alpha_count = _count_bytes(data, _ASCII_LETTERS)
+        upper_count = _count_bytes(data, _ASCII_UPPER)
     else:
-        punctuation_ratio = 0.0
+        punct_count = sum(1 for ch in text if unicodedata.category(ch).startswith("P"))
+        alpha_chars = [ch for ch in text if ch.isalpha()]
+        alpha_count = len(alpha_chars)
+        upper_count = sum(1 for ch in alpha_chars if ch.isupper())
+
+    # Punctuation ratio
+    punctuation_ratio = punct_count / length if length > 0 else 0.0
 
     # Caps ratio (relative to alphabetic characters only)
-    alpha_chars = [ch for ch in text if ch.isalpha()]
-    if alpha_chars:
-        caps_ratio = sum(1 for ch in alpha_chars if ch.isupper()) / len(alpha_chars)
-    else:
-        caps_ratio = 0.0
+    caps_ratio = upper_count / alpha_count if alpha_count else 0.0
 
-    # Emoji count
-    try:
-        emoji_count = emoji.emoji_count(text)
-    except Exception:  # pragma: no cover -- defensive against emoji lib changes
-        logger.warning("emoji.emoji_count failed; falling back to 0")
-        emoji_count = 0
+    emoji_count = count_emoji(text, is_ascii=is_ascii)
 
     return {
         "text_length": length,
@@ -195,7 +328,8 @@ def extract_features(text: str) -> dict:
 def detect_language_safe(text: str) -> str:
     """Detect the language of *text* with a safe fallback.
 
-    Uses ``langdetect`` under the hood.  If detection fails (e.g. the text is
+    Uses ``langdetect`` under the hood, seeded so that the answer does not
+    depend on the process or run.  If detection fails (e.g. the text is
     too short, emoji-only, or the library is not installed), returns
     ``"unknown"`` instead of raising.
 
@@ -213,11 +347,12 @@ def detect_language_safe(text: str) -> str:
         return "unknown"
 
     try:
-        from langdetect import detect, LangDetectException
+        from langdetect import DetectorFactory, detect
+
+        DetectorFactory.seed = _LANGDETECT_SEED
 
         # langdetect needs at least some alphabetic content to work.
-        alpha_content = "".join(ch for ch in text if ch.isalpha())
-        if len(alpha_content) < 3:
+        if count_alpha(text) < 3:
             return "unknown"
 
         return detect(text)
@@ -228,7 +363,9 @@ def detect_language_safe(text: str) -> str:
 
 # ---- trivial / empty check -------------------------------------------------
 
-def is_empty_or_trivial(text: str, min_alpha_chars: int = 3) -> bool:
+def is_empty_or_trivial(
+    text: str, min_alpha_chars: int = 3, *, is_ascii: Optional[bool] = None
+) -> bool:
     """Check whether *text* is empty, whitespace-only, or trivially short.
 
     A comment is considered *trivial* if it contains fewer than
@@ -243,6 +380,8 @@ def is_empty_or_trivial(text: str, min_alpha_chars: int = 3) -> bool:
     min_alpha_chars : int, optional
         Minimum number of alphabetic characters required for a comment to be
         considered non-trivial.  Defaults to ``3``.
+    is_ascii : bool | None
+        ``text.isascii()``, if the caller already knows it.
 
     Returns
     -------
@@ -255,15 +394,59 @@ def is_empty_or_trivial(text: str, min_alpha_chars: int = 3) -> bool:
         return True
     if not text.strip():
         return True
-    alpha_count = sum(1 for ch in text if ch.isalpha())
-    return alpha_count < min_alpha_chars
+    return count_alpha(text, is_ascii=is_ascii) < min_alpha_chars
 
 
 # ---- DataFrame entry point -------------------------------------------------
 
+# Feature columns added by preprocess_dataframe, in extract_features order.
+FEATURE_DTYPES: dict[str, type] = {
+    "text_length": np.int64,
+    "word_count": np.int64,
+    "punctuation_ratio": np.float64,
+    "caps_ratio": np.float64,
+    "emoji_count": np.int64,
+    "exclamation_count": np.int64,
+    "question_mark_count": np.int64,
+}
+
+
+def _feature_arrays(
+    clean: pd.Series, gate: np.ndarray, ascii_flags: list[bool]
+) -> dict[str, np.ndarray]:
+    """:func:`extract_features` for every text, as one array per feature.
+
+    The arrays are preallocated and filled in place, so no per-row dicts or
+    intermediate DataFrame are kept.  Gated (trivial) rows are short and
+    highly repetitive ("🔥🔥🔥", "first"), so their features are looked up
+    by text instead of being recomputed.
+    """
+    n = len(clean)
+    arrays = {name: np.empty(n, dtype=dtype) for name, dtype in FEATURE_DTYPES.items()}
+    columns = [arrays[name] for name in FEATURE_DTYPES]
+    cache: dict[str, tuple] = {}
+    rows = zip(clean.tolist(), gate.tolist(), ascii_flags)
+    for i, (text, gated, is_ascii) in enumerate(rows):
+        if gated:
+            values = cache.get(text)
+            if values is None:
+                values = cache[text] = tuple(
+                    extract_features(text, is_ascii=is_ascii).values()
+                )
+        else:
+            values = extract_features(text, is_ascii=is_ascii).values()
+        for column, value in zip(columns, values):
+            column[i] = value
+    return arrays
+
+
 def preprocess_dataframe(
     df: pd.DataFrame,
     text_col: str = "text",
+    detect_language: bool = True,
+    memoize: bool = False,
+    skip_trivial: bool = True,
+    copy: bool = True,
 ) -> pd.DataFrame:
     """Apply the full preprocessing pipeline to a DataFrame of comments.
 
@@ -274,7 +457,8 @@ def preprocess_dataframe(
     2. Clean the text (normalize, strip URLs/mentions, collapse whitespace)
        and store the result in ``clean_text``.
     3. Detect the language of the cleaned text.
-    4. Extract text features and add them as individual columns.
+    4. Extract text features into preallocated arrays and add them as
+       individual columns in a single ``assign``.
 
     Rows where the source column is ``NaN`` / ``None`` are handled gracefully:
     ``clean_text`` is set to an empty string and features receive safe
@@ -287,11 +471,35 @@ def preprocess_dataframe(
     text_col : str, optional
         Name of the column that holds the raw comment text.  Defaults to
         ``"text"``.
+    detect_language : bool, optional
+        Run ``langdetect`` on every row (the slowest step).  When ``False``,
+        an existing ``language`` column is kept as-is and missing values are
+        filled with ``"unknown"``.  Defaults to ``True``.
+    memoize : bool, optional
+        Factorize *text_col* and run the cleaning, language detection and
+        feature extraction once per distinct text, scattering the results
+        back by code.  Output is identical; the speed-up is proportional to
+        the duplicate rate.  Defaults to ``False``.
+    skip_trivial : bool, optional
+        Gate rows flagged ``is_trivial`` (empty, emoji- or reaction-only):
+        they skip language detection (their answer is always
+        ``"unknown"``) and their features are computed once per distinct
+        text.  Output is identical; set ``False`` to process every row
+        individually.  Defaults to ``True``.
+    copy : bool, optional
+        Deep-copy *df* and ``raw_text``.  With ``False`` (the lean mode used
+        by the pipeline) the output is a copy-on-write view of *df* whose
+        existing columns are not duplicated: *text_col* is converted to the Arrow-backed string
+        dtype (see :func:`~nlp_pipeline.utils.to_arrow_strings`) and
+        ``raw_text`` -- and ``clean_text`` when cleaning changed nothing --
+        share its buffer.  *df* itself is never modified.  Falls back to
+        ``True`` without pandas copy-on-write.  Defaults to ``True``.
 
     Returns
     -------
     pd.DataFrame
-        A **copy** of the input DataFrame with the following columns added:
+        A **copy** (or, with ``copy=False``, a view) of the input DataFrame
+        with the following columns added:
 
         - ``raw_text`` -- verbatim original text.
         - ``clean_text`` -- preprocessed text.
@@ -315,32 +523,153 @@ def preprocess_dataframe(
     logger.info(
         "Starting preprocessing on %d rows (text_col=%r)", len(df), text_col
     )
+    out, codes, source = prepare_frame(df, text_col, memoize, copy)
+    results = process_texts(source, detect_language, skip_trivial)
+    return assemble_frame(out, codes, results, text_col, copy)
+
+
+# ---- split entry points ----------------------------------------------------
+#
+# preprocess_dataframe is prepare_frame -> process_texts -> assemble_frame.
+# Only process_texts touches the texts, so a caller can run it elsewhere
+# (e.g. WorkerPool.preprocess, over worker processes) on any slices of the
+# texts and hand the concatenated TextResults to assemble_frame.
+
+
+class TextResults(NamedTuple):
+    """Per-text output of Stage 1, aligned with the input texts.
+
+    ``language`` is ``None`` when language detection was not requested.
+    """
 
-    out = df.copy()
+    clean: pd.Series
+    language: Optional[pd.Series]
+    trivial: np.ndarray
+    features: dict[str, np.ndarray]
+
+
+def process_texts(
+    texts: pd.Series,
+    detect_language: bool = True,
+    skip_trivial: bool = True,
+) -> TextResults:
+    """Clean *texts* and compute everything Stage 1 derives from them.
+
+    This is the row-independent part of :func:`preprocess_dataframe`, so
+    it can be run on any slice of the texts and the slices concatenated.
+    *detect_language* and *skip_trivial* are as in
+    :func:`preprocess_dataframe`.
+
+    Returns
+    -------
+    TextResults
+        Cleaned texts, languages, trivial flags and feature arrays,
+        aligned with *texts*.
+    """
+    clean = clean_text_batch(texts)
+    clean_list = clean.tolist()
+    # One isascii scan per text, shared by the triviality and feature helpers.
+    ascii_flags = [isinstance(t, str) and t.isascii() for t in clean_list]
+
+    # Trivial rows have < 3 letters, which detect_language_safe always
+    # answers with "unknown", so gating them out is lossless.
+    trivial = np.array(
+        [is_empty_or_trivial(t, is_ascii=a) for t, a in zip(clean_list, ascii_flags)],
+        dtype=bool,
+    )
+    gate = trivial if skip_trivial else np.zeros(len(clean), dtype=bool)
+    language: Optional[pd.Series] = None
+    if detect_language:
+        language = pd.Series("unknown", index=clean.index)
+        active = ~gate
+        language[active] = clean[active].apply(detect_language_safe)
+
+    features = _feature_arrays(clean, gate, ascii_flags)
+    return TextResults(clean, language, trivial, features)
+
+
+def prepare_frame(
+    df: pd.DataFrame,
+    text_col: str,
+    memoize: bool,
+    copy: bool,
+) -> tuple[pd.DataFrame, Optional[np.ndarray], pd.Series]:
+    """Steps before :func:`process_texts`: set up the output frame.
+
+    The parameters are those of :func:`preprocess_dataframe`; *text_col*
+    must exist in *df*.
+
+    Returns
+    -------
+    tuple
+        ``(out, codes, texts)``: the output frame with ``raw_text`` added,
+        the codes that scatter per-text results back onto its rows
+        (``None`` without *memoize*), and the texts to pass to
+        :func:`process_texts`.
+    """
+    copy = resolve_copy(copy)
+    out = df.copy(deep=copy)
 
     # 1. Preserve raw text ------------------------------------------------
-    out["raw_text"] = out[text_col].copy()
+    if copy:
+        out["raw_text"] = out[text_col].copy()
+    else:
+        # Copy-on-write: both columns reference the same Arrow buffer.
+        out[text_col] = to_arrow_strings(out[text_col])
+        out["raw_text"] = out[text_col]
+
+    # Every derived column is a pure function of the text, so in memoize
+    # mode it is computed once per distinct value and scattered back.
+    if memoize:
+        codes, source = factorize_texts(out[text_col])
+        log_memo_ratio(logger, "Preprocessing", len(out), len(source))
+        return out, codes, source
+    return out, None, out[text_col]
+
+
+def assemble_frame(
+    out: pd.DataFrame,
+    codes: Optional[np.ndarray],
+    results: TextResults,
+    text_col: str,
+    copy: bool,
+) -> pd.DataFrame:
+    """Steps after :func:`process_texts`: add the Stage 1 columns.
 
-    # 2. Clean text -------------------------------------------------------
-    def _safe_clean(val: Optional[str]) -> str:
-        if val is None or (isinstance(val, float) and pd.isna(val)):
-            return ""
-        if not isinstance(val, str):
-            return str(val)
-        return clean_text(val)
+    *out* and *codes* come from :func:`prepare_frame`, *results* from
+    :func:`process_texts` on its texts; they are scattered back onto the
+    rows of *out*.  Returns the frame :func:`preprocess_dataframe` would.
+    """
+
+    def _scatter(values: pd.Series):
+        if codes is None:
+            return values
+        return values.iloc[codes].set_axis(out.index)
 
-    out["clean_text"] = out[text_col].apply(_safe_clean)
+    # 2. Clean text -------------------------------------------------------
+    clean_col = _scatter(results.clean)
+    if not resolve_copy(copy):
+        clean_col = to_arrow_strings(clean_col)
+        if clean_col.equals(out[text_col]):
+            clean_col = out[text_col]
+    out["clean_text"] = clean_col
 
     # 3. Detect language --------------------------------------------------
-    out["language"] = out["clean_text"].apply(detect_language_safe)
+    if results.language is not None:
+        out["language"] = _scatter(results.language)
+    elif "language" in out.columns:
+        out["language"] = out["language"].fillna("unknown")
+    else:
+        out["language"] = "unknown"
 
     # 4. Trivial flag -----------------------------------------------------
-    out["is_trivial"] = out["clean_text"].apply(is_empty_or_trivial)
+    out["is_trivial"] = _scatter(pd.Series(results.trivial, index=results.clean.index))
 
     # 5. Extract features -------------------------------------------------
-    features_series = out["clean_text"].apply(extract_features)
-    features_df = pd.DataFrame(features_series.tolist(), index=out.index)
-    out = pd.concat([out, features_df], axis=1)
+    features = results.features
+    if codes is not None:
+        features = {name: values[codes] for name, values in features.items()}
+    out = out.assign(**features)
 
     # Summary logging
     n_trivial = out["is_trivial"].sum()
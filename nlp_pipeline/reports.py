@@ -0,0 +1,425 @@
+"""Markdown report generation for per-song and per-label comment listings.
+
+Replaces the notebook cells that filtered ``df_comments`` once per song and
+wrote each row with ``iterrows`` and many small ``f.write`` calls.  Here the
+top-N rows of every song are selected in a single vectorised pass (one
+``lexsort`` plus a grouped ``cumcount``), rendered through string templates
+and written with one buffered write per report.
+
+Reports produced (matching the files under ``reports/``):
+
+* ``top_comments_by_song.md`` -- top N longest comments per song.
+* ``top_replies_by_song.md`` -- top N most-replied comments per song.
+* ``matched_comments_detailed.md`` -- every rule-matched comment per label.
+
+:func:`write_coverage_cube` saves the per-group coverage table of
+:meth:`~nlp_pipeline.rule_miner.RuleMiner.coverage_cube` for dashboards.
+
+Typical usage
+-------------
+>>> from nlp_pipeline.reports import write_all_reports
+>>> write_all_reports(df, "reports/", k=25)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .utils import ensure_dir, get_logger
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Metrics & templates
+# ---------------------------------------------------------------------------
+
+# metric name -> (report title noun, heading suffix template)
+METRICS: dict[str, tuple[str, str]] = {
+    "length": ("Longest Comments", "{value} chars"),
+    "likes": ("Most Liked Comments", "{value} likes"),
+    "replies": ("Most Replied Comments", "{value} replies"),
+    "confidence": ("Highest-Confidence Comments", "Confidence: {value:.2f}"),
+}
+
+_SONG_HEADER = "## \U0001f3b5 {song}\n**Artists:** {artists}\n\n"
+_TOP_ENTRY = (
+    "### {rank}. {author} ({suffix})\n\n"
+    "> {text}\n\n"
+    "\U0001f44d {likes} · {time}\n\n"
+    "---\n\n"
+)
+_LABEL_HEADER = "## {label}\n**Total Hits:** {hits}\n\n"
+_MATCHED_ENTRY = (
+    "### {rank}. {author} (Confidence: {conf:.2f})\n\n"
+    "**Song:** {song} — {artists}\n\n"
+    "> {text}\n\n"
+    "**{likes}** Likes | **{replies}** Replies | {time}\n\n"
+    "---\n\n"
+)
+
+_WRITE_BUFFER: int = 1 << 20  # 1 MiB
+
+
+# ---------------------------------------------------------------------------
+# Column preparation
+# ---------------------------------------------------------------------------
+
+def _display(series: pd.Series, default: str) -> np.ndarray:
+    """Stringify *series* for display, using *default* for missing values.
+
+    Whole-number floats (e.g. ``like_count`` after a NaN forced a float
+    dtype) are shown without a trailing ``.0``.
+    """
+    if pd.api.types.is_float_dtype(series.dtype):
+        values = series.to_numpy()
+        finite = values[~np.isnan(values)]
+        if np.array_equal(finite, np.floor(finite)):
+            series = series.astype("Int64")
+    return series.astype(object).where(series.notna(), default).astype(str).to_numpy()
+
+
+def _column(df: pd.DataFrame, *names: str) -> Optional[pd.Series]:
+    """Return the first column of *df* among *names*, or ``None``."""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return None
+
+
+def _field(df: pd.DataFrame, default: str, *names: str) -> np.ndarray:
+    """Display strings for the first of *names* present in *df*."""
+    col = _column(df, *names)
+    if col is None:
+        return np.full(len(df), default, dtype=object)
+    return _display(col, default)
+
+
+def _replies_count(df: pd.DataFrame) -> pd.Series:
+    """Numeric reply counts; empty strings and missing values become 0."""
+    replies = _column(df, "replies_count", "replies")
+    if replies is None:
+        return pd.Series(0, index=df.index)
+    return (
+        pd.to_numeric(replies.replace("", "0"), errors="coerce")
+        .fillna(0)
+        .astype(int)
+    )
+
+
+def _metric_values(df: pd.DataFrame, metric: str) -> pd.Series:
+    """Return the numeric values of *metric* for every row of *df*.
+
+    *metric* is a key of :data:`METRICS`, ``"confidence:<LABEL>"`` for a
+    single label's confidence, or any numeric column name.
+    """
+    if metric == "length":
+        if "text_length" in df.columns:
+            return pd.to_numeric(df["text_length"], errors="coerce")
+        return df["text"].astype(str).str.len()
+    if metric == "likes":
+        likes = _column(df, "like_count", "votes")
+        if likes is None:
+            raise KeyError("Metric 'likes' needs a 'like_count' or 'votes' column.")
+        return pd.to_numeric(likes, errors="coerce")
+    if metric == "replies":
+        return _replies_count(df)
+    if metric == "confidence":
+        if "max_confidence" in df.columns:
+            return df["max_confidence"]
+        conf_cols = [c for c in df.columns if c.startswith("rule_") and c.endswith("_conf")]
+        if not conf_cols:
+            raise KeyError("Metric 'confidence' needs rule_*_conf columns; run match_dataframe first.")
+        return df[conf_cols].max(axis=1)
+    if metric.startswith("confidence:"):
+        return df[f"rule_{metric.split(':', 1)[1]}_conf"]
+    if metric in df.columns:
+        return pd.to_numeric(df[metric], errors="coerce")
+    raise KeyError(
+        f"Unknown metric '{metric}'. Use one of {list(METRICS)}, "
+        "'confidence:<LABEL>', or a numeric column name."
+    )
+
+
+# ---------------------------------------------------------------------------
+# Vectorised top-k selection
+# ---------------------------------------------------------------------------
+
+def top_k_per_group(
+    df: pd.DataFrame,
+    metric: str,
+    k: int = 25,
+    group_col: str = "song_title",
+) -> pd.DataFrame:
+    """Select the *k* highest-*metric* rows of every group in one pass.
+
+    Groups keep their order of first appearance (like ``Series.unique``),
+    ties keep their original row order and rows with a missing metric are
+    skipped (both like ``DataFrame.nlargest``).
+
+    Returns
+    -------
+    pd.DataFrame
+        The selected rows, ordered by group then descending metric, with
+        two extra columns: ``_metric`` (the ranking value) and ``_rank``
+        (1-based position within the group).
+    """
+    if group_col not in df.columns:
+        raise KeyError(f"Group column '{group_col}' not found in DataFrame.")
+
+    values = _metric_values(df, metric).to_numpy(dtype=float, na_value=np.nan)
+    codes, _ = pd.factorize(df[group_col], use_na_sentinel=False)
+    positions = np.flatnonzero(~np.isnan(values))
+    order = positions[np.lexsort((positions, -values[positions], codes[positions]))]
+
+    ranks = pd.Series(codes[order]).groupby(codes[order]).cumcount().to_numpy()
+    keep = order[ranks < k]
+
+    out = df.iloc[keep].copy()
+    out["_metric"] = values[keep]
+    out["_rank"] = ranks[ranks < k] + 1
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _format_metric(value: float, template: str) -> str:
+    """Format *value* into *template*, dropping ``.0`` from whole numbers."""
+    if "{value:" in template or not float(value).is_integer():
+        return template.format(value=value)
+    return template.format(value=int(value))
+
+
+def render_top_report(
+    df: pd.DataFrame,
+    metric: str = "length",
+    k: int = 25,
+    group_col: str = "song_title",
+    title: Optional[str] = None,
+) -> str:
+    """Render the top-*k* comments per song by *metric* as Markdown.
+
+    Parameters
+    ----------
+    df:
+        Comments DataFrame.  Needs ``text`` and *group_col*; ``author``,
+        ``artists``, ``time`` and ``like_count``/``votes`` are shown when
+        present.
+    metric:
+        ``"length"``, ``"likes"``, ``"replies"``, ``"confidence"``,
+        ``"confidence:<LABEL>"`` or any numeric column.
+    k:
+        Comments per song.
+    group_col:
+        Column to group by (default ``song_title``).
+    title:
+        Report title; derived from *metric* when omitted.
+    """
+    if metric.startswith("confidence:"):
+        noun, suffix = METRICS["confidence"]
+    else:
+        noun, suffix = METRICS.get(metric, (f"Comments by {metric}", f"{metric}: {{value}}"))
+    title = title or f"Top {k} {noun} by Song"
+
+    top = top_k_per_group(df, metric, k=k, group_col=group_col)
+    n = len(top)
+
+    groups = _display(top[group_col], "Unknown")
+    artists = _field(top, "Unknown", "artists")
+    authors = _field(top, "Unknown", "author")
+    texts = _field(top, "", "text")
+    likes = _field(top, "0", "votes", "like_count")
+    times = _field(top, "Unknown", "time")
+    metric_values = top["_metric"].to_numpy()
+    ranks = top["_rank"].to_numpy()
+
+    parts: list[str] = [f"# {title}\n\n"]
+    for i in range(n):
+        if ranks[i] == 1:
+            parts.append(_SONG_HEADER.format(song=groups[i], artists=artists[i]))
+        parts.append(_TOP_ENTRY.format(
+            rank=ranks[i],
+            author=authors[i],
+            suffix=_format_metric(metric_values[i], suffix),
+            text=texts[i],
+            likes=likes[i],
+            time=times[i],
+        ))
+    return "".join(parts)
+
+
+def render_matched_report(
+    df: pd.DataFrame,
+    labels: Optional[Iterable[str]] = None,
+    text_col: str = "clean_text",
+) -> str:
+    """Render every rule-matched comment, grouped by label, as Markdown.
+
+    Parameters
+    ----------
+    df:
+        Output of :meth:`~nlp_pipeline.rule_miner.RuleMiner.match_dataframe`.
+    labels:
+        Labels to include, in order.  Defaults to every ``rule_<LABEL>``
+        column found, sorted.
+    text_col:
+        Column shown as the comment body (newlines are flattened).
+    """
+    if labels is None:
+        labels = sorted(
+            c[len("rule_"):] for c in df.columns
+            if c.startswith("rule_") and f"{c}_conf" in df.columns
+        )
+    if text_col not in df.columns:
+        text_col = "text"
+
+    parts: list[str] = ["# Rule Coverage Analysis - Matched Comments\n\n"]
+    for label in labels:
+        hit_mask = df[f"rule_{label}"].to_numpy(dtype=bool)
+        if not hit_mask.any():
+            continue
+        matched = df.loc[hit_mask]
+        conf = matched[f"rule_{label}_conf"].to_numpy(dtype=float)
+        order = np.lexsort((np.arange(len(matched)), -conf))
+        matched = matched.iloc[order]
+        conf = conf[order]
+        n = len(matched)
+
+        authors = _field(matched, "Unknown", "author")
+        songs = _field(matched, "Unknown", "song_title")
+        artists = _field(matched, "Unknown", "artists")
+        times = _field(matched, "Unknown", "time")
+        likes = _field(matched, "0", "votes", "like_count")
+        replies = _display(_replies_count(matched), "0")
+        texts = (
+            matched[text_col].fillna("").astype(str)
+            .str.replace("\n", " ", regex=False).to_numpy()
+        )
+
+        parts.append(_LABEL_HEADER.format(label=label, hits=n))
+        parts.extend(
+            _MATCHED_ENTRY.format(
+                rank=i + 1,
+                author=authors[i],
+                conf=conf[i],
+                song=songs[i],
+                artists=artists[i],
+                text=texts[i],
+                likes=likes[i],
+                replies=replies[i],
+                time=times[i],
+            )
+            for i in range(n)
+        )
+    return "".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+def read_results(path: str | Path) -> pd.DataFrame:
+    """Load a pipeline output (or raw comments export) for reporting.
+
+    Supports ``.parquet``, ``.jsonl`` / ``.ndjson``, ``.json`` and ``.csv``.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in {".parquet", ".pq"}:
+        return pd.read_parquet(path)
+    if suffix in {".jsonl", ".ndjson"}:
+        return pd.read_json(path, lines=True, dtype=False)
+    if suffix == ".json":
+        return pd.read_json(path, dtype=False)
+    if suffix == ".csv":
+        return pd.read_csv(path)
+    raise ValueError(f"Cannot read results from extension '{suffix}'.")
+
+
+def _write(content: str, path: str | Path) -> Path:
+    path = Path(path)
+    ensure_dir(path.parent)
+    with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+        f.write(content)
+    logger.info("Report saved to %s", path)
+    return path
+
+
+def write_top_report(
+    df: pd.DataFrame,
+    path: str | Path,
+    metric: str = "length",
+    k: int = 25,
+    group_col: str = "song_title",
+    title: Optional[str] = None,
+) -> Path:
+    """Render :func:`render_top_report` and write it to *path*."""
+    return _write(render_top_report(df, metric, k, group_col, title), path)
+
+
+def write_matched_report(
+    df: pd.DataFrame,
+    path: str | Path,
+    labels: Optional[Iterable[str]] = None,
+    text_col: str = "clean_text",
+) -> Path:
+    """Render :func:`render_matched_report` and write it to *path*."""
+    return _write(render_matched_report(df, labels, text_col), path)
+
+
+def write_coverage_cube(cube: pd.DataFrame, path: str | Path) -> Path:
+    """Save a :meth:`RuleMiner.coverage_cube` table for dashboards.
+
+    The format follows the extension: ``.parquet`` / ``.pq`` (requires
+    ``pyarrow``), ``.csv`` or ``.jsonl`` / ``.ndjson``.  Read it back with
+    :func:`read_results`.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    ensure_dir(path.parent)
+    if suffix in {".parquet", ".pq"}:
+        cube.to_parquet(path, index=False)
+    elif suffix == ".csv":
+        cube.to_csv(path, index=False)
+    elif suffix in {".jsonl", ".ndjson"}:
+        cube.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        raise ValueError(f"Cannot write a coverage cube to extension '{suffix}'.")
+    logger.info("Coverage cube (%d groups) saved to %s", len(cube), path)
+    return path
+
+
+def write_all_reports(
+    df: pd.DataFrame,
+    out_dir: str | Path,
+    k: int = 25,
+) -> dict[str, Path]:
+    """Write the standard set of reports into *out_dir*.
+
+    The matched-comments report is only written when *df* carries
+    ``rule_*`` columns.
+
+    Returns
+    -------
+    dict[str, Path]
+        Report name to written path.
+    """
+    out_dir = Path(out_dir)
+    written: dict[str, Any] = {
+        "top_comments": write_top_report(
+            df, out_dir / "top_comments_by_song.md", metric="length", k=k,
+        ),
+        "top_replies": write_top_report(
+            df, out_dir / "top_replies_by_song.md", metric="replies", k=k,
+        ),
+    }
+    if any(c.startswith("rule_") and c.endswith("_conf") for c in df.columns):
+        written["matched"] = write_matched_report(
+            df, out_dir / "matched_comments_detailed.md",
+        )
+    return written
@@ -4,7 +4,8 @@ Loads regex patterns from a YAML config file (nlp_pipeline/configs/regex_rules.y
 applies them to detect Adornian critique labels in YouTube comments.  Each
 label is associated with a set of positive patterns and optional negation
 patterns.  When a positive pattern matches but a negation pattern also matches
-in the same text, the positive hit is suppressed.
+within ``negation_window`` characters of it (anywhere in the text when the
+setting is absent), the positive hit is suppressed.
 
 Typical usage
 -------------
@@ -17,51 +18,221 @@ True
 
 from __future__ import annotations
 
+import bisect
+import hashlib
+import heapq
+import itertools
+import json
 import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
-
+from statistics import NormalDist
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+# The literal prefilter walks the stdlib's private regex parser; without
+# it required_literals() returns None and candidates are not prefiltered.
+try:  # Python >= 3.11
+    from re import _constants as _sre_c, _parser as _sre_parse
+except ImportError:  # pragma: no cover -- Python < 3.11
+    try:
+        import sre_constants as _sre_c
+        import sre_parse as _sre_parse
+    except ImportError:
+        _sre_c = _sre_parse = None
+
+import numpy as np
 import pandas as pd
 
-from .utils import get_logger, load_yaml
+from .taxonomy import load_taxonomy
+from .text_index import fold_case
+from .utils import (
+    SharedArray,
+    SharedTexts,
+    factorize_texts,
+    get_logger,
+    load_yaml,
+    log_memo_ratio,
+    resolve_copy,
+)
+
+if TYPE_CHECKING:
+    from .text_index import InvertedIndex
 
 logger = get_logger(__name__)
 
+_MIN_LITERAL_LENGTH = 3  # shorter required literals do not filter usefully
+_CANDIDATE_EXAMPLES = 10
+
+
+def wilson_interval(hits: int, total: int, level: float = 0.95) -> tuple[float, float]:
+    """Wilson score interval for the proportion ``hits / total``.
+
+    Better behaved than the normal approximation for small proportions and
+    small samples: the bounds stay within ``[0, 1]`` and are not zero-width
+    at ``hits == 0``.  Returns ``(0.0, 1.0)`` for ``total == 0``.
+
+    >>> [round(b, 4) for b in wilson_interval(5, 100)]
+    [0.0215, 0.1118]
+    """
+    if total <= 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    p = hits / total
+    denom = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denom
+    half = z * ((p * (1 - p) + z * z / (4 * total)) / total) ** 0.5 / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def load_min_confidence(path: str | Path | None = None) -> dict[str, float]:
+    """Per-label ``min_confidence`` thresholds from ``labels.yaml``.
+
+    Ordered by the taxonomy ``id`` so it can double as the canonical label
+    order.  See :mod:`nlp_pipeline.taxonomy`.
+    """
+    return load_taxonomy(path).min_confidence
+
 
 # ---------------------------------------------------------------------------
 # Data structures
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuleMatch:
     """Result of applying one label's rule set to a single piece of text.
 
+    Instances are immutable; the no-match results are shared singletons
+    (one per label and miner), so treat ``spans`` as read-only.
+
     Attributes
     ----------
     label : str
         The critique label (e.g. ``"STANDARDIZATION"``).
     matched : bool
-        ``True`` if at least one positive pattern matched *and* the match
-        was **not** suppressed by a negation pattern.
+        ``True`` if at least one positive-pattern match was **not**
+        suppressed by a negation pattern.
     confidence : float
-        The maximum confidence prior among all matching positive patterns.
-        ``0.0`` when nothing matched.
-    spans : list[tuple[int, int, str]]
-        List of ``(start, end, matched_text)`` for every positive-pattern
-        match found in the text.
+        The maximum confidence prior among the unsuppressed positive
+        matches.  ``0.0`` when nothing matched.
+    spans : Sequence[tuple[int, int, str]]
+        ``(start, end, matched_text)`` for every positive-pattern match
+        found in the text (a list; the empty tuple when there is none or
+        spans were not requested).
     negated : bool
-        ``True`` when a positive pattern matched but was subsequently
-        suppressed by a negation pattern.
+        ``True`` when positive patterns matched but every match was
+        subsequently suppressed by a negation pattern.
     """
 
     label: str
     matched: bool = False
     confidence: float = 0.0
-    spans: list[tuple[int, int, str]] = field(default_factory=list)
+    spans: Sequence[tuple[int, int, str]] = ()
     negated: bool = False
 
 
+class MatchBatch(NamedTuple):
+    """Result of :meth:`RuleMiner.match_texts`: one column per label.
+
+    Attributes
+    ----------
+    labels : list[str]
+        Column order of the arrays (sorted label names).
+    matched : np.ndarray
+        ``(n_texts, n_labels)`` bool array, as :attr:`RuleMatch.matched`.
+    confidence : np.ndarray
+        ``(n_texts, n_labels)`` float array, as :attr:`RuleMatch.confidence`.
+    spans : np.ndarray | None
+        ``(n_texts, n_labels)`` object array of span lists, or ``None``
+        when spans were not requested.
+    """
+
+    labels: list[str]
+    matched: np.ndarray
+    confidence: np.ndarray
+    spans: Optional[np.ndarray]
+
+
+class RulesRef(NamedTuple):
+    """A rule set by content hash, as handed to worker processes.
+
+    Made by :meth:`RuleMiner.shared_rules`.  Only the hash matters while a
+    worker already has that rule set compiled; on a miss the worker reads
+    the JSON-encoded config from the shared-memory segment *config*.
+
+    Attributes
+    ----------
+    digest : str
+        :attr:`RuleMiner.config_hash` of the rule set.
+    engine : str
+        Regex engine to compile it with.
+    config : tuple
+        :attr:`~nlp_pipeline.utils.SharedArray.handle` of the config.
+    """
+
+    digest: str
+    engine: str
+    config: tuple
+
+    def resolve(self) -> "RuleMiner":
+        """The miner for this rule set, compiled once per process."""
+        key = (self.digest, self.engine)
+        miner = _PROCESS_MINERS.get(key)
+        if miner is None:
+            shared = SharedArray.attach(self.config)
+            try:
+                config = json.loads(shared.array.tobytes())
+            finally:
+                shared.close()
+            miner = RuleMiner(config=config, engine=self.engine)
+            _PROCESS_MINERS[key] = miner
+            if len(_PROCESS_MINERS) > PROCESS_MINER_SLOTS:
+                _PROCESS_MINERS.popitem(last=False)
+        else:
+            _PROCESS_MINERS.move_to_end(key)
+        return miner
+
+
+# Returned by RuleMiner._first_hit when a label's hits were all negated.
+_NEGATED = -1.0
+
+ENGINES: tuple[str, ...] = ("re", "regex")
+
+
+class _ConcurrentPattern:
+    """A ``regex`` pattern whose matching releases the GIL.
+
+    Exposes the subset of the :class:`re.Pattern` interface the miner
+    uses, passing ``concurrent=True`` on every call.
+    """
+
+    __slots__ = ("_compiled", "pattern", "flags")
+
+    def __init__(self, compiled: Any) -> None:
+        self._compiled = compiled
+        self.pattern: str = compiled.pattern
+        self.flags: int = compiled.flags
+
+    def search(self, text: str, pos: int = 0) -> Any:
+        return self._compiled.search(text, pos, concurrent=True)
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[Any]:
+        return self._compiled.finditer(text, pos, concurrent=True)
+
+
 # ---------------------------------------------------------------------------
 # Compiled-rule container (internal)
 # ---------------------------------------------------------------------------
@@ -72,6 +243,139 @@ class _CompiledLabel:
 
     positive: list[tuple[re.Pattern, float]]  # (compiled regex, confidence)
     negation: list[re.Pattern]
+    # positive, highest confidence first (ties keep config order).
+    ranked: list[tuple[re.Pattern, float]] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.ranked = sorted(self.positive, key=lambda pc: -pc[1])
+
+
+def _empty_lists(shape: tuple[int, ...], shared: bool = False) -> np.ndarray:
+    """Object array of *shape* holding an empty list in every cell.
+
+    Each cell gets a fresh list, or with *shared* the same one -- a single
+    object instead of one per cell.
+    """
+    arr = np.empty(shape, dtype=object)
+    if shared:
+        arr.fill([])
+        return arr
+    for idx in np.ndindex(*shape):
+        arr[idx] = []
+    return arr
+
+
+def _trivial_mask(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """Rows to skip: ``is_trivial`` if present, else ``_emoji_only``.
+
+    ``is_trivial`` (set by :func:`preprocess_dataframe` on the cleaned text)
+    wins: ingest's ``_emoji_only`` regex also covers styled letters such as
+    mathematical bold, which normalise to real text.  ``None`` if neither
+    column exists.
+    """
+    for col in ("is_trivial", "_emoji_only"):
+        if col in df.columns:
+            return df[col].fillna(False).to_numpy(dtype=bool)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Literal prefilter
+# ---------------------------------------------------------------------------
+
+_REPEATS = set() if _sre_c is None else {
+    _sre_c.MAX_REPEAT,
+    _sre_c.MIN_REPEAT,
+    getattr(_sre_c, "POSSESSIVE_REPEAT", _sre_c.MAX_REPEAT),
+}
+
+
+def _literal_score(alternatives: list[str]) -> tuple[int, int]:
+    """Rank requirement sets: longest weakest literal, then fewest literals."""
+    return min(len(a) for a in alternatives), -len(alternatives)
+
+
+def _required_from(parsed: Any) -> Optional[list[str]]:
+    """Walk a parsed regex; see :func:`required_literals`."""
+    best: Optional[list[str]] = None
+    run: list[str] = []
+
+    def consider(req: Optional[list[str]]) -> None:
+        nonlocal best
+        if req and (best is None or _literal_score(req) > _literal_score(best)):
+            best = req
+
+    def flush() -> None:
+        if run:
+            consider(["".join(run)])
+            run.clear()
+
+    for op, av in parsed:
+        if op is _sre_c.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is _sre_c.AT:
+            continue  # zero-width: the literals on both sides stay adjacent
+        flush()
+        if op is _sre_c.SUBPATTERN:
+            consider(_required_from(av[-1]))
+        elif op is _sre_c.BRANCH:
+            alternatives = [_required_from(branch) for branch in av[1]]
+            if all(alternatives):
+                consider(sorted({lit for alt in alternatives for lit in alt}))
+        elif op in _REPEATS:
+            low, _high, item = av
+            if low >= 1:
+                consider(_required_from(item))
+        elif op is getattr(_sre_c, "ATOMIC_GROUP", None):
+            consider(_required_from(av))
+        elif op is _sre_c.ASSERT and av[0] == 1:  # positive lookahead
+            consider(_required_from(av[1]))
+    flush()
+    return best
+
+
+def required_literals(pattern: str, flags: int = re.IGNORECASE) -> Optional[list[str]]:
+    """Case-folded literals, one of which occurs in every match of *pattern*.
+
+    Used as a cheap substring prefilter before running the regex, against
+    texts folded with :func:`~nlp_pipeline.text_index.fold_case`.  Returns
+    ``None`` when no literal of at least three characters is guaranteed
+    (e.g. ``\\w+ music``'s ``" music"`` qualifies, ``[a-z]+`` does not), or
+    when the private ``re`` parser it relies on is unavailable or has
+    changed shape.
+
+    >>> required_literals(r"(?:made|built) for (?:tiktok|radio)")
+    [' for ']
+    """
+    if _sre_parse is None:
+        return None
+    parsed = _sre_parse.parse(pattern, flags)
+    try:
+        best = _required_from(parsed)
+    except (AttributeError, IndexError, TypeError, ValueError):
+        logger.debug("Cannot extract literals from %r; not prefiltering.", pattern)
+        return None
+    if best is None or _literal_score(best)[0] < _MIN_LITERAL_LENGTH:
+        return None
+    return sorted({fold_case(lit) for lit in best})
+
+
+def _literal_tokens(literal: str) -> list[str]:
+    """Word tokens of *literal* that are complete in any text containing it.
+
+    The first and last token may be cut off by the surrounding text
+    (``"ong s"`` inside ``"song sung"``), so they only count when the
+    literal begins / ends on a non-word character.
+    """
+    from .text_index import tokenize
+
+    tokens = tokenize(literal)
+    if tokens and re.match(r"\w", literal):
+        tokens = tokens[1:]
+    if tokens and re.search(r"\w$", literal):
+        tokens = tokens[:-1]
+    return tokens
 
 
 # ---------------------------------------------------------------------------
@@ -86,29 +390,141 @@ class RuleMiner:
     config_path : str | Path | None
         Path to the YAML config file.  Defaults to
         ``<project_root>/nlp_pipeline/configs/regex_rules.yaml``.
+    config : dict | None
+        An already-parsed config, instead of *config_path*.
+    engine : str
+        ``"re"`` (stdlib, default) or ``"regex"``.  The ``regex`` engine
+        matches with ``concurrent=True``, releasing the GIL, so
+        ``workers > 1`` in :meth:`match_texts` / :meth:`match_dataframe`
+        uses several cores from a thread pool.  Requires the ``regex``
+        package.
+
+    Raises
+    ------
+    ValueError
+        If the config sets ``settings.validate_labels: true`` (as the shipped
+        ``regex_rules.yaml`` does) and its labels disagree with
+        ``labels.yaml`` (see :meth:`~nlp_pipeline.taxonomy.Taxonomy.validate`).
+        Configs without the setting are not checked, so subset configs keep
+        working.
+
+    Notes
+    -----
+    A miner is immutable after construction (per-call state lives on the
+    stack, and :meth:`published_rules` publishes under a lock), so one
+    instance can be shared by any number of threads.
     """
 
-    def __init__(self, config_path: str | Path | None = None) -> None:
-        if config_path is None:
-            config_path = Path(__file__).parent / "regex_rules.yaml"
-        self._config_path = Path(config_path)
-
-        logger.info("Loading rule config from %s", self._config_path)
-        raw_config: dict[str, Any] = load_yaml(self._config_path)
+    def __init__(
+        self,
+        config_path: str | Path | None = None,
+        *,
+        engine: str = "re",
+        config: Optional[dict[str, Any]] = None,
+    ) -> None:
+        if config is not None and config_path is not None:
+            raise ValueError("Pass either config_path or config, not both.")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}. Choose from: {list(ENGINES)}")
+        self._engine = engine
+        self._published: Optional[RulesRef] = None
+        self._publish_lock = threading.Lock()
+        self._regex: Any = None
+        if engine == "regex":
+            try:
+                import regex
+            except ImportError as exc:  # pragma: no cover -- optional dependency
+                raise ImportError(
+                    "engine='regex' requires the regex package "
+                    "(see pipeline_requirements.txt)."
+                ) from exc
+            self._regex = regex
+
+        self._config_path: Optional[Path] = None
+        if config is None:
+            if config_path is None:
+                config_path = Path(__file__).parent / "regex_rules.yaml"
+            self._config_path = Path(config_path)
+            logger.info("Loading rule config from %s", self._config_path)
+            config = load_yaml(self._config_path) or {}
+        raw_config: dict[str, Any] = config
+        self._config_json = json.dumps(raw_config, sort_keys=True, default=str)
 
         self._settings: dict[str, Any] = raw_config.get("settings", {})
         self._case_insensitive: bool = self._settings.get("case_insensitive", True)
         self._word_boundary: bool = self._settings.get("word_boundary", True)
+        self._skip_trivial: bool = self._settings.get("skip_trivial", True)
+        window = self._settings.get("negation_window")
+        self._negation_window: Optional[int] = None if window is None else int(window)
+        if self._negation_window is not None and self._negation_window < 0:
+            raise ValueError(
+                f"negation_window must be non-negative, got {self._negation_window}."
+            )
 
         raw_rules: dict[str, Any] = raw_config.get("rules", {})
+        if self._settings.get("validate_labels", False):
+            load_taxonomy().validate(raw_rules)
         self._rules: dict[str, _CompiledLabel] = self._compile_rules(raw_rules)
 
+        # Shared, immutable results for the common no-match cases.
+        self._no_match = {label: RuleMatch(label=label) for label in self._rules}
+        self._all_negated = {
+            label: RuleMatch(label=label, negated=True) for label in self._rules
+        }
+
         logger.info(
             "Compiled rules for %d labels: %s",
             len(self._rules),
             ", ".join(sorted(self._rules)),
         )
 
+    @property
+    def labels(self) -> list[str]:
+        """Sorted list of the labels this miner detects."""
+        return sorted(self._rules)
+
+    @property
+    def config_hash(self) -> str:
+        """SHA-1 of the rule config; equal configs give equal hashes."""
+        return hashlib.sha1(self._config_json.encode("utf-8")).hexdigest()
+
+    @property
+    def engine(self) -> str:
+        """Regex engine the rules are compiled with (one of :data:`ENGINES`)."""
+        return self._engine
+
+    @contextmanager
+    def shared_rules(self) -> Iterator[RulesRef]:
+        """Publish the config in shared memory for the duration of a block.
+
+        Yields a :class:`RulesRef` to pass to worker processes, which call
+        :meth:`RulesRef.resolve` to get a compiled copy of this miner --
+        compiled on first use of this hash in each worker, then cached.
+        """
+        with self._publish_config() as shared:
+            yield RulesRef(self.config_hash, self._engine, shared.handle)
+
+    def published_rules(self) -> RulesRef:
+        """Like :meth:`shared_rules`, but published once per miner.
+
+        The first call publishes the config; later calls return the same
+        :class:`RulesRef`.  The segment is freed when the miner is garbage
+        collected (or at interpreter exit).
+        """
+        with self._publish_lock:
+            if self._published is None:
+                shared = self._publish_config()
+                weakref.finalize(self, shared.close)
+                self._published = RulesRef(self.config_hash, self._engine, shared.handle)
+            return self._published
+
+    def _publish_config(self) -> SharedArray:
+        """The JSON-encoded config in a new shared-memory segment."""
+        payload = np.frombuffer(self._config_json.encode("utf-8"), dtype=np.uint8)
+        shared = SharedArray.create(payload.shape, np.uint8)
+        shared.array[:] = payload
+        return shared
+
     # ------------------------------------------------------------------
     # Compilation
     # ------------------------------------------------------------------
@@ -131,8 +547,13 @@ class RuleMiner:
         flags = re.IGNORECASE if self._case_insensitive else 0
 
         try:
+            if self._regex is not None:
+                # VERSION0 keeps the semantics of the stdlib engine.
+                return _ConcurrentPattern(self._regex.compile(
+                    pattern_str, flags | self._regex.VERSION0,
+                ))
             return re.compile(pattern_str, flags)
-        except re.error as exc:
+        except (re.error, getattr(self._regex, "error", re.error)) as exc:
             logger.warning(
                 "Skipping invalid regex for label '%s': %r -> %s",
                 label,
@@ -194,59 +615,334 @@ class RuleMiner:
     # Single-text matching
     # ------------------------------------------------------------------
 
-    def match_text(self, text: str) -> dict[str, RuleMatch]:
+    def match_text(self, text: str, spans: bool = True) -> dict[str, RuleMatch]:
         """Apply all rules to a single piece of text.
 
         Parameters
         ----------
         text : str
             The comment text to evaluate.
+        spans : bool
+            Collect every positive match as a span.  With ``False`` only
+            ``matched``, ``confidence`` and ``negated`` are computed: the
+            patterns of each label are tried highest confidence first with
+            ``search`` and the label stops at its first unsuppressed hit,
+            so ``spans`` stays empty.  The three fields are identical in
+            both modes.
 
         Returns
         -------
         dict[str, RuleMatch]
             Mapping from each label to its :class:`RuleMatch` result.
         """
-        results: dict[str, RuleMatch] = {}
-
         # Handle empty / None text gracefully.
         if not text:
-            for label in self._rules:
-                results[label] = RuleMatch(label=label)
-            return results
+            return dict(self._no_match)
+
+        results: dict[str, RuleMatch] = {}
+        # Negation offsets per pattern, shared by every label of this text.
+        negation_cache: dict[re.Pattern, list[tuple[int, int]]] = {}
 
         for label, compiled in self._rules.items():
-            spans: list[tuple[int, int, str]] = []
-            max_conf: float = 0.0
-
-            # Check positive patterns.
-            for pattern, confidence in compiled.positive:
-                for m in pattern.finditer(text):
-                    spans.append((m.start(), m.end(), m.group()))
-                    max_conf = max(max_conf, confidence)
-
-            if not spans:
-                # No positive match at all.
-                results[label] = RuleMatch(label=label)
+            if spans:
+                results[label] = self._match_label(label, compiled, text, negation_cache)
                 continue
-
-            # Check negation patterns.
-            negated = False
-            for neg_pattern in compiled.negation:
-                if neg_pattern.search(text):
-                    negated = True
-                    break
-
-            results[label] = RuleMatch(
-                label=label,
-                matched=not negated,
-                confidence=max_conf if not negated else 0.0,
-                spans=spans,
-                negated=negated,
-            )
+            hit = self._first_hit(compiled, text, negation_cache)
+            if hit is None:
+                results[label] = self._no_match[label]
+            elif hit == _NEGATED:
+                results[label] = self._all_negated[label]
+            else:
+                results[label] = RuleMatch(label=label, matched=True, confidence=hit)
 
         return results
 
+    def _match_label(
+        self,
+        label: str,
+        compiled: _CompiledLabel,
+        text: str,
+        negation_cache: dict[re.Pattern, list[tuple[int, int]]],
+    ) -> RuleMatch:
+        """One label of :meth:`match_text`, collecting every span."""
+        spans: list[tuple[int, int, str]] = []
+        span_conf: list[float] = []
+
+        # Check positive patterns.
+        for pattern, confidence in compiled.positive:
+            for m in pattern.finditer(text):
+                spans.append((m.start(), m.end(), m.group()))
+                span_conf.append(confidence)
+
+        if not spans:
+            # No positive match at all.
+            return self._no_match[label]
+
+        suppressed = self._suppressed_spans(compiled, text, spans, negation_cache)
+        surviving = [c for c, sup in zip(span_conf, suppressed) if not sup]
+        negated = not surviving
+
+        return RuleMatch(
+            label=label,
+            matched=not negated,
+            confidence=max(surviving) if surviving else 0.0,
+            spans=spans,
+            negated=negated,
+        )
+
+    def _first_hit(
+        self,
+        compiled: _CompiledLabel,
+        text: str,
+        negation_cache: dict[re.Pattern, list[tuple[int, int]]],
+    ) -> Optional[float]:
+        """One label with ``spans=False``: its confidence, or no match.
+
+        Returns ``None`` when no positive pattern matches and
+        :data:`_NEGATED` when every hit is suppressed.  Since patterns are
+        tried by descending confidence, the first unsuppressed hit carries
+        the label's confidence.  Occurrences are only enumerated when a
+        negation pattern matches the text.
+        """
+        negations: Optional[list[tuple[int, int]]] = None
+        result: Optional[float] = None
+        for pattern, confidence in compiled.ranked:
+            m = pattern.search(text)
+            if m is None:
+                continue
+            if negations is None:
+                negations = self._negation_offsets(compiled, text, negation_cache)
+            if not negations:
+                return confidence
+            hits = [(m.start(), m.end()) for m in pattern.finditer(text)]
+            if not all(self._suppressed_by(negations, hits)):
+                return confidence
+            result = _NEGATED
+        return result
+
+    @staticmethod
+    def _negation_offsets(
+        compiled: _CompiledLabel,
+        text: str,
+        cache: Optional[dict[re.Pattern, list[tuple[int, int]]]] = None,
+    ) -> list[tuple[int, int]]:
+        """Sorted ``(start, end)`` of every negation match of a label.
+
+        Each pattern scans *text* once; its (already sorted) offsets are
+        kept in *cache*, so labels sharing a negation pattern reuse them,
+        and the per-pattern lists are merged rather than re-sorted.
+        """
+        if cache is None:
+            cache = {}
+        per_pattern = []
+        for neg_pattern in compiled.negation:
+            offsets = cache.get(neg_pattern)
+            if offsets is None:
+                offsets = cache[neg_pattern] = [
+                    m.span() for m in neg_pattern.finditer(text)
+                ]
+            per_pattern.append(offsets)
+        return list(heapq.merge(*per_pattern))
+
+    def _suppressed_spans(
+        self,
+        compiled: _CompiledLabel,
+        text: str,
+        spans: list[tuple[int, int, str]],
+        cache: Optional[dict[re.Pattern, list[tuple[int, int]]]] = None,
+    ) -> list[bool]:
+        """Which positive *spans* of a label a negation match suppresses.
+
+        With a ``negation_window`` of *w* characters, a span ``(s, e)`` is
+        suppressed when a negation match overlaps ``[s - w, e + w)``.
+        Without one, any negation match in *text* suppresses every span.
+        """
+        return self._suppressed_by(
+            self._negation_offsets(compiled, text, cache), spans,
+        )
+
+    def _suppressed_by(
+        self,
+        negations: list[tuple[int, int]],
+        spans: list[tuple[int, int, str]] | list[tuple[int, int]],
+    ) -> list[bool]:
+        """:meth:`_suppressed_spans` given the label's sorted *negations*."""
+        if not negations:
+            return [False] * len(spans)
+        window = self._negation_window
+        if window is None:
+            return [True] * len(spans)
+
+        # negations is sorted by start; reach[k] is the furthest end among
+        # the first k + 1 of them.  A span is suppressed iff some negation
+        # starting before e + w ends after s - w.
+        starts = [start for start, _ in negations]
+        reach = list(itertools.accumulate((end for _, end in negations), max))
+        suppressed = []
+        for start, end, *_ in spans:
+            k = bisect.bisect_left(starts, end + window)
+            suppressed.append(k > 0 and reach[k - 1] > start - window)
+        return suppressed
+
+    def _is_negated(
+        self,
+        compiled: _CompiledLabel,
+        text: str,
+        spans: list[tuple[int, int, str]],
+    ) -> bool:
+        """Whether every positive span of a label is suppressed in *text*."""
+        return all(self._suppressed_spans(compiled, text, spans))
+
+    # ------------------------------------------------------------------
+    # Batch matching
+    # ------------------------------------------------------------------
+
+    def match_texts(
+        self,
+        texts: Iterable[Any],
+        *,
+        spans: bool = False,
+        dtype: Any = np.float32,
+        workers: int = 1,
+        processes: int | Executor = 1,
+    ) -> MatchBatch:
+        """Apply all rules to many texts, writing into preallocated arrays.
+
+        Equivalent to calling :meth:`match_text` on every text, but no
+        per-text dict or :class:`RuleMatch` is built: results go straight
+        into ``(n_texts, n_labels)`` arrays, so a comment that matches
+        nothing allocates nothing.
+
+        Parameters
+        ----------
+        texts : Iterable
+            Texts to match.  Missing values are treated as ``""``, other
+            non-strings are converted with ``str``.
+        spans : bool
+            Also collect span lists (as :meth:`match_text` with
+            ``spans=True``); otherwise the first-hit mode is used.
+        dtype : numpy dtype
+            Dtype of the confidence array.  Defaults to ``float32``.
+        workers : int
+            Split the texts over this many threads, each filling its own
+            rows of the arrays.  Only the ``"regex"`` engine releases the
+            GIL while matching; with ``"re"`` extra threads add nothing.
+        processes : int | Executor
+            Split the texts over this many worker processes instead.  The
+            texts travel as one UTF-8 buffer in shared memory
+            (:class:`~nlp_pipeline.utils.SharedTexts`) and the workers,
+            each holding its own miner compiled from the same config, write
+            into shared result arrays.  A process-based executor (such as
+            :class:`~nlp_pipeline.pipeline.WorkerPool`) is used as is and
+            left running.  Not available with *spans*.
+
+        Returns
+        -------
+        MatchBatch
+            Label order, ``matched``, ``confidence`` and (with *spans*) a
+            ``spans`` array holding one list per cell.
+
+        Raises
+        ------
+        ValueError
+            If *workers* or *processes* is less than 1, or *spans* is
+            combined with ``processes > 1``.
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}.")
+        n_processes = _process_count(processes)
+        if spans and n_processes > 1:
+            raise ValueError("spans=True cannot be collected with processes > 1.")
+        texts = list(texts)
+        labels = self.labels
+        n = len(texts)
+        if n_processes > 1 and n >= 2 * n_processes:
+            if isinstance(processes, Executor):
+                return self._match_in_processes(texts, dtype, processes, n_processes)
+            with ProcessPoolExecutor(max_workers=n_processes) as pool:
+                return self._match_in_processes(texts, dtype, pool, n_processes)
+
+        matched = np.zeros((n, len(labels)), dtype=bool)
+        confidence = np.zeros((n, len(labels)), dtype=dtype)
+        span_cells = np.empty((n, len(labels)), dtype=object) if spans else None
+
+        def fill(start: int, stop: int) -> None:
+            self._fill_rows(texts, start, stop, matched, confidence, span_cells)
+
+        if workers == 1 or n < 2 * workers:
+            fill(0, n)
+        else:
+            # Threads write disjoint row ranges of the shared arrays.
+            bounds = np.linspace(0, n, workers + 1, dtype=int).tolist()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [
+                    pool.submit(fill, lo, hi) for lo, hi in zip(bounds, bounds[1:])
+                ]:
+                    future.result()
+
+        return MatchBatch(labels, matched, confidence, span_cells)
+
+    def _match_in_processes(
+        self, texts: list[Any], dtype: Any, pool: Executor, n_chunks: int,
+    ) -> MatchBatch:
+        """:meth:`match_texts` over worker processes and shared memory."""
+        labels = self.labels
+        shape = (len(texts), len(labels))
+        bounds = np.linspace(0, len(texts), n_chunks + 1, dtype=int).tolist()
+        rules = self.published_rules()
+        with SharedTexts.create(texts) as shared, \
+                SharedArray.create(shape, bool) as matched, \
+                SharedArray.create(shape, dtype) as confidence:
+            handles = (shared.handle, matched.handle, confidence.handle)
+            for future in [
+                pool.submit(_match_shared_rows, rules, handles, lo, hi)
+                for lo, hi in zip(bounds, bounds[1:])
+            ]:
+                future.result()
+            # Copy out before the segments are unlinked.
+            return MatchBatch(labels, matched.array.copy(), confidence.array.copy(), None)
+
+    def _fill_rows(
+        self,
+        texts: Sequence[Any],
+        start: int,
+        stop: int,
+        matched: np.ndarray,
+        confidence: np.ndarray,
+        span_cells: Optional[np.ndarray],
+    ) -> None:
+        """Match ``texts[start:stop]`` into the rows of the result arrays."""
+        labels = self.labels
+        rules = [self._rules[label] for label in labels]
+        negation_cache: dict[re.Pattern, list[tuple[int, int]]] = {}
+
+        for i in range(start, stop):
+            if i > start and (i - start) % 5000 == 0:
+                logger.info("RuleMiner: processed %d / %d rows", i - start, stop - start)
+            text = texts[i]
+            if not isinstance(text, str):
+                text = str(text) if pd.notna(text) else ""
+            if not text:
+                if span_cells is not None:
+                    for j in range(len(labels)):
+                        span_cells[i, j] = []
+                continue
+
+            negation_cache.clear()
+            for j, compiled in enumerate(rules):
+                if span_cells is not None:
+                    rm = self._match_label(labels[j], compiled, text, negation_cache)
+                    # The shared no-match result carries an immutable ().
+                    span_cells[i, j] = rm.spans if rm.spans else []
+                    if rm.matched:
+                        matched[i, j] = True
+                        confidence[i, j] = rm.confidence
+                    continue
+                hit = self._first_hit(compiled, text, negation_cache)
+                if hit is not None and hit != _NEGATED:
+                    matched[i, j] = True
+                    confidence[i, j] = hit
+
     # ------------------------------------------------------------------
     # DataFrame matching
     # ------------------------------------------------------------------
@@ -255,6 +951,12 @@ class RuleMiner:
         self,
         df: pd.DataFrame,
         text_col: str = "clean_text",
+        memoize: bool = False,
+        skip_trivial: Optional[bool] = None,
+        copy: bool = True,
+        spans: bool | str = True,
+        workers: int = 1,
+        processes: int | Executor = 1,
     ) -> pd.DataFrame:
         """Apply rules to every row of a DataFrame.
 
@@ -262,7 +964,8 @@ class RuleMiner:
 
         * ``rule_L`` (``bool``) -- whether the rule matched.
         * ``rule_L_conf`` (``float``) -- confidence prior (0.0 if no match).
-        * ``rule_L_spans`` (``list``) -- matched spans.
+        * ``rule_L_spans`` (``list``) -- matched spans (unless
+          ``spans=False``).
 
         Parameters
         ----------
@@ -270,13 +973,59 @@ class RuleMiner:
             Input DataFrame.  Must contain a column named *text_col*.
         text_col : str
             Name of the column containing the text to match against.
+        memoize : bool
+            Match each distinct text once and scatter the results back by
+            :func:`pandas.factorize` code.  Rows with equal text then share
+            the same ``rule_L_spans`` list object, and the empty lists
+            filled in for skipped (trivial) rows and, with
+            ``spans="matched"``, for labels that did not match are one
+            shared object.
+        skip_trivial : bool | None
+            Rows flagged ``is_trivial`` (by :func:`preprocess_dataframe`) or,
+            without that column, ``_emoji_only`` (by ingest) bypass matching
+            and get the no-match defaults.  ``None`` uses the
+            ``skip_trivial`` setting of the rule config (default ``True``).
+        copy : bool
+            Deep-copy *df*.  ``False`` appends the rule columns to a
+            copy-on-write view instead, so the (text) columns of *df* are
+            shared rather than duplicated; *df* itself is never modified.
+            Falls back to ``True`` without pandas copy-on-write.
+        spans : bool | str
+            ``True`` records every positive match in ``rule_L_spans``.
+            ``False`` skips span collection (see :meth:`match_text`) and
+            adds no ``rule_L_spans`` columns -- enough for
+            :meth:`coverage_report` and label counts.  ``"matched"`` runs
+            in two phases: booleans for every row first, then spans only
+            for the rows where ``rule_L`` is true (other rows get ``[]``,
+            including negated hits).
+        workers : int
+            Threads used for matching; see :meth:`match_texts`.
+        processes : int | Executor
+            Worker processes used for matching; see :meth:`match_texts`.
+            With ``spans="matched"`` only the first phase runs in them.
 
         Returns
         -------
         pd.DataFrame
-            A **copy** of *df* with the new rule columns appended.
+            A **copy** (or, with ``copy=False``, a view) of *df* with the
+            new rule columns appended.
+
+        Raises
+        ------
+        ValueError
+            If *spans* is not ``True``, ``False`` or ``"matched"``, or is
+            ``True`` with ``processes > 1``.
         """
-        df = df.copy()
+        if spans not in (True, False, "matched"):
+            raise ValueError(
+                f"spans must be True, False or 'matched', got {spans!r}."
+            )
+        if spans is True and _process_count(processes) > 1:
+            raise ValueError(
+                "spans=True cannot be collected with processes > 1; "
+                "use spans='matched' or spans=False."
+            )
+        df = df.copy(deep=resolve_copy(copy))
 
         if text_col not in df.columns:
             raise KeyError(
@@ -285,44 +1034,419 @@ class RuleMiner:
             )
 
         labels = sorted(self._rules)
+        n_rows = len(df)
+
+        if skip_trivial is None:
+            skip_trivial = self._skip_trivial
+        gate = _trivial_mask(df) if skip_trivial else None
+        active = np.flatnonzero(~gate) if gate is not None else None
+
+        texts = df[text_col] if active is None else df[text_col].iloc[active]
+        if active is not None:
+            logger.info(
+                "RuleMiner: skipping %d trivial rows", n_rows - len(active),
+            )
+        if memoize:
+            codes, texts = factorize_texts(texts)
+            log_memo_ratio(logger, "RuleMiner", n_rows, len(texts))
+
+        text_values = texts.tolist()
+        batch = self.match_texts(
+            text_values,
+            spans=spans is True,
+            dtype=np.float64,
+            workers=workers,
+            processes=processes,
+        )
+        span_cells = batch.spans
+
+        if spans == "matched":
+            # Phase 2: collect spans only where some label fired.
+            span_cells = _empty_lists(batch.matched.shape, shared=memoize)
+            rows = np.flatnonzero(batch.matched.any(axis=1))
+            if len(rows):
+                found = self.match_texts(
+                    [text_values[r] for r in rows.tolist()],
+                    spans=True,
+                    workers=workers,
+                )
+                hit_rows, hit_labels = np.nonzero(batch.matched[rows])
+                span_cells[rows[hit_rows], hit_labels] = found.spans[hit_rows, hit_labels]
+
+        # Assign new columns: scattered back by code when memoized, and
+        # into the non-trivial positions when gated.
+        for j, label in enumerate(labels):
+            matched = batch.matched[:, j]
+            conf = batch.confidence[:, j]
+            if memoize:
+                matched, conf = matched[codes], conf[codes]
+            if active is not None:
+                full_matched = np.zeros(n_rows, dtype=bool)
+                full_conf = np.zeros(n_rows, dtype=np.float64)
+                full_matched[active] = matched
+                full_conf[active] = conf
+                matched, conf = full_matched, full_conf
+            df[f"rule_{label}"] = matched
+            df[f"rule_{label}_conf"] = conf
+            if span_cells is None:
+                continue
+            label_spans = span_cells[:, j]
+            if memoize:
+                label_spans = label_spans[codes]
+            if active is not None:
+                full_spans = _empty_lists((n_rows,), shared=memoize)
+                full_spans[active] = label_spans
+                label_spans = full_spans
+            df[f"rule_{label}_spans"] = label_spans
+
+        logger.info(
+            "RuleMiner: finished processing %d rows across %d labels",
+            len(df),
+            len(labels),
+        )
+        return df
+
+    # ------------------------------------------------------------------
+    # Detections
+    # ------------------------------------------------------------------
+
+    def _resolve_thresholds(
+        self,
+        min_confidence: dict[str, float] | None,
+    ) -> tuple[list[str], np.ndarray]:
+        """Return the label order and the threshold vector aligned to it.
+
+        When *min_confidence* is ``None`` the thresholds (and order) come
+        from ``labels.yaml``; labels not listed there follow alphabetically
+        with a threshold of ``0.0``.
+        """
+        if min_confidence is None:
+            min_confidence = load_min_confidence()
+        labels = [l for l in min_confidence if l in self._rules]
+        labels += [l for l in sorted(self._rules) if l not in min_confidence]
+        thresholds = np.array(
+            [float(min_confidence.get(l, 0.0)) for l in labels], dtype=np.float64,
+        )
+        return labels, thresholds
 
-        # Pre-allocate result lists for efficiency.
-        col_matched: dict[str, list[bool]] = {l: [] for l in labels}
-        col_conf: dict[str, list[float]] = {l: [] for l in labels}
-        col_spans: dict[str, list[list[tuple[int, int, str]]]] = {l: [] for l in labels}
+    def label_matrix(
+        self,
+        df: pd.DataFrame,
+        min_confidence: dict[str, float] | None = None,
+    ) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """Stack the ``rule_*`` columns into thresholded NumPy matrices.
 
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Output of :meth:`match_dataframe`.  Missing label columns are
+            treated as "no hit".
+        min_confidence : dict[str, float] | None
+            Per-label minimum confidence.  ``None`` reads the thresholds
+            from ``labels.yaml``; pass ``{}`` to disable thresholding.
+
+        Returns
+        -------
+        tuple[list[str], np.ndarray, np.ndarray]
+            ``(labels, hits, confs)`` where *hits* is a ``(rows, labels)``
+            boolean multi-hot matrix and *confs* holds the confidence of
+            every surviving hit (``0.0`` elsewhere).
+        """
+        labels, thresholds = self._resolve_thresholds(min_confidence)
         n = len(df)
-        for idx, text in enumerate(df[text_col]):
-            if idx > 0 and idx % 5000 == 0:
-                logger.info("RuleMiner: processed %d / %d rows", idx, n)
+        hits = np.zeros((n, len(labels)), dtype=bool)
+        confs = np.zeros((n, len(labels)), dtype=np.float64)
 
-            text_str = str(text) if pd.notna(text) else ""
-            matches = self.match_text(text_str)
+        for j, label in enumerate(labels):
+            col_name = f"rule_{label}"
+            if col_name not in df.columns:
+                continue
+            hits[:, j] = df[col_name].fillna(False).to_numpy(dtype=bool)
+            conf_col = f"rule_{label}_conf"
+            if conf_col in df.columns:
+                confs[:, j] = df[conf_col].fillna(0.0).to_numpy(dtype=np.float64)
 
-            for label in labels:
-                rm = matches[label]
-                col_matched[label].append(rm.matched)
-                col_conf[label].append(rm.confidence)
-                col_spans[label].append(rm.spans)
+        hits &= confs >= thresholds
+        confs[~hits] = 0.0
+        return labels, hits, confs
 
-        # Assign new columns.
-        for label in labels:
-            df[f"rule_{label}"] = col_matched[label]
-            df[f"rule_{label}_conf"] = col_conf[label]
-            df[f"rule_{label}_spans"] = col_spans[label]
+    def detections(
+        self,
+        df: pd.DataFrame,
+        min_confidence: dict[str, float] | None = None,
+        *,
+        text_col: str = "clean_text",
+        raw_text_col: str = "text",
+        only_matched: bool = True,
+    ) -> pd.DataFrame:
+        """Build the per-comment detections table after :meth:`match_dataframe`.
+
+        Columns of the result (index is preserved from *df*):
+
+        * ``text`` / ``raw_text`` -- the cleaned and original comment.
+        * ``predicted_labels`` (``list[str]``) -- labels that survived the
+          ``min_confidence`` thresholds, in taxonomy order.
+        * ``n_labels`` (``int``) -- length of ``predicted_labels``.
+        * ``top_label`` (``str``) -- highest-confidence label (first in
+          taxonomy order on ties; missing when nothing matched).
+        * ``max_confidence`` (``float``).
+        * ``label_confs`` (``dict[str, float]``) -- confidence per label.
+        * one ``uint8`` multi-hot column per label.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Output of :meth:`match_dataframe`.
+        min_confidence : dict[str, float] | None
+            See :meth:`label_matrix`.
+        text_col, raw_text_col : str
+            Columns copied into ``text`` and ``raw_text`` (``""`` if absent).
+        only_matched : bool
+            Keep only rows with at least one label (the notebook's
+            ``df_det``).  ``False`` returns one row per input row.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        labels, hits, confs = self.label_matrix(df, min_confidence)
+
+        n_labels = hits.sum(axis=1)
+        keep = n_labels > 0 if only_matched else np.ones(len(df), dtype=bool)
+        hits, confs, n_labels = hits[keep], confs[keep], n_labels[keep]
+
+        max_conf = confs.max(axis=1, initial=0.0)
+        # Mask non-hits below any real confidence so argmax picks a hit.
+        top_idx = np.where(hits, confs, -1.0).argmax(axis=1) if labels else np.zeros(
+            len(hits), dtype=np.intp,
+        )
+        label_arr = np.array(labels + [None], dtype=object)
+        top_label = label_arr[np.where(n_labels > 0, top_idx, len(labels))]
+
+        # Split the flattened (row, label) hit coordinates back into
+        # per-row lists -- one pass over hits instead of rows x labels.
+        rows, cols = np.nonzero(hits)
+        bounds = np.cumsum(n_labels)[:-1]
+        label_groups = np.split(label_arr[cols], bounds)
+        conf_groups = np.split(confs[rows, cols], bounds)
+        predicted = [g.tolist() for g in label_groups]
+        label_confs = [
+            dict(zip(names, values.tolist()))
+            for names, values in zip(predicted, conf_groups)
+        ]
+
+        index = df.index[keep]
+
+        def _text(col: str) -> np.ndarray:
+            if col in df.columns:
+                return df[col].to_numpy(dtype=object)[keep]
+            return np.full(len(index), "", dtype=object)
+
+        det = pd.DataFrame(
+            {
+                "text": _text(text_col),
+                "raw_text": _text(raw_text_col),
+                "predicted_labels": predicted,
+                "n_labels": n_labels.astype(np.int64),
+                "top_label": top_label,
+                "max_confidence": max_conf,
+                "label_confs": label_confs,
+            },
+            index=index,
+        )
+        multi_hot = pd.DataFrame(hits.astype(np.uint8), columns=labels, index=index)
+        return pd.concat([det, multi_hot], axis=1)
 
+    # ------------------------------------------------------------------
+    # Candidate evaluation
+    # ------------------------------------------------------------------
+
+    def evaluate_candidate(
+        self,
+        df: pd.DataFrame,
+        pattern: str,
+        label: str,
+        confidence: float = 0.5,
+        *,
+        boundary: bool = False,
+        text_col: str = "clean_text",
+        index: Optional["InvertedIndex"] = None,
+    ) -> dict[str, Any]:
+        """Preview the effect of adding *pattern* to *label*'s rules.
+
+        Only rows that can possibly match are scanned: a literal that every
+        match must contain is extracted from the parsed regex and used as a
+        substring prefilter (or, with *index*, to look up candidate rows
+        from the posting lists of its complete words).  The label's
+        negation patterns are applied to the hits exactly as in
+        :meth:`match_text`.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Output of :meth:`match_dataframe` (needs *text_col* and the
+            ``rule_*`` columns for the overlap statistics).
+        pattern : str
+            Candidate regex, in ``regex_rules.yaml`` syntax.
+        label : str
+            Label the pattern would be added to.
+        confidence : float
+            Confidence prior the pattern would carry.
+        boundary : bool
+            Wrap the pattern in ``\\b`` anchors, like the YAML ``boundary``
+            flag.
+        text_col : str
+            Text column to match against.
+        index : InvertedIndex | None
+            Optional :class:`~nlp_pipeline.text_index.InvertedIndex` built on
+            the same rows of *df*, used to narrow the candidates further.
+
+        Returns
+        -------
+        dict[str, Any]
+            ``{"label", "pattern", "literals", "candidates", "hits",
+            "negated", "new_hits", "existing_hits", "raises_confidence",
+            "coverage_before_pct", "coverage_after_pct", "overlap",
+            "new_rows", "examples", "elapsed_s"}`` where ``hits`` counts
+            positive matches, ``negated`` those suppressed by the label's
+            negation patterns, ``new_hits`` / ``existing_hits`` split the
+            surviving hits by whether the label already fired on the row,
+            ``raises_confidence`` counts existing hits whose confidence
+            would increase, ``overlap`` counts new hits per *other* label
+            that already fired, and ``new_rows`` is the index of the new hits.
+
+        Raises
+        ------
+        KeyError
+            If *label* is unknown or *text_col* is missing.
+        ValueError
+            If *pattern* does not compile.
+        """
+        start = time.perf_counter()
+        if label not in self._rules:
+            raise KeyError(f"Unknown label '{label}'. Known: {self.labels}")
+        if text_col not in df.columns:
+            raise KeyError(
+                f"Text column '{text_col}' not found in DataFrame. "
+                f"Available columns: {list(df.columns)}"
+            )
+        compiled = self._compile_pattern(pattern, boundary=boundary, label=label)
+        if compiled is None:
+            raise ValueError(f"Candidate pattern does not compile: {pattern!r}")
+
+        n_rows = len(df)
+        texts = df[text_col].fillna("").astype(str)
+        try:
+            literals = required_literals(compiled.pattern, re.IGNORECASE & compiled.flags)
+        except re.error:  # regex-only syntax
+            literals = None
+
+        # -- 1. narrow the corpus --------------------------------------
+        candidates: Optional[np.ndarray] = None
+        if index is not None and literals:
+            if index.n_rows != n_rows:
+                raise ValueError("index was not built on the rows of df.")
+            word_lists = [_literal_tokens(lit) for lit in literals]
+            if all(word_lists):
+                candidates = np.unique(np.concatenate([
+                    index.search(all_of=words) for words in word_lists
+                ]))
+        if literals:
+            subset = texts if candidates is None else texts.iloc[candidates]
+            folded = subset.map(fold_case)
+            mask = np.zeros(len(subset), dtype=bool)
+            for lit in literals:
+                mask |= folded.str.contains(lit, regex=False).to_numpy(dtype=bool)
+            positions = np.arange(n_rows) if candidates is None else candidates
+            candidates = positions[mask]
+        elif candidates is None:
+            candidates = np.arange(n_rows)
+        if self._skip_trivial:
+            gate = _trivial_mask(df)
+            if gate is not None:
+                candidates = candidates[~gate[candidates]]
+
+        # -- 2. run the regex and negation on candidates only ----------
+        # Each distinct candidate text is evaluated once (0 = no match,
+        # 1 = hit, 2 = negated hit) and the outcome scattered back.
+        rule = self._rules[label]
+        codes, uniques = pd.factorize(texts.iloc[candidates], use_na_sentinel=False)
+        outcome = np.zeros(len(uniques), dtype=np.int8)
+        for i, text in enumerate(uniques.tolist()):
+            spans = [(m.start(), m.end(), m.group()) for m in compiled.finditer(text)]
+            if spans:
+                outcome[i] = 2 if self._is_negated(rule, text, spans) else 1
+        status = outcome[codes]
+        hits = candidates[status == 1]
+        n_negated = int((status == 2).sum())
+
+        # -- 3. compare with the existing rule output ------------------
+        def _flags(col: str) -> np.ndarray:
+            if col in df.columns:
+                return df[col].fillna(False).to_numpy(dtype=bool)
+            return np.zeros(n_rows, dtype=bool)
+
+        existing = _flags(f"rule_{label}")
+        existing_conf = (
+            df[f"rule_{label}_conf"].fillna(0.0).to_numpy(dtype=np.float64)
+            if f"rule_{label}_conf" in df.columns else np.zeros(n_rows)
+        )
+        any_before = np.logical_or.reduce(
+            [_flags(f"rule_{l}") for l in self._rules] + [np.zeros(n_rows, dtype=bool)]
+        )
+        is_new = ~existing[hits]
+        new_hits = hits[is_new]
+        any_after = any_before.copy()
+        any_after[new_hits] = True
+
+        overlap = {
+            other: int(_flags(f"rule_{other}")[new_hits].sum())
+            for other in self.labels
+            if other != label
+        }
+        result = {
+            "label": label,
+            "pattern": pattern,
+            "literals": literals,
+            "candidates": int(len(candidates)),
+            "hits": int(len(hits)) + n_negated,
+            "negated": n_negated,
+            "new_hits": int(len(new_hits)),
+            "existing_hits": int((~is_new).sum()),
+            "raises_confidence": int(
+                (existing_conf[hits[~is_new]] < confidence).sum()
+            ),
+            "coverage_before_pct": round(any_before.mean() * 100, 2) if n_rows else 0.0,
+            "coverage_after_pct": round(any_after.mean() * 100, 2) if n_rows else 0.0,
+            "overlap": {k: v for k, v in overlap.items() if v},
+            "new_rows": df.index[new_hits],
+            "examples": texts.iloc[new_hits[:_CANDIDATE_EXAMPLES]].tolist(),
+            "elapsed_s": round(time.perf_counter() - start, 4),
+        }
         logger.info(
-            "RuleMiner: finished processing %d rows across %d labels",
-            n,
-            len(labels),
+            "Candidate %r for %s: %d candidates scanned, %d new / %d existing "
+            "hits, %d negated (%.3fs)",
+            pattern,
+            label,
+            result["candidates"],
+            result["new_hits"],
+            result["existing_hits"],
+            result["negated"],
+            result["elapsed_s"],
         )
-        return df
+        return result
 
     # ------------------------------------------------------------------
     # Coverage report
     # ------------------------------------------------------------------
 
-    def coverage_report(self, df: pd.DataFrame) -> dict[str, Any]:
+    def coverage_report(
+        self,
+        df: pd.DataFrame,
+        *,
+        by: str | Sequence[str] | None = None,
+        ci_level: float = 0.95,
+    ) -> dict[str, Any]:
         """Compute coverage statistics after :meth:`match_dataframe`.
 
         Parameters
@@ -330,6 +1454,11 @@ class RuleMiner:
         df : pd.DataFrame
             DataFrame that has already been processed by
             :meth:`match_dataframe` (must contain ``rule_*`` columns).
+        by : str | Sequence[str] | None
+            Also break the coverage down by these columns (e.g.
+            ``["song_title", "language"]``); see :meth:`coverage_cube`.
+        ci_level : float
+            Confidence level of the intervals added for sampled data.
 
         Returns
         -------
@@ -349,6 +1478,16 @@ class RuleMiner:
                         ...
                     },
                 }
+
+            When *df* is a sample (``attrs["sample"]``, set by
+            :func:`~nlp_pipeline.data_ingest.ingest`), ``any_rule_hit_pct``
+            and every ``hit_pct`` get a ``*_ci`` entry: the Wilson interval
+            ``[low, high]`` in percent for the corpus-wide value, and the
+            report gains a ``sample`` entry.  The intervals ignore the
+            finite-population correction, so they are slightly conservative.
+
+            With *by*, the report also holds ``"by"`` (the column list) and
+            ``"groups"``, the :meth:`coverage_cube` DataFrame.
         """
         total = len(df)
         if total == 0:
@@ -398,6 +1537,18 @@ class RuleMiner:
             "any_rule_hit_pct": round(any_hit / total * 100, 2),
             "per_label": per_label,
         }
+        sample = df.attrs.get("sample")
+        if sample:
+            def pct_ci(hits: int) -> list[float]:
+                return [round(b * 100, 2) for b in wilson_interval(hits, total, ci_level)]
+
+            report["any_rule_hit_pct_ci"] = pct_ci(any_hit)
+            for stats in per_label.values():
+                stats["hit_pct_ci"] = pct_ci(stats["hits"])
+            report["sample"] = dict(sample, ci_level=ci_level)
+        if by is not None:
+            report["by"] = [by] if isinstance(by, str) else list(by)
+            report["groups"] = self.coverage_cube(df, report["by"])
 
         # Log a human-readable summary.
         logger.info("--- Rule Coverage Report ---")
@@ -413,3 +1564,188 @@ class RuleMiner:
             )
 
         return report
+
+    def coverage_cube(
+        self, df: pd.DataFrame, by: str | Sequence[str],
+    ) -> pd.DataFrame:
+        """Coverage per group of *by*, in one aggregation.
+
+        All ``rule_*`` / ``rule_*_conf`` columns are summed in a single
+        :meth:`~pandas.DataFrame.groupby`, instead of filtering *df* once
+        per group and label.  The result is a flat table, ready to save
+        for dashboards (see :func:`~nlp_pipeline.reports.write_coverage_cube`).
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Output of :meth:`match_dataframe`.
+        by : str | Sequence[str]
+            Grouping column(s).  Missing values form their own group.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per group, sorted by the group keys, with the *by*
+            columns, ``rows``, ``any_rule_hit``, ``any_rule_hit_pct`` and,
+            for every label ``L`` present in *df*, ``L_hits``,
+            ``L_hit_pct`` and ``L_avg_confidence`` -- the per-group
+            equivalents of :meth:`coverage_report`.
+
+        Raises
+        ------
+        KeyError
+            If a *by* column is not in *df*.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        missing = [col for col in by if col not in df.columns]
+        if missing:
+            raise KeyError(
+                f"Group column(s) {missing} not found in DataFrame. "
+                f"Available columns: {list(df.columns)}"
+            )
+        labels = [label for label in self.labels if f"rule_{label}" in df.columns]
+
+        hits = np.zeros((len(df), len(labels)), dtype=bool)
+        conf = np.zeros((len(df), len(labels)), dtype=np.float64)
+        for j, label in enumerate(labels):
+            hits[:, j] = df[f"rule_{label}"].fillna(False).to_numpy(dtype=bool)
+            conf_col = f"rule_{label}_conf"
+            if conf_col in df.columns:
+                values = df[conf_col].fillna(0.0).to_numpy(dtype=np.float64)
+                conf[:, j] = np.where(hits[:, j], values, 0.0)
+
+        sums = pd.DataFrame(
+            np.column_stack([
+                np.ones(len(df)), hits.any(axis=1), hits, conf,
+            ]),
+            columns=(
+                ["rows", "any_rule_hit"]
+                + [f"{label}_hits" for label in labels]
+                + [f"{label}_conf_sum" for label in labels]
+            ),
+        ).groupby(
+            [df[col].to_numpy() for col in by], dropna=False, sort=True,
+        ).sum()
+
+        rows = sums["rows"].to_numpy()
+        cube = pd.DataFrame({
+            "rows": rows.astype(np.int64),
+            "any_rule_hit": sums["any_rule_hit"].to_numpy(dtype=np.int64),
+            "any_rule_hit_pct": np.round(sums["any_rule_hit"].to_numpy() / rows * 100, 2),
+        }, index=sums.index)
+        for label in labels:
+            label_hits = sums[f"{label}_hits"].to_numpy()
+            conf_sum = sums[f"{label}_conf_sum"].to_numpy()
+            cube[f"{label}_hits"] = label_hits.astype(np.int64)
+            cube[f"{label}_hit_pct"] = np.round(label_hits / rows * 100, 2)
+            cube[f"{label}_avg_confidence"] = np.round(
+                np.divide(conf_sum, label_hits, out=np.zeros_like(conf_sum), where=label_hits > 0),
+                4,
+            )
+        cube.index.names = by
+        return cube.reset_index()
+
+
+# ---------------------------------------------------------------------------
+# Process workers
+# ---------------------------------------------------------------------------
+
+# Compiled miners by (config hash, engine), most recently used last; see
+# RulesRef.resolve.  Each worker process keeps at most PROCESS_MINER_SLOTS.
+_PROCESS_MINERS: OrderedDict[tuple[str, str], RuleMiner] = OrderedDict()
+PROCESS_MINER_SLOTS: int = 4
+
+
+def _process_count(processes: int | Executor) -> int:
+    """Number of worker processes behind *processes* (a count or a pool)."""
+    if isinstance(processes, Executor):
+        return getattr(processes, "_max_workers", 1)
+    if processes < 1:
+        raise ValueError(f"processes must be at least 1, got {processes}.")
+    return processes
+
+
+def _match_shared_rows(rules: RulesRef, handles: tuple, start: int, stop: int) -> None:
+    """Match rows ``start:stop`` of shared texts into shared result arrays."""
+    texts_handle, matched_handle, confidence_handle = handles
+    texts = SharedTexts.attach(texts_handle)
+    matched = SharedArray.attach(matched_handle)
+    confidence = SharedArray.attach(confidence_handle)
+    try:
+        rules.resolve()._fill_rows(
+            texts, start, stop, matched.array, confidence.array, None,
+        )
+    finally:
+        texts.close()
+        matched.close()
+        confidence.close()
+
+
+# ---------------------------------------------------------------------------
+# Incremental coverage
+# ---------------------------------------------------------------------------
+
+class RunningCoverage:
+    """Coverage counters that are updated batch by batch.
+
+    Produces the same report structure as :meth:`RuleMiner.coverage_report`,
+    but accumulates it over successive outputs of
+    :meth:`RuleMiner.match_dataframe` instead of requiring the full
+    DataFrame, so coverage can be monitored while data is still arriving.
+
+    Parameters
+    ----------
+    labels : Iterable[str]
+        Labels to track (e.g. ``sorted(miner._rules)``).
+    """
+
+    def __init__(self, labels: Iterable[str]) -> None:
+        self.labels: list[str] = sorted(labels)
+        self.total_rows = 0
+        self.any_rule_hit = 0
+        self._hits: dict[str, int] = {label: 0 for label in self.labels}
+        self._conf_sums: dict[str, float] = {label: 0.0 for label in self.labels}
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Add the ``rule_*`` columns of a matched batch to the counters."""
+        if df.empty:
+            return
+        any_hit_mask = pd.Series(False, index=df.index)
+        for label in self.labels:
+            col_name = f"rule_{label}"
+            if col_name not in df.columns:
+                continue
+            hit_mask = df[col_name].astype(bool)
+            any_hit_mask = any_hit_mask | hit_mask
+            self._hits[label] += int(hit_mask.sum())
+            conf_col = f"rule_{label}_conf"
+            if conf_col in df.columns:
+                self._conf_sums[label] += float(df.loc[hit_mask, conf_col].sum())
+        self.total_rows += len(df)
+        self.any_rule_hit += int(any_hit_mask.sum())
+
+    def report(self) -> dict[str, Any]:
+        """Return the current counters in :meth:`RuleMiner.coverage_report` form."""
+        total = self.total_rows
+        if total == 0:
+            return {
+                "total_rows": 0,
+                "any_rule_hit": 0,
+                "any_rule_hit_pct": 0.0,
+                "per_label": {},
+            }
+        per_label: dict[str, dict[str, Any]] = {}
+        for label in self.labels:
+            hits = self._hits[label]
+            avg_conf = self._conf_sums[label] / hits if hits else 0.0
+            per_label[label] = {
+                "hits": hits,
+                "hit_pct": round(hits / total * 100, 2),
+                "avg_confidence": round(avg_conf, 4),
+            }
+        return {
+            "total_rows": total,
+            "any_rule_hit": self.any_rule_hit,
+            "any_rule_hit_pct": round(self.any_rule_hit / total * 100, 2),
+            "per_label": per_label,
+        }
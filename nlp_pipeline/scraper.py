@@ -0,0 +1,636 @@
+"""Concurrent, resumable YouTube comment scraper.
+
+Replaces the notebook's sequential scraping loop.  Several videos are fetched
+at once on a thread pool, every request goes through one shared
+:class:`RateLimiter`, and comments are streamed straight to one JSONL file per
+video instead of being collected in memory.
+
+After every page the scraper records a checkpoint (the page source's
+continuation state plus the byte offset of the video's JSONL file).  When a
+run is interrupted, the next run truncates each file back to its last
+checkpoint and continues from there, so no comment is lost or written twice.
+How much is fetched again depends on the page source: :class:`ReplayPageSource`
+continues at the next page, while :class:`DownloaderPageSource` has no access
+to the downloader's continuation tokens and re-downloads the video, skipping
+the comments already written.
+
+Comments are obtained from a *page source*: any object with an
+``iter_pages(url, state, limiter)`` method yielding :class:`Page` objects.
+
+* :class:`DownloaderPageSource` wraps ``youtube-comment-downloader``.
+* :class:`ReplayPageSource` replays recorded pages and is used in tests.
+
+Typical usage
+-------------
+>>> from nlp_pipeline.scraper import CommentScraper, load_video_tasks
+>>> tasks = load_video_tasks("data/youtube_urls.csv")
+>>> scraper = CommentScraper("data/raw_comments", workers=4, rate=2.0)
+>>> summary = scraper.scrape(tasks)
+>>> merge_video_files("data/raw_comments", "data/comments.jsonl")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Protocol
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from .utils import ensure_dir, get_logger, load_json
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+_CHECKPOINT_NAME: str = "_checkpoint.json"
+_DEFAULT_PAGE_SIZE: int = 100  # comments per pseudo-page for the downloader
+_SORT_BY_POPULAR: int = 0
+_SORT_BY_RECENT: int = 1
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+@dataclass
+class VideoTask:
+    """One video to scrape, with the metadata copied onto its comments."""
+
+    url: str
+    song_title: Optional[str] = None
+    artists: Optional[str] = None
+
+    @property
+    def video_id(self) -> str:
+        """YouTube video ID parsed from :attr:`url`."""
+        return extract_video_id(self.url)
+
+
+class Page(NamedTuple):
+    """A page of comments plus the state needed to resume *after* it.
+
+    ``state`` is a JSON-serialisable dict handed back to the page source on
+    resume, or ``None`` when the video has no further pages.
+    """
+
+    comments: list[dict[str, Any]]
+    state: Optional[dict[str, Any]]
+
+
+class PageSource(Protocol):
+    """Protocol for objects that produce pages of comments for a video."""
+
+    def iter_pages(
+        self,
+        url: str,
+        state: Optional[dict[str, Any]],
+        limiter: "RateLimiter",
+    ) -> Iterator[Page]:
+        """Yield pages for *url*, starting after *state* (``None`` = start)."""
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def extract_video_id(url: str) -> str:
+    """Return the video ID from a ``watch?v=``, ``youtu.be`` or ``/shorts/``
+    URL.
+
+    Raises
+    ------
+    ValueError
+        If no video ID can be found.
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.endswith("youtu.be"):
+        video_id = parsed.path.lstrip("/").split("/")[0]
+    elif parsed.path.startswith(("/shorts/", "/embed/", "/live/")):
+        video_id = parsed.path.split("/")[2]
+    else:
+        video_id = parse_qs(parsed.query).get("v", [""])[0]
+    if not video_id:
+        raise ValueError(f"Cannot extract a YouTube video ID from {url!r}.")
+    return video_id
+
+
+def load_video_tasks(path: str | Path) -> list[VideoTask]:
+    """Read scrape targets from a ``youtube_urls.csv``-style file.
+
+    Expects the ``YouTube URL``, ``Song Title`` and ``Artists`` columns of
+    ``data/youtube_urls.csv``.  Rows without a URL are skipped.
+    """
+    df = pd.read_csv(path, dtype=str)
+    if "YouTube URL" not in df.columns:
+        raise ValueError(
+            f"{path} has no 'YouTube URL' column. Found: {list(df.columns)}"
+        )
+    tasks: list[VideoTask] = []
+    for row in df.to_dict("records"):
+        url = row.get("YouTube URL")
+        if not isinstance(url, str) or not url.strip():
+            logger.warning("Skipping row without URL: %s", row.get("Song Title"))
+            continue
+        tasks.append(VideoTask(
+            url=url.strip(),
+            song_title=row.get("Song Title") if pd.notna(row.get("Song Title")) else None,
+            artists=row.get("Artists") if pd.notna(row.get("Artists")) else None,
+        ))
+    return tasks
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Thread-safe token bucket shared by all scraping threads.
+
+    Parameters
+    ----------
+    rate : float
+        Sustained requests per second.  ``0`` disables limiting.
+    burst : int
+        Maximum number of requests that may be issued back to back.
+    clock, sleep : callable
+        Injected for testing; default to :func:`time.monotonic` and
+        :func:`time.sleep`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate < 0:
+            raise ValueError(f"rate must be non-negative, got {rate}.")
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be issued."""
+        if self.rate == 0:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._last) * self.rate
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+# ---------------------------------------------------------------------------
+# Page sources
+# ---------------------------------------------------------------------------
+
+class DownloaderPageSource:
+    """Page source backed by ``youtube-comment-downloader``.
+
+    The downloader hides its continuation tokens inside a generator, so this
+    source cannot pick a crawl up where it stopped.  Pages are fixed-size
+    batches of that generator and the state is the ID of the last comment
+    written (``last_cid``); a rerun downloads the video's comments again
+    from the first request and only *skips writing* those up to and
+    including that comment.  Rerunning after a crash therefore costs the
+    requests again, but never duplicates or loses a written comment.  Every
+    HTTP request -- the initial watch page as well as the continuation
+    requests -- is routed through the shared rate limiter.
+
+    Only the "recent" order is stable enough to skip by comment ID: the
+    "popular" order is re-ranked between requests, so skipping could drop or
+    repeat comments.  Rerunning a partially scraped video with ``sort_by=0``
+    therefore raises :class:`RuntimeError`; remove the video's JSONL file
+    and checkpoint entry to scrape it again from the start.
+
+    Parameters
+    ----------
+    sort_by : int
+        ``1`` for recent (the default), ``0`` for popular (the notebook's
+        order, which cannot skip already-written comments).
+    page_size : int
+        Number of comments per checkpointed page.
+    language : str | None
+        Optional interface language passed to the downloader.
+    """
+
+    def __init__(
+        self,
+        sort_by: int = _SORT_BY_RECENT,
+        page_size: int = _DEFAULT_PAGE_SIZE,
+        language: Optional[str] = None,
+    ) -> None:
+        self.sort_by = sort_by
+        self.page_size = page_size
+        self.language = language
+
+    def iter_pages(
+        self,
+        url: str,
+        state: Optional[dict[str, Any]],
+        limiter: RateLimiter,
+    ) -> Iterator[Page]:
+        if state and self.sort_by == _SORT_BY_POPULAR:
+            raise RuntimeError(
+                f"Cannot skip the already-written comments of {url} with "
+                "sort_by=0 (popular): the order is not stable between runs.  "
+                "Delete the video's JSONL file and "
+                "checkpoint entry to start over, or scrape with sort_by=1."
+            )
+
+        from youtube_comment_downloader import YoutubeCommentDownloader
+
+        # One downloader (and HTTP session) per video/thread.
+        downloader = YoutubeCommentDownloader()
+        request = downloader.session.request
+
+        def _limited_request(*args: Any, **kwargs: Any) -> Any:
+            limiter.acquire()
+            return request(*args, **kwargs)
+
+        # Session.get/post both go through Session.request.
+        downloader.session.request = _limited_request
+
+        last_cid = (state or {}).get("last_cid")
+        # Checkpoints written before last_cid existed only have a count.
+        skip = 0 if last_cid else int((state or {}).get("offset", 0))
+        consumed = 0
+        batch: list[dict[str, Any]] = []
+        comments = downloader.get_comments_from_url(
+            url, sort_by=self.sort_by, language=self.language, sleep=0,
+        )
+        for comment in comments or ():
+            consumed += 1
+            if last_cid is not None:
+                if comment.get("cid") == last_cid:
+                    last_cid = None
+                continue
+            if consumed <= skip:
+                continue
+            batch.append(comment)
+            if len(batch) >= self.page_size:
+                yield Page(batch, {"offset": consumed, "last_cid": batch[-1].get("cid")})
+                batch = []
+        if last_cid is not None:
+            raise RuntimeError(
+                f"Checkpointed comment {last_cid!r} no longer appears in {url}; "
+                "cannot tell where to resume."
+            )
+        yield Page(batch, None)
+
+
+class ReplayPageSource:
+    """Page source that replays recorded pages, for tests and offline runs.
+
+    Parameters
+    ----------
+    pages : dict[str, list[list[dict]]]
+        Mapping from video URL to its recorded pages, in order.
+    fail_after : dict[str, int] | None
+        Optional ``{url: n}``; raise :class:`RuntimeError` when page *n* of
+        *url* is requested, to simulate a crash mid-crawl.
+    """
+
+    def __init__(
+        self,
+        pages: dict[str, list[list[dict[str, Any]]]],
+        fail_after: Optional[dict[str, int]] = None,
+    ) -> None:
+        self.pages = pages
+        self.fail_after = dict(fail_after or {})
+        self.requests: list[tuple[str, int]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dir(cls, path: str | Path) -> "ReplayPageSource":
+        """Load recordings from ``<video_id>.json`` files in *path*.
+
+        Each file holds ``{"url": ..., "pages": [[comment, ...], ...]}``.
+        """
+        pages: dict[str, list[list[dict[str, Any]]]] = {}
+        for file in sorted(Path(path).glob("*.json")):
+            recording = load_json(file)
+            pages[recording["url"]] = recording["pages"]
+        return cls(pages)
+
+    def iter_pages(
+        self,
+        url: str,
+        state: Optional[dict[str, Any]],
+        limiter: RateLimiter,
+    ) -> Iterator[Page]:
+        recorded = self.pages.get(url, [])
+        for index in range(int((state or {}).get("page", 0)), len(recorded)):
+            limiter.acquire()
+            with self._lock:
+                self.requests.append((url, index))
+            if self.fail_after.get(url) == index:
+                raise RuntimeError(f"Simulated failure on page {index} of {url}")
+            next_state = {"page": index + 1} if index + 1 < len(recorded) else None
+            yield Page([dict(c) for c in recorded[index]], next_state)
+
+
+# ---------------------------------------------------------------------------
+# Checkpointing
+# ---------------------------------------------------------------------------
+
+class Checkpoint:
+    """Per-video resume state persisted atomically to a JSON file.
+
+    Each entry holds the page source ``state``, the number of comments
+    written (``count``), the byte ``offset`` of the video's JSONL file at
+    that point, and whether the video is ``done``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: dict[str, dict[str, Any]] = (
+            load_json(self.path) if self.path.is_file() else {}
+        )
+
+    def get(self, video_id: str) -> dict[str, Any]:
+        """Return a copy of the saved entry for *video_id* (``{}`` if none)."""
+        with self._lock:
+            return dict(self._data.get(video_id, {}))
+
+    def update(self, video_id: str, **entry: Any) -> None:
+        """Replace the entry for *video_id* and persist the checkpoint."""
+        with self._lock:
+            self._data[video_id] = entry
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Scraper
+# ---------------------------------------------------------------------------
+
+class CommentScraper:
+    """Scrape comments for many videos concurrently with resumable state.
+
+    Parameters
+    ----------
+    out_dir : str | Path
+        Directory receiving one ``<video_id>.jsonl`` file per video and the
+        checkpoint file.
+    source : PageSource | None
+        Where pages come from.  Defaults to :class:`DownloaderPageSource`.
+    workers : int
+        Number of videos fetched concurrently.
+    rate : float
+        Global request rate limit (requests per second, ``0`` = unlimited).
+    burst : int
+        Token-bucket burst size for the rate limiter.
+    max_comments : int | None
+        Optional global cap on comments written across all videos in this
+        run.  A page that would exceed the cap is not written; videos cut
+        short are resumed on the next run.
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path,
+        source: Optional[PageSource] = None,
+        *,
+        workers: int = 4,
+        rate: float = 2.0,
+        burst: int = 1,
+        max_comments: Optional[int] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}.")
+        self.out_dir = ensure_dir(out_dir)
+        self.source: PageSource = source or DownloaderPageSource()
+        self.workers = workers
+        self.limiter = RateLimiter(rate, burst)
+        self.max_comments = max_comments
+        self.checkpoint = Checkpoint(self.out_dir / _CHECKPOINT_NAME)
+
+        self.last_summary: Optional[dict[str, Any]] = None
+
+        self._written = 0
+        self._count_lock = threading.Lock()
+        self._on_page: Optional[Callable[[VideoTask, list[dict[str, Any]]], None]] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def video_path(self, video_id: str) -> Path:
+        """Path of the JSONL file for *video_id*."""
+        return self.out_dir / f"{video_id}.jsonl"
+
+    def scrape(
+        self,
+        tasks: Iterable[VideoTask],
+        on_page: Optional[Callable[[VideoTask, list[dict[str, Any]]], None]] = None,
+    ) -> dict[str, Any]:
+        """Scrape every task, resuming from the checkpoint where possible.
+
+        Parameters
+        ----------
+        tasks:
+            Videos to scrape.
+        on_page:
+            Optional callback invoked with ``(task, comments)`` after each
+            page has been written and checkpointed.  Called from worker
+            threads.
+
+        Returns
+        -------
+        dict
+            Summary with ``comments_written``, ``videos_done``,
+            ``videos_failed`` (``{video_id: error}``) and ``elapsed_s``.
+        """
+        tasks = list(tasks)
+        self._written = 0
+        self._on_page = on_page
+        start = time.perf_counter()
+        failed: dict[str, str] = {}
+        done = 0
+
+        logger.info(
+            "Scraping %d videos with %d workers (rate=%.2f/s)",
+            len(tasks),
+            self.workers,
+            self.limiter.rate,
+        )
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._scrape_video, t): t for t in tasks}
+            for future, task in futures.items():
+                try:
+                    if future.result():
+                        done += 1
+                except Exception as exc:  # noqa: BLE001
+                    failed[task.video_id] = str(exc)
+                    logger.error("Scraping %s failed: %s", task.url, exc)
+
+        summary = {
+            "comments_written": self._written,
+            "videos_done": done,
+            "videos_failed": failed,
+            "elapsed_s": round(time.perf_counter() - start, 3),
+        }
+        self.last_summary = summary
+        logger.info(
+            "Scrape finished: %d comments written, %d/%d videos complete.",
+            self._written,
+            done,
+            len(tasks),
+        )
+        return summary
+
+    def iter_comments(self, tasks: Iterable[VideoTask]) -> Iterator[dict[str, Any]]:
+        """Run :meth:`scrape` in the background and yield comments as they
+        are written.
+
+        Comments are yielded page by page, after each page has been
+        checkpointed, so consumers such as
+        :func:`~nlp_pipeline.pipeline.classify_stream` see data while the
+        crawl is still running.  The scrape summary is available as
+        :attr:`last_summary` once the iterator is exhausted.
+        """
+        pages: queue.Queue = queue.Queue()
+        done = object()
+        errors: list[BaseException] = []
+
+        def _run() -> None:
+            try:
+                self.scrape(tasks, on_page=lambda _task, comments: pages.put(comments))
+            except BaseException as exc:  # noqa: BLE001 -- re-raised below
+                errors.append(exc)
+            finally:
+                pages.put(done)
+
+        thread = threading.Thread(target=_run, name="comment-scraper", daemon=True)
+        thread.start()
+        while True:
+            item = pages.get()
+            if item is done:
+                break
+            yield from item
+        thread.join()
+        if errors:
+            raise errors[0]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _reserve(self, n: int) -> bool:
+        """Reserve *n* comments under the global cap; ``False`` if over it."""
+        with self._count_lock:
+            if self.max_comments is not None and self._written + n > self.max_comments:
+                return False
+            self._written += n
+            return True
+
+    def _scrape_video(self, task: VideoTask) -> bool:
+        """Scrape one video.  Returns ``True`` once the video is complete."""
+        video_id = task.video_id
+        entry = self.checkpoint.get(video_id)
+        if entry.get("done"):
+            logger.info("Skipping %s (already complete)", video_id)
+            return True
+
+        path = self.video_path(video_id)
+        offset = int(entry.get("offset", 0))
+        count = int(entry.get("count", 0))
+        state = entry.get("state")
+        if entry:
+            logger.info("Resuming %s after %d comments", video_id, count)
+
+        with open(path, "ab") as f:
+            # Drop anything written after the last checkpoint.
+            f.truncate(offset)
+            f.seek(offset)
+
+            for page in self.source.iter_pages(task.url, state, self.limiter):
+                if not self._reserve(len(page.comments)):
+                    # Global cap reached: stop before this page so it is
+                    # fetched again on the next run.
+                    logger.info("Comment cap reached while scraping %s", video_id)
+                    return False
+
+                for comment in page.comments:
+                    comment["song_title"] = task.song_title
+                    comment["artists"] = task.artists
+                    comment["youtube_url"] = task.url
+                    comment["video_id"] = video_id
+                    f.write((json.dumps(comment, ensure_ascii=False) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+                count += len(page.comments)
+                offset = f.tell()
+                state = page.state
+                self.checkpoint.update(
+                    video_id, state=state, count=count, offset=offset,
+                    done=state is None,
+                )
+                if self._on_page is not None and page.comments:
+                    self._on_page(task, page.comments)
+                if state is None:
+                    break
+
+        self.checkpoint.update(
+            video_id, state=None, count=count, offset=offset, done=True,
+        )
+        logger.info("Finished %s: %d comments", video_id, count)
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Merging
+# ---------------------------------------------------------------------------
+
+def merge_video_files(out_dir: str | Path, dest: str | Path) -> int:
+    """Concatenate all per-video JSONL files in *out_dir* into *dest*.
+
+    The merged file can be fed straight to :func:`~nlp_pipeline.data_ingest.ingest`
+    or ``python -m nlp_pipeline run``.  Returns the number of lines written.
+    """
+    dest = Path(dest)
+    ensure_dir(dest.parent)
+    n_lines = 0
+    with open(dest, "w", encoding="utf-8") as out:
+        for file in sorted(Path(out_dir).glob("*.jsonl")):
+            if file.resolve() == dest.resolve():
+                continue
+            with open(file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        out.write(line if line.endswith("\n") else line + "\n")
+                        n_lines += 1
+    logger.info("Merged %d comments into %s", n_lines, dest)
+    return n_lines
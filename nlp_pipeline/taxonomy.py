@@ -0,0 +1,282 @@
+"""Label taxonomy: thresholds, the NONE rule and label bitmasks.
+
+Loads ``labels.yaml`` (once per path), checks it against the labels that
+:class:`~nlp_pipeline.rule_miner.RuleMiner` compiles from
+``regex_rules.yaml``, and applies it to the output of
+:meth:`~nlp_pipeline.rule_miner.RuleMiner.match_dataframe`:
+
+* hits whose confidence is below the label's ``min_confidence`` are
+  dropped (``rule_L`` set to ``False``, ``rule_L_conf`` to ``0.0``);
+* ``rule_NONE`` is set IFF every critique label is false;
+* ``label_mask`` packs all labels into one unsigned integer (bit ``id``
+  per label) for fast filtering and group-bys.
+
+Typical usage
+-------------
+>>> from nlp_pipeline.taxonomy import apply_taxonomy, load_taxonomy
+>>> df = apply_taxonomy(miner.match_dataframe(df))
+>>> tax = load_taxonomy()
+>>> df[df["label_mask"] & tax.mask("STANDARDIZATION") != 0]
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .utils import get_logger, load_yaml
+
+logger = get_logger(__name__)
+
+_DEFAULT_LABELS_PATH = Path(__file__).parent / "labels.yaml"
+
+_NONE_LABEL = "NONE"
+MASK_COL = "label_mask"
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class LabelSpec:
+    """One entry of the ``labels`` mapping in ``labels.yaml``."""
+
+    name: str
+    id: int
+    short: str = ""
+    description: str = ""
+    min_confidence: float = 0.0
+    target_precision: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class Taxonomy:
+    """The parsed label taxonomy.
+
+    Attributes
+    ----------
+    labels : tuple[LabelSpec, ...]
+        Every label (critique labels and ``NONE``), ordered by ``id``.
+    none_label : str
+        Name of the label assigned when no critique label fires.
+    policy : dict
+        The free-form ``policy`` block, kept for reference.
+    """
+
+    labels: tuple[LabelSpec, ...]
+    none_label: str = _NONE_LABEL
+    policy: Optional[dict[str, Any]] = None
+
+    @property
+    def critique_labels(self) -> list[str]:
+        """Critique label names (everything but :attr:`none_label`), by id."""
+        return [spec.name for spec in self.labels if spec.name != self.none_label]
+
+    @property
+    def min_confidence(self) -> dict[str, float]:
+        """Per-critique-label ``min_confidence`` thresholds, by id."""
+        return {
+            spec.name: spec.min_confidence
+            for spec in self.labels
+            if spec.name != self.none_label
+        }
+
+    @property
+    def mask_dtype(self) -> np.dtype:
+        """Smallest unsigned integer dtype that holds every label bit."""
+        top = max((spec.id for spec in self.labels), default=0)
+        for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+            if top < np.iinfo(dtype).bits:
+                return np.dtype(dtype)
+        raise ValueError(f"Label id {top} does not fit in a 64-bit mask.")
+
+    def spec(self, label: str) -> LabelSpec:
+        """Return the :class:`LabelSpec` for *label*."""
+        for spec in self.labels:
+            if spec.name == label:
+                return spec
+        raise KeyError(f"Unknown label '{label}'. Known: {[s.name for s in self.labels]}")
+
+    def mask(self, *labels: str) -> int:
+        """Bitmask with the bits of *labels* set (OR them together)."""
+        value = 0
+        for label in labels:
+            value |= 1 << self.spec(label).id
+        return value
+
+    def decode(self, mask: int) -> list[str]:
+        """Label names whose bits are set in *mask*, by id."""
+        mask = int(mask)
+        return [spec.name for spec in self.labels if mask >> spec.id & 1]
+
+    def validate(self, rule_labels: Iterable[str]) -> None:
+        """Check that the critique labels match *rule_labels* exactly.
+
+        Raises
+        ------
+        ValueError
+            If a critique label has no rules, or a rule label is missing
+            from the taxonomy.
+        """
+        rules = set(rule_labels)
+        critique = set(self.critique_labels)
+        missing_rules = sorted(critique - rules)
+        unknown = sorted(rules - critique)
+        if missing_rules or unknown:
+            raise ValueError(
+                "labels.yaml and the regex rules disagree: "
+                f"labels without rules {missing_rules}, "
+                f"rules without a label {unknown}."
+            )
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def _parse(raw: dict[str, Any]) -> Taxonomy:
+    """Build and sanity-check a :class:`Taxonomy` from the raw YAML dict."""
+    entries = raw.get("labels") or {}
+    if not entries:
+        raise ValueError("labels.yaml defines no labels.")
+
+    specs: list[LabelSpec] = []
+    for name, block in entries.items():
+        block = block or {}
+        if "id" not in block:
+            raise ValueError(f"Label '{name}' has no id.")
+        specs.append(LabelSpec(
+            name=name,
+            id=int(block["id"]),
+            short=block.get("short", ""),
+            description=" ".join(str(block.get("description", "")).split()),
+            min_confidence=float(block.get("min_confidence", 0.0)),
+            target_precision=(
+                float(block["target_precision"])
+                if block.get("target_precision") is not None else None
+            ),
+        ))
+    specs.sort(key=lambda s: s.id)
+
+    ids = [s.id for s in specs]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate label ids in labels.yaml: {ids}")
+    if any(i < 0 for i in ids):
+        raise ValueError(f"Label ids must be non-negative: {ids}")
+
+    taxonomy = Taxonomy(labels=tuple(specs), policy=raw.get("policy"))
+    if _NONE_LABEL not in {s.name for s in specs}:
+        raise ValueError(f"labels.yaml must define the '{_NONE_LABEL}' label.")
+
+    declared = raw.get("num_critique_labels")
+    if declared is not None and int(declared) != len(taxonomy.critique_labels):
+        raise ValueError(
+            f"num_critique_labels is {declared} but "
+            f"{len(taxonomy.critique_labels)} critique labels are defined."
+        )
+    all_labels = raw.get("all_labels")
+    if all_labels is not None and set(all_labels) != {s.name for s in specs}:
+        raise ValueError("all_labels does not match the labels mapping.")
+
+    return taxonomy
+
+
+@lru_cache(maxsize=None)
+def _load_cached(path: str) -> Taxonomy:
+    logger.info("Loading label taxonomy from %s", path)
+    return _parse(load_yaml(path) or {})
+
+
+def load_taxonomy(path: str | Path | None = None) -> Taxonomy:
+    """Load (and cache) the taxonomy from *path* (default: ``labels.yaml``)."""
+    if path is None:
+        path = _DEFAULT_LABELS_PATH
+    return _load_cached(str(Path(path).resolve()))
+
+
+# ---------------------------------------------------------------------------
+# Applying the taxonomy
+# ---------------------------------------------------------------------------
+
+def apply_taxonomy(
+    df: pd.DataFrame,
+    taxonomy: Optional[Taxonomy] = None,
+    *,
+    min_confidence: Optional[dict[str, float]] = None,
+) -> pd.DataFrame:
+    """Apply thresholds, the NONE rule and the label bitmask to *df*.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Output of :meth:`RuleMiner.match_dataframe`.  Critique labels without
+        a ``rule_*`` column count as "no hit".
+    taxonomy : Taxonomy | None
+        Defaults to :func:`load_taxonomy`.
+    min_confidence : dict[str, float] | None
+        Override the per-label thresholds (``{}`` disables thresholding).
+
+    Returns
+    -------
+    pd.DataFrame
+        A **copy** of *df* with thresholded ``rule_*`` / ``rule_*_conf``
+        columns, a ``rule_NONE`` column and a ``label_mask`` column.
+    """
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    if min_confidence is None:
+        min_confidence = taxonomy.min_confidence
+
+    df = df.copy()
+    n = len(df)
+    mask_dtype = taxonomy.mask_dtype
+    mask = np.zeros(n, dtype=mask_dtype)
+    any_hit = np.zeros(n, dtype=bool)
+
+    for label in taxonomy.critique_labels:
+        col_name = f"rule_{label}"
+        if col_name not in df.columns:
+            continue
+        hits = df[col_name].fillna(False).to_numpy(dtype=bool)
+        conf_col = f"rule_{label}_conf"
+        if conf_col in df.columns:
+            conf = df[conf_col].fillna(0.0).to_numpy(dtype=np.float64)
+            hits = hits & (conf >= min_confidence.get(label, 0.0))
+            df[conf_col] = np.where(hits, conf, 0.0)
+        df[col_name] = hits
+        any_hit |= hits
+        mask |= hits.astype(mask_dtype) << mask_dtype.type(taxonomy.spec(label).id)
+
+    none = ~any_hit
+    df[f"rule_{taxonomy.none_label}"] = none
+    none_bit = mask_dtype.type(taxonomy.spec(taxonomy.none_label).id)
+    mask |= none.astype(mask_dtype) << none_bit
+    df[MASK_COL] = mask
+
+    logger.info(
+        "Taxonomy: %d / %d rows carry a critique label after thresholds",
+        int(any_hit.sum()),
+        n,
+    )
+    return df
+
+
+def decode_mask(
+    masks: pd.Series | np.ndarray,
+    taxonomy: Optional[Taxonomy] = None,
+) -> pd.Series:
+    """Expand a ``label_mask`` column into lists of label names."""
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    index = masks.index if isinstance(masks, pd.Series) else None
+    values = np.asarray(masks)
+    # Decode each distinct mask once; there are at most 2**labels of them.
+    uniques, codes = np.unique(values, return_inverse=True)
+    decoded = [taxonomy.decode(u) for u in uniques.tolist()]
+    return pd.Series([decoded[c] for c in codes.ravel()], index=index, dtype=object)
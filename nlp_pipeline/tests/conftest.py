@@ -0,0 +1,15 @@
+"""Fixtures shared across the test modules."""
+
+from pathlib import Path
+
+import pytest
+
+from nlp_pipeline.utils import load_yaml
+
+RULES_PATH = Path(__file__).resolve().parent.parent / "regex_rules.yaml"
+
+
+@pytest.fixture
+def rules_config():
+    """A fresh copy of the default rule config, safe to modify."""
+    return load_yaml(RULES_PATH)
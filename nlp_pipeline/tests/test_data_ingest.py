@@ -7,7 +7,19 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
-from nlp_pipeline.data_ingest import ingest, validate_schema, profile_data, detect_format
+from nlp_pipeline import data_ingest
+from nlp_pipeline.data_ingest import (
+    add_timestamps,
+    detect_format,
+    ingest,
+    iter_ingest,
+    parse_relative_time,
+    partition_column,
+    profile_data,
+    read_partitioned,
+    validate_schema,
+    write_partitioned,
+)
 
 
 @pytest.fixture
@@ -112,6 +124,27 @@ class TestValidateSchema:
         # Should log warning but not crash
         assert len(result) >= 2
 
+    def test_copy_false_leaves_input_untouched(self):
+        df = pd.DataFrame({"comment_id": ["c1"], "text": ["Hello\r\nWorld"]})
+        result = validate_schema(df, copy=False)
+        pd.testing.assert_frame_equal(result, validate_schema(df))
+        assert df["text"].iloc[0] == "Hello\r\nWorld"
+        assert list(df.columns) == ["comment_id", "text"]
+
+    def test_column_validation_matches_records(self):
+        df = pd.DataFrame({
+            "comment_id": ["c1", " c2 ", None, "  ", 5, "c6", "c7", "c8", "c1"],
+            "text": ["a", None, "b", "c", 7, "d\x00", "e", "🔥", "dup"],
+            "video_id": ["v", None, "v", "v", "v", 123, "v", float("nan"), "v"],
+            "like_count": ["2K", -3, 1, None, "x", 2.7, True, "1,200", 0],
+            "language": [" EN ", None, "de", 5, "fr", "en", "en", "", "en"],
+            "replies": ["3", None, 1, 2, 3, 4, 5, 6, 7],
+            "extra": range(9),
+        })
+        result = validate_schema(df, copy=False)
+        pd.testing.assert_frame_equal(result, validate_schema(df))
+        assert result["comment_id"].tolist() == ["c1", "c2", "5", "c7", "c8"]
+
 
 class TestProfileData:
     def test_basic_profile(self):
@@ -124,3 +157,205 @@ class TestProfileData:
         assert profile["row_count"] == 3
         assert "null_counts" in profile
         assert "text_length" in profile
+
+
+@pytest.fixture
+def songs_csv(tmp_path):
+    """1000 comments over three songs of 600 / 300 / 100 rows."""
+    songs = ["A"] * 600 + ["B"] * 300 + ["C"] * 100
+    data = pd.DataFrame({
+        "comment_id": [f"c{i}" for i in range(len(songs))],
+        "text": [f"comment number {i}" for i in range(len(songs))],
+        "song_title": songs,
+    })
+    path = tmp_path / "songs.csv"
+    data.to_csv(path, index=False)
+    return path
+
+
+class TestSampling:
+    def test_fraction_is_deterministic(self, songs_csv):
+        first = ingest(songs_csv, sample=0.05, seed=7)
+        again = ingest(songs_csv, sample=0.05, seed=7)
+        other = ingest(songs_csv, sample=0.05, seed=8)
+        assert len(first) == 50
+        assert list(first["comment_id"]) == list(again["comment_id"])
+        assert list(first["comment_id"]) != list(other["comment_id"])
+
+    def test_stratified_fraction_is_proportional(self, songs_csv):
+        df = ingest(songs_csv, sample=0.1, stratify="song_title")
+        assert df["song_title"].value_counts().to_dict() == {"A": 60, "B": 30, "C": 10}
+        assert df.attrs["sample"]["method"] == "systematic"
+        assert df.attrs["sample"]["population"] == 1000
+        assert df.attrs["sample"]["fraction"] == pytest.approx(0.1)
+
+    def test_reservoir_count(self, songs_csv):
+        df = ingest(songs_csv, sample=40, seed=3, stratify="song_title")
+        assert df["song_title"].value_counts().to_dict() == {"A": 24, "B": 12, "C": 4}
+        assert df.attrs["sample"]["method"] == "reservoir"
+        assert df.index.is_monotonic_increasing
+        full = ingest(songs_csv)
+        assert set(df["comment_id"]) <= set(full["comment_id"])
+
+    def test_reservoir_holds_at_most_the_sample(self, songs_csv, monkeypatch):
+        expected = ingest(songs_csv, sample=40, seed=3, stratify="song_title")
+        stream = data_ingest.iter_raw_chunks
+        monkeypatch.setattr(
+            "nlp_pipeline.data_ingest.iter_raw_chunks",
+            lambda path, format: stream(path, format=format, chunk_size=50),
+        )
+        feed = data_ingest._ReservoirSampler.feed
+        held = []
+
+        def spy(sampler, chunk):
+            feed(sampler, chunk)
+            held.append(len(sampler._kept))
+
+        monkeypatch.setattr("nlp_pipeline.data_ingest._ReservoirSampler.feed", spy)
+        df = ingest(songs_csv, sample=40, seed=3, stratify="song_title")
+        assert len(held) == 20
+        assert max(held) <= 40
+        assert list(df["comment_id"]) == list(expected["comment_id"])
+
+    def test_reservoir_larger_than_file(self, songs_csv):
+        assert len(ingest(songs_csv, sample=5000)) == 1000
+
+    @pytest.mark.parametrize("sample", [0.0, 1.5, 0, -3, True, "5%"])
+    def test_invalid_sample(self, songs_csv, sample):
+        with pytest.raises(ValueError, match="sample"):
+            ingest(songs_csv, sample=sample)
+
+    def test_unknown_stratify_column(self, songs_csv):
+        with pytest.raises(KeyError, match="artist"):
+            ingest(songs_csv, sample=0.1, stratify="artist")
+
+
+class TestTimestamps:
+    REFERENCE = pd.Timestamp("2024-05-10 12:00", tz="UTC")
+
+    def test_relative_strings(self):
+        times = pd.Series([
+            "2 days ago", "a week ago (edited)", "1 HOUR AGO", "Streamed 3 months ago",
+            "an hour ago", "yesterday", None,
+        ])
+        result = parse_relative_time(times, self.REFERENCE)
+        assert str(result.dtype) == "datetime64[ns, UTC]"
+        day = pd.Timedelta(days=1)
+        assert result[0] == self.REFERENCE - 2 * day
+        assert result[1] == self.REFERENCE - 7 * day
+        assert result[2] == result[4] == self.REFERENCE - pd.Timedelta(hours=1)
+        assert result[3] == self.REFERENCE - pd.Timedelta(days=3 * 30.436875)
+        assert result[5:].isna().all()
+
+    def test_naive_reference_is_utc(self):
+        result = parse_relative_time(pd.Series(["1 day ago"]), "2024-05-10 12:00")
+        assert result[0] == self.REFERENCE - pd.Timedelta(days=1)
+
+    def test_absolute_published_at_wins(self):
+        df = pd.DataFrame({
+            "published_at": ["1700000000", None, "2023-01-02T03:04:05Z"],
+            "time": ["1 day ago", "1 day ago", "1 day ago"],
+        })
+        result = add_timestamps(df, self.REFERENCE)
+        assert "published_ts" not in df.columns
+        assert result["published_ts"].tolist() == [
+            pd.Timestamp(1_700_000_000, unit="s", tz="UTC"),
+            self.REFERENCE - pd.Timedelta(days=1),
+            pd.Timestamp("2023-01-02 03:04:05", tz="UTC"),
+        ]
+
+    def test_ingest_uses_reference_time(self, tmp_path):
+        path = tmp_path / "times.jsonl"
+        path.write_text(
+            json.dumps({"comment_id": "c1", "text": "hi", "time": "2 years ago"}) + "\n"
+        )
+        expected = self.REFERENCE - pd.Timedelta(days=2 * 365.2425)
+        df = ingest(path, reference_time=self.REFERENCE)
+        assert df["published_ts"].tolist() == [expected]
+        streamed = pd.concat(iter_ingest(path, reference_time=self.REFERENCE))
+        assert streamed["published_ts"].tolist() == [expected]
+
+    def test_no_reference_time_leaves_relative_times_undated(self, tmp_path, caplog):
+        path = tmp_path / "times.jsonl"
+        path.write_text("".join(json.dumps(r) + "\n" for r in [
+            {"cid": "c1", "text": "hi", "time": "2 years ago"},
+            {"cid": "c2", "text": "hi", "time": "1 day ago", "time_parsed": 1_700_000_000},
+        ]))
+        with caplog.at_level("WARNING"):
+            df = ingest(path)
+        assert df["published_ts"].isna().tolist() == [True, False]
+        assert "reference_time" in caplog.text
+
+
+@pytest.fixture
+def songs_dataset(tmp_path):
+    """A song-partitioned dataset of nine comments over three songs."""
+    pytest.importorskip("pyarrow")
+    songs = ["Song A", "Song/B", "Überlied"]
+    records = [
+        {
+            "cid": f"c{i}",
+            "text": f"comment {i}",
+            "song_title": songs[i % 3],
+            "youtube_url": f"https://www.youtube.com/watch?v=vid{i % 3}xxxxxxx&t=3",
+            "time": "2 days ago",
+            "votes": str(i),
+        }
+        for i in range(9)
+    ]
+    path = tmp_path / "comments.jsonl"
+    path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records))
+    df = ingest(path)
+    return df, write_partitioned(df, tmp_path / "dataset")
+
+
+class TestPartitionedDataset:
+    def test_video_id_from_url(self, songs_dataset):
+        df, _ = songs_dataset
+        assert df["video_id"].tolist()[:3] == ["vid0xxxxxxx", "vid1xxxxxxx", "vid2xxxxxxx"]
+
+    def test_one_directory_per_song(self, songs_dataset):
+        _, root = songs_dataset
+        assert partition_column(root) == "song_title"
+        assert len([p for p in root.iterdir() if p.is_dir()]) == 3
+
+    def test_roundtrip(self, songs_dataset):
+        df, root = songs_dataset
+        back = ingest(root)
+        assert "profile" in back.attrs
+        back = back.sort_values("comment_id", key=lambda s: s.str[1:].astype(int))
+        assert list(back["like_count"]) == list(df["like_count"])
+        # All-None object columns come back as missing strings.
+        pd.testing.assert_frame_equal(
+            back[df.columns].reset_index(drop=True).astype(str),
+            df.reset_index(drop=True).astype(str),
+        )
+
+    def test_songs_and_columns(self, songs_dataset):
+        _, root = songs_dataset
+        df = ingest(root, songs=["Song/B", "Überlied"], columns=["comment_id", "song_title"])
+        assert list(df.columns) == ["comment_id", "song_title"]
+        assert sorted(df["song_title"].unique()) == ["Song/B", "Überlied"]
+        assert len(df) == 6
+
+    def test_file_ingest_filters_too(self, songs_dataset, tmp_path):
+        df = ingest(tmp_path / "comments.jsonl", songs=["Song A"], columns=["text"])
+        assert df["text"].tolist() == ["comment 0", "comment 3", "comment 6"]
+
+    def test_rewrite_replaces_only_written_partitions(self, songs_dataset):
+        df, root = songs_dataset
+        write_partitioned(df[df["song_title"] == "Song A"].head(1), root)
+        counts = read_partitioned(root)["song_title"].value_counts().to_dict()
+        assert counts == {"Song A": 1, "Song/B": 3, "Überlied": 3}
+
+    def test_partition_by_video(self, songs_dataset, tmp_path):
+        df, _ = songs_dataset
+        root = write_partitioned(df, tmp_path / "by_video", partition_by="video_id")
+        assert partition_column(root) == "video_id"
+        assert len(read_partitioned(root, videos=["vid1xxxxxxx"])) == 3
+        assert len(read_partitioned(root, songs=["Song A"])) == 3
+
+    def test_unknown_partition_column(self, songs_dataset, tmp_path):
+        df, _ = songs_dataset
+        with pytest.raises(KeyError, match="genre"):
+            write_partitioned(df, tmp_path / "x", partition_by="genre")
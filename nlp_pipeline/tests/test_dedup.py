@@ -0,0 +1,106 @@
+"""Tests for duplicate / near-duplicate clustering."""
+
+import pandas as pd
+import pytest
+
+from nlp_pipeline.dedup import (
+    CLUSTER_ID_COL,
+    CLUSTER_SIZE_COL,
+    REPRESENTATIVE_COL,
+    broadcast,
+    cluster_summary,
+    dedup_apply,
+    find_duplicates,
+    minhash_signatures,
+)
+from nlp_pipeline.preprocess import preprocess_dataframe
+
+
+@pytest.fixture
+def comments():
+    return pd.DataFrame({
+        "text": [
+            "Who's here in 2025?",
+            "this song is a masterpiece of modern pop production",
+            "who's  here in 2025?",
+            "This song is a masterpiece of modern pop production!!",
+            "completely unrelated remark",
+            None,
+            "",
+        ],
+    }, index=[10, 11, 12, 13, 14, 15, 16])
+
+
+class TestFindDuplicates:
+    def test_exact_groups(self, comments):
+        out = find_duplicates(comments)
+        # Case and whitespace variants are only merged by near-dedup.
+        assert out[CLUSTER_ID_COL].tolist() == [0, 1, 2, 3, 4, 5, 5]
+        assert out[CLUSTER_SIZE_COL].tolist() == [1, 1, 1, 1, 1, 2, 2]
+        assert out[REPRESENTATIVE_COL].tolist() == [True, True, True, True, True, True, False]
+        assert list(out.index) == list(comments.index)
+
+    def test_near_duplicates(self, comments):
+        out = find_duplicates(comments, near=True)
+        assert out[CLUSTER_ID_COL].tolist() == [0, 1, 0, 1, 2, 3, 3]
+        assert out[CLUSTER_SIZE_COL].tolist() == [2, 2, 2, 2, 1, 2, 2]
+
+    def test_missing_column(self, comments):
+        with pytest.raises(KeyError):
+            find_duplicates(comments, text_col="body")
+
+    def test_empty(self):
+        out = find_duplicates(pd.DataFrame({"text": pd.Series([], dtype=object)}))
+        assert out.empty and CLUSTER_ID_COL in out.columns
+
+    def test_bands_must_divide_num_perm(self, comments):
+        with pytest.raises(ValueError, match="divisible"):
+            find_duplicates(comments, near=True, num_perm=10, bands=3)
+
+
+class TestMinHash:
+    def test_identical_texts_identical_signatures(self):
+        sigs = minhash_signatures(["abcdefgh", "abcdefgh", "zzzzzzzz"], num_perm=16)
+        assert sigs.shape == (3, 16)
+        assert (sigs[0] == sigs[1]).all()
+        assert (sigs[0] != sigs[2]).any()
+
+    def test_agreement_tracks_similarity(self):
+        base = "the quick brown fox jumps over the lazy dog " * 3
+        sigs = minhash_signatures([base, base + "!", "lorem ipsum dolor sit amet"], num_perm=128)
+        close = (sigs[0] == sigs[1]).mean()
+        far = (sigs[0] == sigs[2]).mean()
+        assert close > 0.8 > far
+
+
+class TestBroadcast:
+    def test_dedup_apply_runs_once_per_cluster(self, comments):
+        calls = []
+
+        def stage(reps):
+            calls.append(len(reps))
+            return reps.assign(raw_text=reps["text"], n_chars=reps["text"].str.len())
+
+        out = dedup_apply(comments, stage, near=True)
+        assert calls == [4]
+        assert out["n_chars"].tolist()[:3] == [19, 51, 19]
+        # raw_text is rebuilt per row rather than copied from the representative.
+        assert out.loc[12, "raw_text"] == "who's  here in 2025?"
+
+    def test_mixed_case_duplicates_keep_own_features(self):
+        df = pd.DataFrame({"text": ["LOVE THIS SONG", "love this song", "LOVE THIS SONG"]})
+        out = dedup_apply(df, preprocess_dataframe)
+        assert out[CLUSTER_SIZE_COL].tolist() == [2, 1, 2]
+        assert out["caps_ratio"].tolist() == [1.0, 0.0, 1.0]
+        expected = preprocess_dataframe(df)
+        assert out["clean_text"].tolist() == expected["clean_text"].tolist()
+
+    def test_missing_representative(self, comments):
+        clustered = find_duplicates(comments)
+        with pytest.raises(ValueError, match="missing"):
+            broadcast(clustered.iloc[:1].assign(x=1), clustered)
+
+    def test_cluster_summary(self, comments):
+        summary = cluster_summary(find_duplicates(comments, near=True), top=2)
+        assert summary[CLUSTER_SIZE_COL].tolist() == [2, 2]
+        assert summary["text"].iloc[0] == "Who's here in 2025?"
@@ -0,0 +1,362 @@
+"""Tests for the streaming pipeline runner and CLI."""
+
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+import yaml
+
+from nlp_pipeline.cli import main
+from nlp_pipeline.data_ingest import ingest, iter_ingest, iter_raw_chunks
+from nlp_pipeline.pipeline import (
+    DEFAULT_STAGES,
+    ChunkWriter,
+    WorkerPool,
+    classify_batch,
+    classify_stream,
+    iter_pipeline,
+    micro_batches,
+    run_pipeline,
+    run_stages,
+)
+from nlp_pipeline.preprocess import preprocess_dataframe
+from nlp_pipeline.rule_miner import PROCESS_MINER_SLOTS, RuleMiner
+from nlp_pipeline.utils import SharedArray
+
+
+@pytest.fixture
+def comments_jsonl(tmp_path):
+    """Create a JSONL file with a cross-chunk duplicate and an empty text."""
+    records = [
+        {"cid": "c1", "text": "all these songs sound the same", "votes": "2K"},
+        {"cid": "c2", "text": "love this 🔥"},
+        {"cid": "c1", "text": "duplicate id in a later chunk"},
+        {"cid": "c3", "text": "made for tiktok not for real music fans"},
+        {"cid": "c4", "text": ""},
+    ]
+    path = tmp_path / "comments.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    return path
+
+
+class TestChunkedIngest:
+    def test_raw_chunks_keep_file_positions(self, comments_jsonl):
+        chunks = list(iter_raw_chunks(comments_jsonl, chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert list(chunks[1].index) == [2, 3]
+
+    def test_iter_ingest_matches_ingest(self, comments_jsonl):
+        streamed = pd.concat(iter_ingest(comments_jsonl, chunk_size=2))
+        full = ingest(comments_jsonl)
+        assert list(streamed["comment_id"]) == list(full["comment_id"])
+
+    def test_generated_ids_match_across_chunking(self, tmp_path):
+        path = tmp_path / "no_ids.jsonl"
+        path.write_text(
+            "\n".join(json.dumps({"text": t}) for t in ["a", "b", "c"]) + "\n"
+        )
+        streamed = pd.concat(iter_ingest(path, chunk_size=1))
+        full = ingest(path)
+        assert list(streamed["comment_id"]) == list(full["comment_id"])
+
+    def test_invalid_chunk_size(self, comments_jsonl):
+        with pytest.raises(ValueError, match="chunk_size"):
+            list(iter_raw_chunks(comments_jsonl, chunk_size=0))
+
+
+class TestIterPipeline:
+    def test_all_stages(self, comments_jsonl):
+        out = pd.concat(iter_pipeline(comments_jsonl, chunk_size=2))
+        assert list(out["comment_id"]) == ["c1", "c2", "c3", "c4"]
+        assert "clean_text" in out.columns
+        assert out["rule_STANDARDIZATION"].tolist() == [True, False, False, False]
+        assert out["rule_COMMODIFICATION_MARKET_LOGIC"].tolist() == [False, False, True, False]
+
+    def test_stage_selection(self, comments_jsonl):
+        out = pd.concat(iter_pipeline(comments_jsonl, stages=["ingest", "preprocess"]))
+        assert "clean_text" in out.columns
+        assert not any(c.startswith("rule_") for c in out.columns)
+
+    def test_rules_without_preprocess_use_text(self, comments_jsonl):
+        out = pd.concat(iter_pipeline(comments_jsonl, stages=["ingest", "rules"]))
+        assert "clean_text" not in out.columns
+        assert bool(out["rule_STANDARDIZATION"].iloc[0])
+
+    def test_ingest_stage_adds_timestamps(self, tmp_path, pool):
+        path = tmp_path / "times.jsonl"
+        path.write_text(json.dumps({"cid": "t1", "text": "hi", "time": "1 day ago"}) + "\n")
+        reference = pd.Timestamp("2024-05-10", tz="UTC")
+        expected = [reference - pd.Timedelta(days=1)]
+        out = pd.concat(iter_pipeline(path, reference_time=reference))
+        assert out["published_ts"].tolist() == expected
+        pooled = pd.concat(iter_pipeline(path, reference_time=reference, pool=pool))
+        assert pooled["published_ts"].tolist() == expected
+
+    def test_dedup_stage_matches_full_run(self, tmp_path):
+        path = tmp_path / "dups.jsonl"
+        texts = ["all these songs sound the same", "love it", "all these songs sound the same"]
+        path.write_text("\n".join(json.dumps({"text": t}) for t in texts * 2) + "\n")
+        plain = pd.concat(iter_pipeline(path, stages=["ingest", "preprocess", "rules"]))
+        deduped = pd.concat(iter_pipeline(path, stages=["ingest", "dedup", "preprocess", "rules"]))
+        assert deduped["dup_cluster_size"].tolist() == [4, 2, 4, 4, 2, 4]
+        assert deduped["raw_text"].tolist() == plain["raw_text"].tolist()
+        assert deduped["rule_STANDARDIZATION"].tolist() == plain["rule_STANDARDIZATION"].tolist()
+
+    def test_unknown_stage(self, comments_jsonl):
+        with pytest.raises(ValueError, match="Unknown stage"):
+            list(iter_pipeline(comments_jsonl, stages=["ingest", "train"]))
+
+    def test_workers_match_in_process(self, comments_jsonl):
+        serial = pd.concat(iter_pipeline(comments_jsonl, chunk_size=2))
+        parallel = pd.concat(iter_pipeline(comments_jsonl, chunk_size=2, workers=2))
+        cols = ["comment_id", "clean_text", "rule_STANDARDIZATION_conf"]
+        pd.testing.assert_frame_equal(
+            serial[cols].reset_index(drop=True),
+            parallel[cols].reset_index(drop=True),
+        )
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with WorkerPool(2) as pool:
+        yield pool
+
+
+def _raw_chunk(texts):
+    return pd.DataFrame({
+        "comment_id": [f"c{i}" for i in range(len(texts))],
+        "text": texts,
+    })
+
+
+class TestWorkerPool:
+    TEXTS = [
+        "all these songs sound the same",
+        "love this 🔥",
+        "made for tiktok not for real music fans",
+        "",
+        "the industry churns out formula hits",
+    ]
+
+    def test_run_stages_matches_in_process(self, pool):
+        raw = _raw_chunk(self.TEXTS)
+        expected = run_stages(raw, DEFAULT_STAGES, RuleMiner())
+        pd.testing.assert_frame_equal(pool.run_stages(raw), expected)
+
+    def test_map_stages_keeps_order(self, pool):
+        chunks = [_raw_chunk(self.TEXTS[i:i + 2]) for i in range(0, 5, 2)]
+        results = list(pool.map_stages(iter(chunks), ["ingest", "preprocess"]))
+        assert [list(r["text"]) for r in results] == [list(c["text"]) for c in chunks]
+
+    def test_preprocess_and_match_match_in_process(self, pool):
+        raw = _raw_chunk(self.TEXTS)
+        expected = preprocess_dataframe(raw, detect_language=False)
+        result = pool.preprocess(raw, detect_language=False)
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(
+            pool.match(result), RuleMiner().match_dataframe(expected, spans="matched"),
+        )
+
+    @pytest.mark.parametrize("kwargs", [
+        {"memoize": True, "copy": False},
+        {"detect_language": True},
+    ])
+    def test_preprocess_options_match_in_process(self, pool, kwargs):
+        raw = _raw_chunk(self.TEXTS * 3 + [None, "x &amp; y"])
+        raw["text"] = raw["text"].astype(object)
+        raw.loc[0, "text"] = 123
+        expected = preprocess_dataframe(raw, **kwargs)
+        pd.testing.assert_frame_equal(pool.preprocess(raw, **kwargs), expected)
+
+    def test_rules_pushed_by_hash(self, pool, tmp_path, rules_config):
+        default_hash = pool.rules_hash
+        config = rules_config
+        config["rules"] = {"STANDARDIZATION": config["rules"]["STANDARDIZATION"]}
+        del config["settings"]["validate_labels"]
+        path = tmp_path / "rules.yaml"
+        path.write_text(yaml.safe_dump(config))
+        try:
+            assert pool.set_rules(path) != default_hash
+            out = pool.run_stages(_raw_chunk(self.TEXTS))
+            assert [c for c in out.columns if c.endswith("_conf")] == [
+                "rule_STANDARDIZATION_conf",
+            ]
+        finally:
+            assert pool.set_rules() == default_hash
+
+    def test_old_rule_sets_are_released(self, pool, tmp_path, rules_config):
+        config = rules_config
+        refs = []
+        try:
+            for window in range(6):
+                config["settings"]["negation_window"] = window
+                path = tmp_path / f"rules{window}.yaml"
+                path.write_text(yaml.safe_dump(config))
+                pool.set_rules(path)
+                refs.append(pool._rules)
+            assert len(pool._published) == PROCESS_MINER_SLOTS
+            with pytest.raises(FileNotFoundError):
+                SharedArray.attach(refs[0].config)
+            SharedArray.attach(refs[-1].config).close()
+            assert not pool.run_stages(_raw_chunk(self.TEXTS)).empty
+        finally:
+            pool.set_rules()
+
+    def test_iter_pipeline_on_pool(self, pool, comments_jsonl):
+        serial = pd.concat(iter_pipeline(comments_jsonl, chunk_size=2))
+        pooled = pd.concat(iter_pipeline(comments_jsonl, chunk_size=2, pool=pool))
+        pd.testing.assert_frame_equal(serial, pooled)
+
+    def test_invalid_processes(self):
+        with pytest.raises(ValueError, match="processes"):
+            WorkerPool(0)
+
+
+class TestRunPipeline:
+    def test_jsonl_output(self, comments_jsonl, tmp_path):
+        dest = tmp_path / "out" / "results.jsonl"
+        summary = run_pipeline(comments_jsonl, dest, chunk_size=2)
+        assert summary["rows_out"] == 4
+        assert summary["chunks"] == 3
+        rows = [json.loads(line) for line in dest.read_text().splitlines()]
+        assert [r["comment_id"] for r in rows] == ["c1", "c2", "c3", "c4"]
+        assert rows[0]["rule_STANDARDIZATION_spans"][0][2] == "all these songs sound the same"
+
+    def test_csv_output_single_header(self, comments_jsonl, tmp_path):
+        dest = tmp_path / "results.csv"
+        run_pipeline(comments_jsonl, dest, chunk_size=2)
+        out = pd.read_csv(dest)
+        assert len(out) == 4
+        assert json.loads(out["rule_STANDARDIZATION_spans"].iloc[0])[0][0] == 0
+
+    def test_parquet_output(self, comments_jsonl, tmp_path):
+        pytest.importorskip("pyarrow")
+        dest = tmp_path / "results.parquet"
+        run_pipeline(comments_jsonl, dest, chunk_size=1)
+        out = pd.read_parquet(dest)
+        assert list(out["comment_id"]) == ["c1", "c2", "c3", "c4"]
+        assert out["like_count"].iloc[0] == 2000
+
+    def test_unknown_output_extension(self, tmp_path):
+        with pytest.raises(ValueError, match="output format"):
+            ChunkWriter(tmp_path / "results.xlsx")
+
+
+class TestClassifyStream:
+    RECORDS = [
+        {"cid": "s1", "text": "all these songs sound the same", "votes": "3"},
+        {"cid": "s2", "text": "so good", "heart": True},
+        {"cid": "s3", "text": "obvious industry plant getting pushed by the label"},
+        {"cid": "s1", "text": "repeated id"},
+        {"cid": "s4", "text": "love it"},
+    ]
+
+    def test_micro_batches_by_size(self):
+        batches = list(micro_batches(range(5), batch_size=2, max_wait=None))
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    def test_micro_batches_flush_on_wait(self):
+        def trickle():
+            yield 0
+            yield 1
+            time.sleep(0.3)
+            yield 2
+
+        batches = list(micro_batches(trickle(), batch_size=100, max_wait=0.1))
+        assert batches == [[0, 1], [2]]
+
+    def test_micro_batches_flush_when_source_is_idle(self):
+        release = threading.Event()
+
+        def stalled():
+            yield 0
+            release.wait(5)
+            yield 1
+
+        batches = micro_batches(stalled(), batch_size=100, max_wait=0.05)
+        # The first batch arrives while the source is still blocked.
+        assert next(batches) == [0]
+        release.set()
+        assert list(batches) == [[1]]
+
+    def test_micro_batches_reraise_source_errors(self):
+        def failing():
+            yield 0
+            raise RuntimeError("source broke")
+
+        with pytest.raises(RuntimeError, match="source broke"):
+            list(micro_batches(failing(), batch_size=100, max_wait=1.0))
+
+    def test_running_coverage_matches_batch_report(self):
+        miner = RuleMiner()
+        updates = list(classify_stream(iter(self.RECORDS), miner=miner, batch_size=2))
+        assert len(updates) == 3
+        final = updates[-1].coverage
+        full = pd.concat([u.batch for u in updates])
+        assert list(full["comment_id"]) == ["s1", "s2", "s3", "s4"]
+        assert final == miner.coverage_report(full)
+        assert final["any_rule_hit"] == 2
+
+    def test_batches_are_dated_by_arrival(self):
+        records = [
+            {"cid": "t1", "text": "so good", "time": "2 hours ago"},
+            {"cid": "t2", "text": "love it", "time": "1 day ago",
+             "time_parsed": 1700000000.0},
+        ]
+        arrived = pd.Timestamp("2024-05-10 12:00", tz="UTC")
+        df = classify_batch(records, RuleMiner(), reference_time=arrived)
+        assert list(df["published_ts"]) == [
+            arrived - pd.Timedelta(hours=2),
+            pd.Timestamp(1700000000, unit="s", tz="UTC"),
+        ]
+
+    def test_streamed_rows_are_dated(self):
+        records = [{"cid": "t1", "text": "so good", "time": "3 days ago"}]
+        before = pd.Timestamp.now(tz="UTC")
+        (update,) = classify_stream(iter(records), batch_size=1)
+        stamp = update.batch["published_ts"].iloc[0]
+        assert before - pd.Timedelta(days=3) <= stamp
+        assert stamp <= pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=3)
+
+    def test_coverage_grows_as_data_arrives(self):
+        totals = [u.coverage["total_rows"] for u in
+                  classify_stream(iter(self.RECORDS), batch_size=1)]
+        assert totals == [1, 2, 3, 4]
+
+
+class TestCli:
+    def test_run_command(self, comments_jsonl, tmp_path, capsys):
+        dest = tmp_path / "results.jsonl"
+        code = main([
+            "run", str(comments_jsonl), "--out", str(dest),
+            "--stages", "ingest,preprocess", "--chunk-size", "2",
+            "--log-level", "WARNING",
+        ])
+        assert code == 0
+        assert json.loads(capsys.readouterr().out)["rows_out"] == 4
+        assert dest.exists()
+
+    def test_partition_command(self, comments_jsonl, tmp_path, capsys):
+        pytest.importorskip("pyarrow")
+        dest = tmp_path / "dataset"
+        code = main([
+            "partition", str(comments_jsonl), "--out", str(dest),
+            "--by", "video_id", "--log-level", "WARNING",
+        ])
+        assert code == 0
+        assert json.loads(capsys.readouterr().out)["rows"] == 4
+        assert len(ingest(dest)) == 4
+
+    def test_missing_input(self, tmp_path, capsys):
+        code = main(["run", str(tmp_path / "nope.jsonl"), "--out", str(tmp_path / "o.jsonl")])
+        assert code == 1
+        assert "not found" in capsys.readouterr().err
+
+    def test_bad_stage_rejected(self, comments_jsonl, tmp_path):
+        with pytest.raises(SystemExit):
+            main(["run", str(comments_jsonl), "--out", str(tmp_path / "o.jsonl"),
+                  "--stages", "bogus"])
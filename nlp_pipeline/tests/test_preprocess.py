@@ -1,6 +1,12 @@
 """Tests for the preprocessing module."""
 
+import html
+import random
+import unicodedata
+
+import emoji
 import pandas as pd
+import pandas._testing as tm
 import pytest
 
 from nlp_pipeline.preprocess import (
@@ -8,6 +14,9 @@ from nlp_pipeline.preprocess import (
     remove_urls,
     remove_mentions,
     clean_text,
+    clean_text_batch,
+    count_alpha,
+    count_emoji,
     extract_features,
     is_empty_or_trivial,
     preprocess_dataframe,
@@ -67,6 +76,96 @@ class TestCleanText:
         assert clean_text("") == ""
 
 
+class TestCleanTextBatch:
+    CASES = [
+        "  @user check https://example.com &amp; listen!!  ",
+        "plain ascii\twith\x0bodd\x1cwhitespace\x1f  and WWW.site.com/x end",
+        "email me: a@b.co or @handle_1.x",
+        "caf\u00e9 \uff21\uff22 \u2003wide\u00a0space",
+        "&amp;amp; double encoded",
+        "",
+        "   ",
+    ]
+
+    def test_matches_clean_text(self):
+        texts = pd.Series(self.CASES, index=range(10, 10 + len(self.CASES)))
+        result = clean_text_batch(texts)
+        assert result.tolist() == [clean_text(t) for t in self.CASES]
+        assert list(result.index) == list(texts.index)
+
+    def test_missing_and_non_string(self):
+        texts = pd.Series(["ok", None, float("nan"), 42], dtype=object)
+        assert clean_text_batch(texts).tolist() == ["ok", "", "", "42"]
+
+    def test_slices(self, monkeypatch):
+        monkeypatch.setattr("nlp_pipeline.preprocess._BATCH_SLICE", 3)
+        texts = pd.Series(self.CASES + [None, 7] + self.CASES, dtype=object)
+        expected = [clean_text(t) for t in self.CASES]
+        assert clean_text_batch(texts).tolist() == expected + ["", "7"] + expected
+
+    def test_empty_series(self):
+        assert clean_text_batch(pd.Series([], dtype=object)).empty
+
+
+def _reference_features(text):
+    """General Unicode implementation of the per-character features."""
+    alpha = [ch for ch in text if ch.isalpha()]
+    return {
+        "punct": sum(1 for ch in text if unicodedata.category(ch).startswith("P")),
+        "alpha": len(alpha),
+        "upper": sum(1 for ch in alpha if ch.isupper()),
+        "emoji": emoji.emoji_count(text),
+        "nfkc": unicodedata.normalize("NFKC", text),
+    }
+
+
+class TestAsciiFastPath:
+    ALL_ASCII = "".join(map(chr, range(128)))
+
+    @pytest.fixture
+    def ascii_texts(self):
+        rng = random.Random(0)
+        texts = [self.ALL_ASCII, "", "ALL CAPS!!!", "#1 :) <3 * ~$^`|", "a&amp;b"]
+        texts += ["".join(rng.choices(self.ALL_ASCII, k=rng.randint(1, 60)))
+                  for _ in range(500)]
+        return texts
+
+    def test_features_match_unicode_path(self, ascii_texts):
+        for text in ascii_texts:
+            ref = _reference_features(text)
+            feats = extract_features(text)
+            n = len(text)
+            assert feats["punctuation_ratio"] == round(ref["punct"] / n if n else 0.0, 4)
+            assert feats["caps_ratio"] == round(
+                ref["upper"] / ref["alpha"] if ref["alpha"] else 0.0, 4)
+            assert feats["emoji_count"] == ref["emoji"]
+            assert count_alpha(text) == ref["alpha"]
+
+    def test_normalize_skips_nfkc_for_ascii(self, ascii_texts):
+        for text in ascii_texts:
+            assert unicodedata.normalize("NFKC", text) == text
+            assert normalize_text(text) == html.unescape(html.unescape(text))
+
+    def test_no_ascii_emoji(self):
+        # The ASCII shortcut in count_emoji relies on this invariant.
+        assert not any(key.isascii() for key in emoji.EMOJI_DATA)
+
+    def test_unicode_path(self):
+        text = "Caf\u00e9 \u00c9T\u00c9 \U0001f525\U0001f525 \u00bfqu\u00e9?"
+        ref = _reference_features(text)
+        assert count_alpha(text) == ref["alpha"]
+        assert count_emoji(text) == ref["emoji"] == 2
+        assert extract_features(text)["caps_ratio"] == round(ref["upper"] / ref["alpha"], 4)
+
+    def test_is_ascii_hint_matches_own_check(self, ascii_texts):
+        for text in ascii_texts + ["Caf\u00e9 \U0001f525\U0001f525 \uff21"]:
+            hint = text.isascii()
+            assert extract_features(text, is_ascii=hint) == extract_features(text)
+            assert normalize_text(text, is_ascii=hint) == normalize_text(text)
+            assert clean_text(text, is_ascii=hint) == clean_text(text)
+            assert is_empty_or_trivial(text, is_ascii=hint) == is_empty_or_trivial(text)
+
+
 class TestExtractFeatures:
     def test_basic_features(self):
         feats = extract_features("Hello World!!")
@@ -148,3 +247,53 @@ class TestPreprocessDataframe:
         result = preprocess_dataframe(df)
         assert result["raw_text"].iloc[0] == "hello @world https://x.com"
         assert "@world" not in result["clean_text"].iloc[0]
+
+    def test_skip_language_detection(self):
+        df = pd.DataFrame({"text": ["a fairly long english sentence", "x"],
+                           "language": ["en", None]})
+        result = preprocess_dataframe(df, detect_language=False)
+        assert result["language"].tolist() == ["en", "unknown"]
+
+    def test_memoize_matches_plain(self):
+        df = pd.DataFrame(
+            {"text": ["Same text &amp; more!", None, "other ONE", "Same text &amp; more!", None]},
+            index=[5, 3, 9, 1, 7],
+        )
+        plain = preprocess_dataframe(df, detect_language=False)
+        memo = preprocess_dataframe(df, detect_language=False, memoize=True)
+        pd.testing.assert_frame_equal(memo, plain)
+
+    def test_skip_trivial_is_lossless(self):
+        df = pd.DataFrame({"text": ["\U0001f525\U0001f525\U0001f525", "ok", None,
+                                    "this is a fairly long english sentence",
+                                    "\U0001f525\U0001f525\U0001f525"]})
+        gated = preprocess_dataframe(df)
+        ungated = preprocess_dataframe(df, skip_trivial=False)
+        pd.testing.assert_frame_equal(gated, ungated)
+        assert gated["is_trivial"].tolist() == [True, True, True, False, True]
+        assert gated["language"].tolist()[:3] == ["unknown"] * 3
+
+    def test_copy_false_shares_text_buffers(self):
+        df = pd.DataFrame(
+            {"text": ["hello @world https://x.com", None, "plain"]}, dtype=object,
+        )
+        plain = preprocess_dataframe(df, detect_language=False)
+        shared = preprocess_dataframe(df, detect_language=False, copy=False)
+        assert df["text"].dtype == object  # the input is untouched
+        assert tm.shares_memory(shared["raw_text"], shared["text"])
+        pd.testing.assert_frame_equal(
+            shared.drop(columns=["text", "raw_text"]),
+            plain.drop(columns=["text", "raw_text"]),
+        )
+        assert shared["raw_text"].fillna("").tolist() == ["hello @world https://x.com", "", "plain"]
+
+    def test_copy_false_reuses_unchanged_clean_text(self):
+        df = pd.DataFrame({"text": ["already clean", "so is this"]})
+        shared = preprocess_dataframe(df, detect_language=False, copy=False)
+        assert tm.shares_memory(shared["clean_text"], df["text"])
+
+    def test_feature_columns_match_extract_features(self):
+        texts = ["Hello WORLD!!", "\U0001f525\U0001f525", "", "café? ok", "\U0001f525\U0001f525"]
+        result = preprocess_dataframe(pd.DataFrame({"text": texts}), detect_language=False)
+        expected = pd.DataFrame([extract_features(clean_text(t)) for t in texts])
+        pd.testing.assert_frame_equal(result[list(expected.columns)], expected)
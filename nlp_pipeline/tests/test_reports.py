@@ -0,0 +1,127 @@
+"""Tests for the Markdown report generator."""
+
+import pandas as pd
+import pytest
+
+from nlp_pipeline.reports import (
+    read_results,
+    render_matched_report,
+    render_top_report,
+    top_k_per_group,
+    write_all_reports,
+    write_coverage_cube,
+)
+
+
+@pytest.fixture
+def comments():
+    return pd.DataFrame({
+        "song_title": ["B", "A", "B", "A", "B", "A"],
+        "artists": ["Artist B", "Artist A", "Artist B", "Artist A", "Artist B", "Artist A"],
+        "author": ["@b1", "@a1", "@b2", "@a2", "@b3", "@a3"],
+        "text": ["bb", "aaaa", "bbbbbb", "a", "bb", "aaa"],
+        "votes": ["1", "2K", "3", "4", "5", "6"],
+        "replies": ["", "7", "2", "", "9", "1"],
+        "time": ["1 day ago"] * 6,
+    })
+
+
+def _notebook_top_report(df, metric_col, unit, title):
+    """Reference implementation: the notebook's per-song iterrows writer."""
+    parts = [f"# {title}\n\n"]
+    for song in df["song_title"].unique():
+        song_df = df[df["song_title"] == song].nlargest(2, metric_col)
+        parts.append(f"## \U0001f3b5 {song}\n")
+        parts.append(f"**Artists:** {song_df['artists'].iloc[0]}\n\n")
+        for i, (_, row) in enumerate(song_df.iterrows(), 1):
+            parts.append(f"### {i}. {row['author']} ({row[metric_col]} {unit})\n\n")
+            parts.append(f"> {row['text']}\n\n")
+            parts.append(f"\U0001f44d {row['votes']} · {row['time']}\n\n")
+            parts.append("---\n\n")
+    return "".join(parts)
+
+
+class TestTopK:
+    def test_group_order_and_ties(self, comments):
+        top = top_k_per_group(comments, "length", k=2)
+        assert top["song_title"].tolist() == ["B", "B", "A", "A"]
+        # "bb" (row 0) and "bb" (row 4) tie; the earlier row wins.
+        assert top["author"].tolist() == ["@b2", "@b1", "@a1", "@a3"]
+        assert top["_rank"].tolist() == [1, 2, 1, 2]
+
+    def test_likes_metric_parses_strings(self, comments):
+        top = top_k_per_group(comments, "likes", k=1)
+        assert top["author"].tolist() == ["@b3", "@a3"]
+
+    def test_unknown_metric(self, comments):
+        with pytest.raises(KeyError, match="Unknown metric"):
+            top_k_per_group(comments, "bogus")
+
+
+class TestRenderTopReport:
+    def test_length_matches_notebook(self, comments):
+        df = comments.assign(text_length=comments["text"].str.len())
+        expected = _notebook_top_report(
+            df, "text_length", "chars", "Top 2 Longest Comments by Song",
+        )
+        assert render_top_report(df, "length", k=2) == expected
+
+    def test_replies_matches_notebook(self, comments):
+        df = comments.assign(replies_count=pd.to_numeric(
+            comments["replies"].replace("", "0"), errors="coerce").fillna(0).astype(int))
+        expected = _notebook_top_report(
+            df, "replies_count", "replies", "Top 2 Most Replied Comments by Song",
+        )
+        assert render_top_report(df, "replies", k=2) == expected
+
+    def test_confidence_metric(self, comments):
+        df = comments.assign(rule_X=[True] * 6, rule_X_conf=[0.5, 0.9, 0.7, 0.1, 0.2, 0.3])
+        report = render_top_report(df, "confidence:X", k=1)
+        assert "Top 1 Highest-Confidence Comments by Song" in report
+        assert "### 1. @b2 (Confidence: 0.70)" in report
+
+
+class TestMatchedReport:
+    def test_sorted_by_confidence(self, comments):
+        df = comments.assign(
+            clean_text=comments["text"],
+            like_count=[1, 2000, 3, 4, 5, None],
+            rule_STANDARDIZATION=[True, False, True, False, False, True],
+            rule_STANDARDIZATION_conf=[0.5, 0.0, 0.9, 0.0, 0.0, 0.7],
+            rule_FORMAL_RESISTANCE=[False] * 6,
+            rule_FORMAL_RESISTANCE_conf=[0.0] * 6,
+        ).drop(columns=["votes"])
+        report = render_matched_report(df)
+        assert "## STANDARDIZATION\n**Total Hits:** 3" in report
+        assert "FORMAL_RESISTANCE" not in report
+        assert report.index("@b2") < report.index("@a3") < report.index("@b1")
+        assert "**Song:** B — Artist B" in report
+        assert "**0** Likes | **1** Replies" in report  # missing likes -> 0
+
+
+class TestWriteAll:
+    def test_writes_reports(self, comments, tmp_path):
+        written = write_all_reports(comments, tmp_path, k=3)
+        assert set(written) == {"top_comments", "top_replies"}
+        assert (tmp_path / "top_replies_by_song.md").read_text().startswith(
+            "# Top 3 Most Replied Comments by Song"
+        )
+
+    def test_read_results_roundtrip(self, comments, tmp_path):
+        path = tmp_path / "results.jsonl"
+        comments.to_json(path, orient="records", lines=True)
+        assert read_results(path)["votes"].tolist() == comments["votes"].tolist()
+
+
+class TestCoverageCube:
+    @pytest.mark.parametrize("name", ["cube.csv", "cube.parquet", "cube.jsonl"])
+    def test_roundtrip(self, tmp_path, name):
+        cube = pd.DataFrame({
+            "song_title": ["A", "B"], "rows": [3, 1], "X_hits": [1, 0], "X_hit_pct": [33.33, 0.0],
+        })
+        path = write_coverage_cube(cube, tmp_path / "dash" / name)
+        pd.testing.assert_frame_equal(read_results(path), cube, check_dtype=False)
+
+    def test_unknown_extension(self, tmp_path):
+        with pytest.raises(ValueError, match="extension"):
+            write_coverage_cube(pd.DataFrame(), tmp_path / "cube.xlsx")
@@ -1,8 +1,23 @@
 """Tests for the rule mining module."""
 
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pandas._testing as tm
 import pytest
+import yaml
 
-from nlp_pipeline.rule_miner import RuleMiner, RuleMatch
+from nlp_pipeline.rule_miner import (
+    RuleMatch,
+    RuleMiner,
+    load_min_confidence,
+    required_literals,
+    wilson_interval,
+)
+from nlp_pipeline.data_ingest import validate_schema
+from nlp_pipeline.preprocess import preprocess_dataframe
+from nlp_pipeline.text_index import InvertedIndex
 
 
 @pytest.fixture
@@ -340,3 +355,523 @@ class TestEdgeCases:
         result = miner.match_text("cookie cutter manufactured pop star with fake emotion")
         matched_labels = [l for l, m in result.items() if m.matched]
         assert len(matched_labels) >= 2
+
+
+class TestDetections:
+    @pytest.fixture
+    def matched(self, miner):
+        df = pd.DataFrame({
+            "text": [
+                "All these songs sound the same",
+                "i love this song",
+                "formulaic industry plant made for tiktok",
+                "",
+            ],
+        })
+        df["clean_text"] = df["text"]
+        return miner.match_dataframe(df)
+
+    def _loop_detections(self, df, labels, thresholds):
+        """The notebook's iterrows reference implementation, with thresholds."""
+        out = {}
+        for idx, row in df.iterrows():
+            matched, confs = [], {}
+            for lbl in labels:
+                conf = row.get(f"rule_{lbl}_conf", 0.0)
+                if row.get(f"rule_{lbl}", False) and conf >= thresholds.get(lbl, 0.0):
+                    matched.append(lbl)
+                    confs[lbl] = conf
+            if matched:
+                out[idx] = (matched, confs, max(confs.values()))
+        return out
+
+    def test_matches_reference_loop(self, miner, matched):
+        thresholds = load_min_confidence()
+        det = miner.detections(matched)
+        expected = self._loop_detections(matched, list(thresholds), thresholds)
+        assert list(det.index) == list(expected)
+        for idx, (labels, confs, max_conf) in expected.items():
+            assert det.at[idx, "predicted_labels"] == labels
+            assert det.at[idx, "label_confs"] == confs
+            assert det.at[idx, "max_confidence"] == max_conf
+            assert det.at[idx, "top_label"] == max(confs, key=confs.get)
+            assert det.loc[idx, labels].eq(1).all()
+
+    def test_thresholds_drop_low_confidence(self, miner, matched):
+        det = miner.detections(matched, min_confidence={"STANDARDIZATION": 1.01})
+        assert all("STANDARDIZATION" not in labels for labels in det["predicted_labels"])
+        assert det["STANDARDIZATION"].sum() == 0
+
+    def test_all_rows(self, miner, matched):
+        det = miner.detections(matched, min_confidence={}, only_matched=False)
+        assert len(det) == len(matched)
+        empty = det.loc[3]
+        assert empty["predicted_labels"] == []
+        assert pd.isna(empty["top_label"])
+        assert empty["max_confidence"] == 0.0
+
+    def test_label_order_follows_taxonomy(self, miner):
+        thresholds = load_min_confidence()
+        assert list(thresholds)[0] == "STANDARDIZATION"
+        assert "NONE" not in thresholds
+        labels, hits, confs = miner.label_matrix(
+            miner.match_dataframe(pd.DataFrame({"clean_text": ["x"]}))
+        )
+        assert labels == list(thresholds)
+        assert hits.shape == confs.shape == (1, len(labels))
+
+
+class TestMemoize:
+    def test_memoize_matches_plain(self, miner):
+        df = pd.DataFrame(
+            {"clean_text": ["all these songs sound the same", None, "love it",
+                            "all these songs sound the same", ""]},
+            index=[4, 2, 0, 3, 1],
+        )
+        plain = miner.match_dataframe(df)
+        memo = miner.match_dataframe(df, memoize=True)
+        pd.testing.assert_frame_equal(memo, plain)
+
+
+class TestSkipTrivial:
+    @pytest.fixture
+    def flagged(self):
+        # The flags are deliberately inconsistent with the text so that
+        # gating is observable.
+        return pd.DataFrame({
+            "clean_text": ["all these songs sound the same"] * 3,
+            "is_trivial": [True, False, False],
+            "_emoji_only": [False, True, False],
+        })
+
+    def test_flagged_rows_bypass_matching(self, miner, flagged):
+        out = miner.match_dataframe(flagged)
+        # is_trivial decides; _emoji_only is ignored when it is present.
+        assert out["rule_STANDARDIZATION"].tolist() == [False, True, True]
+        assert out["rule_STANDARDIZATION_conf"].iloc[0] == 0.0
+        assert out["rule_STANDARDIZATION_spans"].iloc[0] == []
+
+    def test_emoji_only_without_is_trivial(self, miner, flagged):
+        out = miner.match_dataframe(flagged.drop(columns="is_trivial"))
+        assert out["rule_STANDARDIZATION"].tolist() == [True, False, True]
+
+    def test_styled_letters_are_matched(self, miner):
+        raw = pd.DataFrame({
+            "comment_id": ["c1"],
+            "text": ["𝐚𝐥𝐥 𝐭𝐡𝐞𝐬𝐞 𝐬𝐨𝐧𝐠𝐬 𝐬𝐨𝐮𝐧𝐝 𝐭𝐡𝐞 𝐬𝐚𝐦𝐞"],
+        })
+        df = preprocess_dataframe(validate_schema(raw), detect_language=False)
+        assert df["_emoji_only"].iloc[0] and not df["is_trivial"].iloc[0]
+        assert miner.match_dataframe(df)["rule_STANDARDIZATION"].iloc[0]
+        result = miner.evaluate_candidate(df, r"sound the same", "STANDARDIZATION")
+        assert result["hits"] == 1
+
+    def test_switch_off(self, miner, flagged):
+        out = miner.match_dataframe(flagged, skip_trivial=False)
+        assert out["rule_STANDARDIZATION"].all()
+
+    def test_config_setting(self, flagged, tmp_path, rules_config):
+        config = rules_config
+        config["settings"]["skip_trivial"] = False
+        path = tmp_path / "rules.yaml"
+        path.write_text(yaml.safe_dump(config))
+        out = RuleMiner(path).match_dataframe(flagged)
+        assert out["rule_STANDARDIZATION"].all()
+
+    def test_gating_with_memoize(self, miner, flagged):
+        out = miner.match_dataframe(flagged, memoize=True)
+        assert out["rule_STANDARDIZATION"].tolist() == [False, True, True]
+
+
+class TestRequiredLiterals:
+    @pytest.mark.parametrize("pattern, expected", [
+        (r"\w+ music", [" music"]),
+        (r"cookie[- ]cutter", ["cookie"]),
+        (r"(?=.*radio)\w+", ["radio"]),
+        (r"(?:made|built) for (?:tiktok|radio)", [" for "]),
+        (r"(?:formulaic|generic)", ["formulaic", "generic"]),
+        (r"(?:formulaic|\w+)", None),
+        (r"[a-z]+", None),
+        (r"ab?", None),
+    ])
+    def test_extraction(self, pattern, expected):
+        assert required_literals(pattern) == expected
+
+    def test_literals_are_casefolded(self):
+        assert required_literals("TikTok") == ["tiktok"]
+        assert required_literals("ſtraße") == ["strasse"]
+
+    def test_parser_failure_disables_prefilter(self, monkeypatch):
+        def broken(parsed):
+            raise AttributeError("parser changed shape")
+
+        monkeypatch.setattr("nlp_pipeline.rule_miner._required_from", broken)
+        assert required_literals("tiktok") is None
+
+
+class TestEvaluateCandidate:
+    @pytest.fixture
+    def matched(self, miner):
+        texts = [
+            "this sounds so formulaic and generic",
+            "not formulaic at all, a cookie cutter it is not",
+            "pure cookie-cutter pop",
+            "a cookie cutter song, every song sounds the same",
+            "Cookie Cutter stuff",
+            "love this",
+            "",
+        ]
+        df = pd.DataFrame({"clean_text": texts}, index=range(10, 17))
+        return miner.match_dataframe(df)
+
+    def _full_scan(self, df, pattern):
+        return df.index[df["clean_text"].str.contains(pattern, case=False, regex=True)]
+
+    def test_counts_against_full_scan(self, miner, matched):
+        result = miner.evaluate_candidate(matched, r"cookie[- ]cutter", "STANDARDIZATION")
+        scanned = self._full_scan(matched, r"cookie[- ]cutter")
+        assert result["hits"] == len(scanned) == 4
+        assert result["literals"] == ["cookie"]
+        assert result["candidates"] == 4
+        # Row 11 carries a STANDARDIZATION negation ("not formulaic").
+        assert result["negated"] == 1
+        assert result["new_hits"] + result["existing_hits"] == 3
+        assert set(result["new_rows"]) | set(
+            matched.index[matched["rule_STANDARDIZATION"]]
+        ) >= {12, 13, 14}
+
+    def test_new_vs_existing(self, miner, matched):
+        result = miner.evaluate_candidate(matched, r"cookie[- ]cutter", "STANDARDIZATION")
+        already = set(matched.index[matched["rule_STANDARDIZATION"]])
+        assert result["existing_hits"] == len({12, 13, 14} & already)
+        assert set(result["new_rows"]) == {12, 13, 14} - already
+        assert result["coverage_after_pct"] >= result["coverage_before_pct"]
+
+    def test_index_prefilter_agrees(self, miner, matched):
+        index = InvertedIndex.build(matched, facets=())
+        plain = miner.evaluate_candidate(matched, r"sounds? so \w+", "STANDARDIZATION")
+        indexed = miner.evaluate_candidate(
+            matched, r"sounds? so \w+", "STANDARDIZATION", index=index,
+        )
+        assert indexed["candidates"] <= plain["candidates"]
+        for key in ("hits", "negated", "new_hits", "existing_hits"):
+            assert indexed[key] == plain[key]
+
+    def test_no_literal_scans_everything(self, miner, matched):
+        result = miner.evaluate_candidate(matched, r"\w+", "STANDARDIZATION")
+        assert result["literals"] is None
+        assert result["candidates"] == len(matched)
+
+    @pytest.mark.parametrize("text, pattern", [
+        ("ſounds ſo generic", r"sounds so \w+"),  # long s
+        ("\u212aitsch pop", r"kitsch"),           # Kelvin sign
+        ("İNDUSTRY PLANT", r"industry plant"),    # Turkish dotted capital I
+    ])
+    def test_prefilter_keeps_ignorecase_matches(self, miner, text, pattern):
+        df = miner.match_dataframe(pd.DataFrame({"clean_text": [text, "love this"]}))
+        index = InvertedIndex.build(df, facets=())
+        for kwargs in ({}, {"index": index}):
+            result = miner.evaluate_candidate(df, pattern, "STANDARDIZATION", **kwargs)
+            assert result["literals"] is not None
+            assert result["hits"] == 1
+
+    def test_invalid_pattern(self, miner, matched):
+        with pytest.raises(ValueError):
+            miner.evaluate_candidate(matched, r"(unclosed", "STANDARDIZATION")
+
+    def test_unknown_label(self, miner, matched):
+        with pytest.raises(KeyError):
+            miner.evaluate_candidate(matched, r"cookie", "NOT_A_LABEL")
+
+
+class TestCopyFalse:
+    def test_same_result_without_copy(self, miner):
+        df = pd.DataFrame({"clean_text": ["all these songs sound the same", "love it"]})
+        shared = miner.match_dataframe(df, copy=False)
+        pd.testing.assert_frame_equal(shared, miner.match_dataframe(df))
+        assert list(df.columns) == ["clean_text"]
+        assert tm.shares_memory(shared["clean_text"], df["clean_text"])
+
+
+class TestNegationWindow:
+    FAR = "this is not generic at all. " + "filler words " * 10 + "but the chorus is so formulaic"
+
+    @pytest.fixture
+    def make_miner(self, tmp_path, rules_config):
+        def make(window):
+            rules_config["settings"]["negation_window"] = window
+            path = tmp_path / f"rules{window}.yaml"
+            path.write_text(yaml.safe_dump(rules_config))
+            return RuleMiner(path)
+        return make
+
+    def test_distant_negation_does_not_suppress(self, miner):
+        result = miner.match_text(self.FAR)["STANDARDIZATION"]
+        assert result.matched and not result.negated
+        assert len(result.spans) == 2  # "generic" and "formulaic"
+
+    def test_nearby_negation_suppresses(self, miner):
+        result = miner.match_text("this is not generic at all")["STANDARDIZATION"]
+        assert result.negated and not result.matched
+        assert result.confidence == 0.0
+
+    def test_whole_text_when_window_is_null(self, make_miner):
+        result = make_miner(None).match_text(self.FAR)["STANDARDIZATION"]
+        assert result.negated and not result.matched
+
+    def test_zero_window_needs_overlap(self, make_miner):
+        # The negation "not generic" overlaps the positive span "generic".
+        result = make_miner(0).match_text("not generic")["STANDARDIZATION"]
+        assert result.negated
+        result = make_miner(0).match_text("not experimental, just generic")
+        assert result["STANDARDIZATION"].matched
+
+    def test_negative_window_rejected(self, make_miner):
+        with pytest.raises(ValueError, match="negation_window"):
+            make_miner(-1)
+
+    def test_confidence_from_surviving_spans(self, miner):
+        text = "all these songs sound the same? not really the same. " + "la " * 30 + "so generic"
+        result = miner.match_text(text)["STANDARDIZATION"]
+        assert result.matched
+        # The 0.90 hit is negated; only the distant 0.80 "generic" survives.
+        assert result.confidence == 0.80
+
+
+class TestSpansMode:
+    TEXTS = [
+        "all these songs sound the same, so formulaic",
+        "this is not generic at all",
+        "all these songs sound the same? not really the same. " + "la " * 30 + "so generic",
+        "pure algorithm bait, an industry plant",
+        "what is the background music in this video",
+        "I love this song so much!",
+        "",
+    ]
+
+    def test_match_text_fields_agree(self, miner):
+        for text in self.TEXTS:
+            full = miner.match_text(text)
+            fast = miner.match_text(text, spans=False)
+            for label, rm in full.items():
+                assert (fast[label].matched, fast[label].confidence, fast[label].negated) == (
+                    rm.matched, rm.confidence, rm.negated,
+                ), (text, label)
+                assert fast[label].spans == ()
+
+    def test_dataframe_without_spans(self, miner):
+        df = pd.DataFrame({"clean_text": self.TEXTS})
+        full = miner.match_dataframe(df)
+        fast = miner.match_dataframe(df, spans=False)
+        assert not [c for c in fast.columns if c.endswith("_spans")]
+        pd.testing.assert_frame_equal(
+            fast, full.drop(columns=[c for c in full.columns if c.endswith("_spans")]),
+        )
+
+    def test_two_phase_fills_matched_rows_only(self, miner):
+        df = pd.DataFrame({"clean_text": self.TEXTS})
+        full = miner.match_dataframe(df)
+        two_phase = miner.match_dataframe(df, spans="matched", memoize=True)
+        for label in miner.labels:
+            matched = full[f"rule_{label}"]
+            expected = [s if m else [] for s, m in zip(full[f"rule_{label}_spans"], matched)]
+            assert two_phase[f"rule_{label}_spans"].tolist() == expected
+            assert two_phase[f"rule_{label}"].tolist() == matched.tolist()
+
+    def test_two_phase_memoized_empties_are_shared(self, miner):
+        df = pd.DataFrame({"clean_text": self.TEXTS})
+        out = miner.match_dataframe(df, spans="matched", memoize=True)
+        empties = [
+            cell for label in miner.labels
+            for cell, m in zip(out[f"rule_{label}_spans"], out[f"rule_{label}"]) if not m
+        ]
+        assert len({id(cell) for cell in empties}) == 1
+
+    def test_invalid_spans_mode(self, miner):
+        with pytest.raises(ValueError, match="spans"):
+            miner.match_dataframe(pd.DataFrame({"clean_text": ["x"]}), spans="all")
+
+
+class TestMatchTexts:
+    TEXTS = TestSpansMode.TEXTS + [None, float("nan")]
+
+    def test_agrees_with_match_text(self, miner):
+        batch = miner.match_texts(self.TEXTS)
+        assert batch.labels == miner.labels
+        assert batch.matched.shape == batch.confidence.shape == (len(self.TEXTS), len(miner.labels))
+        assert batch.confidence.dtype == np.float32
+        assert batch.spans is None
+        for i, text in enumerate(self.TEXTS):
+            results = miner.match_text(text if isinstance(text, str) else "")
+            for j, label in enumerate(batch.labels):
+                assert batch.matched[i, j] == results[label].matched
+                assert batch.confidence[i, j] == np.float32(results[label].confidence)
+
+    def test_spans_and_dtype(self, miner):
+        batch = miner.match_texts(self.TEXTS, spans=True, dtype=np.float64)
+        assert batch.confidence.dtype == np.float64
+        j = batch.labels.index("STANDARDIZATION")
+        assert batch.spans[0, j] == miner.match_text(self.TEXTS[0])["STANDARDIZATION"].spans
+        assert batch.spans[-1, j] == []
+        assert batch.spans[-1, j] is not batch.spans[-2, j]
+
+    def test_no_match_results_are_shared(self, miner):
+        first = miner.match_text("I love this song so much!", spans=False)
+        second = miner.match_text("", spans=True)
+        assert first["STANDARDIZATION"] is second["STANDARDIZATION"]
+        with pytest.raises(AttributeError):
+            first["STANDARDIZATION"].matched = True
+        assert not hasattr(first["STANDARDIZATION"], "__dict__")
+
+
+class TestEngines:
+    TEXTS = TestSpansMode.TEXTS * 3
+
+    @pytest.fixture
+    def regex_miner(self):
+        pytest.importorskip("regex")
+        return RuleMiner(engine="regex")
+
+    def test_regex_engine_agrees(self, miner, regex_miner):
+        df = pd.DataFrame({"clean_text": self.TEXTS})
+        pd.testing.assert_frame_equal(
+            regex_miner.match_dataframe(df), miner.match_dataframe(df),
+        )
+
+    @pytest.mark.parametrize("spans", [False, True])
+    def test_threaded_matches_serial(self, regex_miner, spans):
+        serial = regex_miner.match_texts(self.TEXTS, spans=spans)
+        threaded = regex_miner.match_texts(self.TEXTS, spans=spans, workers=3)
+        np.testing.assert_array_equal(threaded.matched, serial.matched)
+        np.testing.assert_array_equal(threaded.confidence, serial.confidence)
+        if spans:
+            assert threaded.spans.tolist() == serial.spans.tolist()
+
+    def test_regex_engine_candidate_literals(self, regex_miner):
+        df = regex_miner.match_dataframe(pd.DataFrame({"clean_text": self.TEXTS}))
+        result = regex_miner.evaluate_candidate(df, r"cookie[- ]cutter", "STANDARDIZATION")
+        assert result["literals"] == ["cookie"]
+
+    def test_engine_property(self, miner, regex_miner):
+        assert miner.engine == "re"
+        assert regex_miner.engine == "regex"
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match="engine"):
+            RuleMiner(engine="pcre")
+
+    def test_invalid_workers(self, miner):
+        with pytest.raises(ValueError, match="workers"):
+            miner.match_texts(["x"], workers=0)
+
+
+class TestProcesses:
+    TEXTS = TestSpansMode.TEXTS * 2 + [None]
+
+    def test_processes_agree_with_serial(self, miner):
+        serial = miner.match_texts(self.TEXTS)
+        parallel = miner.match_texts(self.TEXTS, processes=2)
+        assert parallel.spans is None
+        assert parallel.confidence.dtype == np.float32
+        assert np.array_equal(parallel.matched, serial.matched)
+        assert np.array_equal(parallel.confidence, serial.confidence)
+
+    def test_match_dataframe_with_processes(self, miner):
+        df = pd.DataFrame({"clean_text": self.TEXTS})
+        expected = miner.match_dataframe(df, spans="matched")
+        result = miner.match_dataframe(df, spans="matched", processes=2)
+        tm.assert_frame_equal(result, expected)
+
+    def test_rules_published_once(self, monkeypatch):
+        miner = RuleMiner()
+        publish = RuleMiner._publish_config
+        calls = []
+
+        def spy(self):
+            calls.append(self)
+            return publish(self)
+
+        monkeypatch.setattr(RuleMiner, "_publish_config", spy)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            first = miner.match_texts(self.TEXTS, processes=pool)
+            again = miner.match_texts(self.TEXTS, processes=pool)
+        assert len(calls) == 1
+        assert miner.published_rules() is miner.published_rules()
+        assert np.array_equal(first.matched, again.matched)
+
+    def test_spans_rejected(self, miner):
+        with pytest.raises(ValueError, match="spans"):
+            miner.match_texts(self.TEXTS, spans=True, processes=2)
+        with pytest.raises(ValueError, match="spans"):
+            miner.match_dataframe(pd.DataFrame({"clean_text": ["x"]}), processes=2)
+
+    def test_invalid_processes(self, miner):
+        with pytest.raises(ValueError, match="processes"):
+            miner.match_texts(["x"], processes=0)
+
+
+class TestCoverageIntervals:
+    def _matched(self, miner):
+        df = pd.DataFrame({"clean_text": ["all songs sound the same"] * 20 + ["nice"] * 80})
+        return miner.match_dataframe(df, spans=False)
+
+    def test_full_data_has_no_intervals(self, miner):
+        report = miner.coverage_report(self._matched(miner))
+        assert "any_rule_hit_pct_ci" not in report
+        assert "sample" not in report
+
+    def test_sample_gets_wilson_intervals(self, miner):
+        df = self._matched(miner)
+        df.attrs["sample"] = {"method": "systematic", "fraction": 0.1}
+        report = miner.coverage_report(df)
+        low, high = report["any_rule_hit_pct_ci"]
+        assert low < report["any_rule_hit_pct"] == 20.0 < high
+        assert [low, high] == [round(b * 100, 2) for b in wilson_interval(20, 100)]
+        stats = report["per_label"]["STANDARDIZATION"]
+        assert stats["hit_pct_ci"][0] <= stats["hit_pct"] <= stats["hit_pct_ci"][1]
+        assert report["sample"]["ci_level"] == 0.95
+        narrow = miner.coverage_report(df, ci_level=0.5)["any_rule_hit_pct_ci"]
+        assert low < narrow[0] < narrow[1] < high
+
+    def test_wilson_interval_edges(self):
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+        low, high = wilson_interval(0, 50)
+        assert low == pytest.approx(0.0) and 0 < high < 0.1
+
+
+class TestCoverageCube:
+    def _matched(self, miner):
+        df = pd.DataFrame({
+            "clean_text": ["all songs sound the same", "nice", "made for tiktok", None, "formulaic"] * 3,
+            "song_title": ["A", "A", "B", "B", None] * 3,
+            "language": ["en", "de", "en"] * 5,
+        })
+        return miner.match_dataframe(df, spans=False)
+
+    def test_groups_match_filtered_reports(self, miner):
+        df = self._matched(miner)
+        cube = miner.coverage_cube(df, ["song_title", "language"])
+        assert list(cube.columns[:5]) == [
+            "song_title", "language", "rows", "any_rule_hit", "any_rule_hit_pct",
+        ]
+        assert cube["rows"].sum() == len(df)
+        for row in cube.itertuples(index=False):
+            song = df["song_title"].isna() if pd.isna(row.song_title) else df["song_title"] == row.song_title
+            report = miner.coverage_report(df[song & (df["language"] == row.language)])
+            assert row.rows == report["total_rows"]
+            assert row.any_rule_hit_pct == report["any_rule_hit_pct"]
+            for label, stats in report["per_label"].items():
+                assert getattr(row, f"{label}_hits") == stats["hits"]
+                assert getattr(row, f"{label}_hit_pct") == stats["hit_pct"]
+                assert getattr(row, f"{label}_avg_confidence") == stats["avg_confidence"]
+
+    def test_coverage_report_by(self, miner):
+        df = self._matched(miner)
+        report = miner.coverage_report(df, by="song_title")
+        assert report["by"] == ["song_title"]
+        pd.testing.assert_frame_equal(report["groups"], miner.coverage_cube(df, "song_title"))
+        assert report["total_rows"] == len(df)
+
+    def test_unknown_group_column(self, miner):
+        with pytest.raises(KeyError, match="artist"):
+            miner.coverage_cube(self._matched(miner), ["artist"])
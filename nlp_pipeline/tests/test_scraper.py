@@ -0,0 +1,236 @@
+"""Tests for the concurrent, resumable comment scraper."""
+
+import json
+
+import pytest
+
+from nlp_pipeline.data_ingest import ingest
+from nlp_pipeline.scraper import (
+    CommentScraper,
+    DownloaderPageSource,
+    RateLimiter,
+    ReplayPageSource,
+    VideoTask,
+    extract_video_id,
+    load_video_tasks,
+    merge_video_files,
+)
+
+URL_A = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+URL_B = "https://www.youtube.com/watch?v=bbbbbbbbbbb"
+
+
+def _pages(prefix, n_pages, per_page=3):
+    return [
+        [{"cid": f"{prefix}{p}_{i}", "text": f"comment {p}.{i}", "votes": "1"}
+         for i in range(per_page)]
+        for p in range(n_pages)
+    ]
+
+
+@pytest.fixture
+def recordings():
+    return {URL_A: _pages("a", 3), URL_B: _pages("b", 2)}
+
+
+@pytest.fixture
+def tasks():
+    return [
+        VideoTask(URL_A, song_title="Song A", artists="Artist A"),
+        VideoTask(URL_B, song_title="Song B", artists="Artist B"),
+    ]
+
+
+def _read_cids(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["cid"] for line in f]
+
+
+class TestHelpers:
+    @pytest.mark.parametrize("url", [
+        "https://www.youtube.com/watch?v=u2ah9tWTkmk",
+        "https://youtu.be/u2ah9tWTkmk",
+        "https://www.youtube.com/shorts/u2ah9tWTkmk",
+        "https://www.youtube.com/watch?feature=share&v=u2ah9tWTkmk",
+    ])
+    def test_extract_video_id(self, url):
+        assert extract_video_id(url) == "u2ah9tWTkmk"
+
+    def test_extract_video_id_invalid(self):
+        with pytest.raises(ValueError):
+            extract_video_id("https://www.youtube.com/")
+
+    def test_load_video_tasks(self, tmp_path):
+        path = tmp_path / "urls.csv"
+        path.write_text(
+            "Song Title,Artists,YouTube URL\n"
+            f"Ordinary,Alex Warren,{URL_A}\n"
+            "Missing,Nobody,\n"
+        )
+        tasks = load_video_tasks(path)
+        assert len(tasks) == 1
+        assert tasks[0].song_title == "Ordinary"
+        assert tasks[0].video_id == "aaaaaaaaaaa"
+
+
+class TestRateLimiter:
+    def test_waits_when_tokens_exhausted(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = RateLimiter(2.0, burst=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            limiter.acquire()
+        # Two requests from the burst, then one every 0.5s.
+        assert sleeps == pytest.approx([0.5, 0.5])
+
+    def test_zero_rate_disables(self):
+        limiter = RateLimiter(0, sleep=lambda s: pytest.fail("should not sleep"))
+        for _ in range(10):
+            limiter.acquire()
+
+
+class _FakeSession:
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+class _FakeDownloader:
+    """Stand-in for ``YoutubeCommentDownloader``: one GET, then a fixed stream."""
+
+    comments = []
+
+    def __init__(self):
+        self.session = _FakeSession()
+
+    def get_comments_from_url(self, url, sort_by, language, sleep):
+        self.session.get(url)
+        for cid in self.comments:
+            yield {"cid": cid, "text": f"comment {cid}"}
+
+
+class TestDownloaderPageSource:
+    @pytest.fixture(autouse=True)
+    def fake_downloader(self, monkeypatch):
+        monkeypatch.setattr(
+            "youtube_comment_downloader.YoutubeCommentDownloader", _FakeDownloader,
+        )
+        _FakeDownloader.comments = ["c1", "c2", "c3", "c4", "c5"]
+
+    def _cids(self, source, state=None, limiter=None):
+        pages = list(source.iter_pages(URL_A, state, limiter or RateLimiter(0)))
+        return [[c["cid"] for c in page.comments] for page in pages], pages
+
+    def test_initial_fetch_is_rate_limited(self):
+        calls = []
+        limiter = RateLimiter(0)
+        limiter.acquire = lambda: calls.append(1)
+        self._cids(DownloaderPageSource(sort_by=1), limiter=limiter)
+        assert calls == [1]
+
+    def test_resumes_after_last_comment_id(self):
+        source = DownloaderPageSource(sort_by=1, page_size=2)
+        cids, pages = self._cids(source)
+        assert cids == [["c1", "c2"], ["c3", "c4"], ["c5"]]
+        assert pages[0].state == {"offset": 2, "last_cid": "c2"}
+        # A new comment at the top must not shift the resume point.
+        _FakeDownloader.comments.insert(0, "c0")
+        cids, _ = self._cids(source, pages[0].state)
+        assert cids == [["c3", "c4"], ["c5"]]
+
+    def test_popular_sort_refuses_to_resume(self):
+        source = DownloaderPageSource(sort_by=0, page_size=2)
+        with pytest.raises(RuntimeError, match="sort_by=0"):
+            self._cids(source, {"offset": 2, "last_cid": "c2"})
+
+    def test_default_sort_can_skip_written_comments(self):
+        assert DownloaderPageSource().sort_by == 1
+
+    def test_missing_resume_comment(self):
+        source = DownloaderPageSource(sort_by=1, page_size=2)
+        with pytest.raises(RuntimeError, match="no longer appears"):
+            self._cids(source, {"offset": 2, "last_cid": "gone"})
+
+
+class TestCommentScraper:
+    def test_scrapes_all_videos(self, tmp_path, recordings, tasks):
+        scraper = CommentScraper(tmp_path, ReplayPageSource(recordings), workers=2, rate=0)
+        summary = scraper.scrape(tasks)
+        assert summary["comments_written"] == 15
+        assert summary["videos_done"] == 2
+        assert len(_read_cids(tmp_path / "aaaaaaaaaaa.jsonl")) == 9
+        first = json.loads((tmp_path / "bbbbbbbbbbb.jsonl").read_text().splitlines()[0])
+        assert first["song_title"] == "Song B"
+        assert first["video_id"] == "bbbbbbbbbbb"
+        assert first["youtube_url"] == URL_B
+
+    def test_resumes_after_crash(self, tmp_path, recordings, tasks):
+        crashing = ReplayPageSource(recordings, fail_after={URL_A: 2})
+        summary = CommentScraper(tmp_path, crashing, rate=0).scrape(tasks)
+        assert "aaaaaaaaaaa" in summary["videos_failed"]
+        assert len(_read_cids(tmp_path / "aaaaaaaaaaa.jsonl")) == 6
+
+        # Simulate a torn write after the last checkpoint.
+        with open(tmp_path / "aaaaaaaaaaa.jsonl", "a") as f:
+            f.write('{"cid": "garbage"')
+
+        replay = ReplayPageSource(recordings)
+        summary = CommentScraper(tmp_path, replay, rate=0).scrape(tasks)
+        assert summary["videos_failed"] == {}
+        # Only the missing page of A is fetched; B is already complete.
+        assert replay.requests == [(URL_A, 2)]
+        cids = _read_cids(tmp_path / "aaaaaaaaaaa.jsonl")
+        assert cids == [f"a{p}_{i}" for p in range(3) for i in range(3)]
+
+    def test_max_comments_cap(self, tmp_path, recordings, tasks):
+        scraper = CommentScraper(
+            tmp_path, ReplayPageSource(recordings), workers=1, rate=0, max_comments=7,
+        )
+        summary = scraper.scrape(tasks)
+        assert summary["comments_written"] <= 7
+        assert summary["videos_done"] == 0
+
+        summary = CommentScraper(tmp_path, ReplayPageSource(recordings), rate=0).scrape(tasks)
+        assert summary["videos_done"] == 2
+        assert len(_read_cids(tmp_path / "aaaaaaaaaaa.jsonl")) == 9
+
+    def test_on_page_callback(self, tmp_path, recordings, tasks):
+        seen = []
+        CommentScraper(tmp_path, ReplayPageSource(recordings), rate=0).scrape(
+            tasks, on_page=lambda task, comments: seen.append((task.video_id, len(comments)))
+        )
+        assert sorted(seen) == [("aaaaaaaaaaa", 3)] * 3 + [("bbbbbbbbbbb", 3)] * 2
+
+    def test_replay_from_dir(self, tmp_path, recordings):
+        rec_dir = tmp_path / "recordings"
+        rec_dir.mkdir()
+        (rec_dir / "a.json").write_text(json.dumps({"url": URL_A, "pages": recordings[URL_A]}))
+        source = ReplayPageSource.from_dir(rec_dir)
+        assert source.pages[URL_A] == recordings[URL_A]
+
+    def test_iter_comments_streams_to_classifier(self, tmp_path, recordings, tasks):
+        from nlp_pipeline.pipeline import classify_stream
+
+        scraper = CommentScraper(tmp_path, ReplayPageSource(recordings), rate=0)
+        updates = list(classify_stream(scraper.iter_comments(tasks), batch_size=4))
+        assert updates[-1].coverage["total_rows"] == 15
+        assert scraper.last_summary["videos_done"] == 2
+
+    def test_merge_feeds_ingest(self, tmp_path, recordings, tasks):
+        out_dir = tmp_path / "raw"
+        CommentScraper(out_dir, ReplayPageSource(recordings), rate=0).scrape(tasks)
+        merged = tmp_path / "comments.jsonl"
+        assert merge_video_files(out_dir, merged) == 15
+        df = ingest(merged)
+        assert len(df) == 15
+        assert set(df["video_id"]) == {"aaaaaaaaaaa", "bbbbbbbbbbb"}
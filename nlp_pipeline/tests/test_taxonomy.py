@@ -0,0 +1,106 @@
+"""Tests for the label taxonomy module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from nlp_pipeline.rule_miner import RuleMiner
+from nlp_pipeline.taxonomy import (
+    MASK_COL,
+    apply_taxonomy,
+    decode_mask,
+    load_taxonomy,
+)
+
+
+@pytest.fixture
+def taxonomy():
+    return load_taxonomy()
+
+
+@pytest.fixture
+def matched():
+    return pd.DataFrame({
+        "rule_STANDARDIZATION": [True, True, False, False],
+        "rule_STANDARDIZATION_conf": [0.9, 0.3, 0.0, 0.0],
+        "rule_FORMAL_RESISTANCE": [False, True, False, True],
+        "rule_FORMAL_RESISTANCE_conf": [0.0, 0.6, 0.0, 0.4],
+    })
+
+
+class TestLoad:
+    def test_cached(self, taxonomy):
+        assert load_taxonomy() is taxonomy
+
+    def test_order_and_thresholds(self, taxonomy):
+        assert taxonomy.critique_labels[0] == "STANDARDIZATION"
+        assert "NONE" not in taxonomy.critique_labels
+        assert taxonomy.min_confidence["FORMAL_RESISTANCE"] == 0.40
+        assert taxonomy.spec("REGRESSIVE_LISTENING").target_precision == 0.70
+        assert taxonomy.mask_dtype == np.uint8
+
+    def test_matches_regex_rules(self, taxonomy):
+        taxonomy.validate(RuleMiner().labels)
+
+    def test_validate_mismatch(self, taxonomy):
+        with pytest.raises(ValueError, match="disagree"):
+            taxonomy.validate(["STANDARDIZATION", "EXTRA"])
+
+    def test_rule_miner_rejects_unknown_label(self):
+        config = {
+            "settings": {"validate_labels": True},
+            "rules": {"EXTRA": {"patterns": [{"pattern": "x"}]}},
+        }
+        with pytest.raises(ValueError, match="disagree"):
+            RuleMiner(config=config)
+
+    def test_rule_miner_validation_is_opt_in(self):
+        config = {"rules": {"EXTRA": {"patterns": [{"pattern": "x"}]}}}
+        assert RuleMiner(config=config).labels == ["EXTRA"]
+
+    def test_duplicate_ids_rejected(self, tmp_path):
+        path = tmp_path / "labels.yaml"
+        path.write_text(yaml.safe_dump({"labels": {
+            "A": {"id": 0}, "B": {"id": 0}, "NONE": {"id": 1},
+        }}))
+        with pytest.raises(ValueError, match="Duplicate"):
+            load_taxonomy(path)
+
+
+class TestApply:
+    def test_thresholds_and_none(self, taxonomy, matched):
+        out = apply_taxonomy(matched, taxonomy)
+        # 0.3 < STANDARDIZATION min_confidence (0.50).
+        assert out["rule_STANDARDIZATION"].tolist() == [True, False, False, False]
+        assert out["rule_STANDARDIZATION_conf"].tolist() == [0.9, 0.0, 0.0, 0.0]
+        assert out["rule_FORMAL_RESISTANCE"].tolist() == [False, True, False, True]
+        assert out["rule_NONE"].tolist() == [False, False, True, False]
+        # Input is not modified.
+        assert matched["rule_STANDARDIZATION"].tolist() == [True, True, False, False]
+
+    def test_label_mask(self, taxonomy, matched):
+        out = apply_taxonomy(matched, taxonomy)
+        assert out[MASK_COL].dtype == np.uint8
+        std, fr, none = (taxonomy.mask(l) for l in
+                         ("STANDARDIZATION", "FORMAL_RESISTANCE", "NONE"))
+        assert out[MASK_COL].tolist() == [std, fr, none, fr]
+        assert decode_mask(out[MASK_COL], taxonomy).tolist() == [
+            ["STANDARDIZATION"], ["FORMAL_RESISTANCE"], ["NONE"], ["FORMAL_RESISTANCE"],
+        ]
+
+    def test_override_thresholds(self, taxonomy, matched):
+        out = apply_taxonomy(matched, taxonomy, min_confidence={})
+        assert out["rule_STANDARDIZATION"].tolist() == [True, True, False, False]
+        assert taxonomy.decode(out[MASK_COL].iloc[1]) == [
+            "STANDARDIZATION", "FORMAL_RESISTANCE",
+        ]
+
+    def test_end_to_end(self, taxonomy):
+        miner = RuleMiner()
+        df = miner.match_dataframe(pd.DataFrame({
+            "clean_text": ["all these songs sound the same", "i love this song"],
+        }))
+        out = apply_taxonomy(df, taxonomy)
+        assert out["rule_NONE"].tolist() == [False, True]
+        assert out[MASK_COL].iloc[0] & taxonomy.mask("STANDARDIZATION")
@@ -0,0 +1,108 @@
+"""Tests for the inverted index."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nlp_pipeline.cli import main
+from nlp_pipeline.text_index import InvertedIndex, tokenize
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        "clean_text": [
+            "All these songs sound the same",
+            "this song is fire",
+            "the songs sound the SAME, made for tiktok",
+            "sound the alarm",
+            None,
+            "made for TikTok and radio",
+        ],
+        "song_title": ["A", "A", "B", "B", "C", None],
+        "artists": ["x", "x", "y", "y", "z", "z"],
+    })
+
+
+@pytest.fixture
+def index(df):
+    return InvertedIndex.build(df)
+
+
+def _scan(df, pattern):
+    """The str.contains scan the index replaces."""
+    return np.flatnonzero(
+        df["clean_text"].fillna("").str.contains(pattern, case=False, regex=True)
+    )
+
+
+class TestTokenize:
+    def test_casefold_and_punctuation(self):
+        assert tokenize("The SAME, made-for TikTok!") == ["the", "same", "made", "for", "tiktok"]
+
+
+class TestQueries:
+    def test_postings(self, index):
+        assert index.postings("Songs").tolist() == [0, 2]
+        assert index.postings("missing").tolist() == []
+        with pytest.raises(ValueError):
+            index.postings("two words")
+
+    @pytest.mark.parametrize("phrase, pattern", [
+        ("sound the same", r"\bsound\W+the\W+same\b"),
+        ("made for tiktok", r"\bmade\W+for\W+tiktok\b"),
+        ("the same", r"\bthe\W+same\b"),
+        ("sound", r"\bsound\b"),
+    ])
+    def test_phrase_matches_scan(self, df, index, phrase, pattern):
+        assert index.phrase(phrase).tolist() == _scan(df, pattern).tolist()
+
+    def test_long_phrase_is_verified(self):
+        # Row 0 has both bigrams "sound the" and "the same", but not the phrase.
+        index = InvertedIndex.build(pd.DataFrame({
+            "clean_text": ["sound the bell, the same bell", "it all sounds the same"],
+        }))
+        assert index.phrase("sound the same").tolist() == []
+        assert index.phrase("sounds the same").tolist() == [1]
+
+    def test_boolean(self, index):
+        assert index.search(all_of=["sound"], none_of=["tiktok"]).tolist() == [0, 3]
+        assert index.search(any_of=["fire", "radio"]).tolist() == [1, 5]
+        assert index.search(all_of=["the"], any_of=["songs", "alarm"]).tolist() == [0, 2, 3]
+        assert index.search(none_of=["the"]).tolist() == [1, 4, 5]
+
+    def test_preview_regex(self, index):
+        rows = index.search(all_of=["songs"])
+        assert index.preview_regex(r"same\s*,", rows).tolist() == [2]
+
+    def test_facet_counts(self, index):
+        rows = index.search(all_of=["made for tiktok"])
+        counts = index.facet_counts(rows, "song_title")
+        assert counts.to_dict() == {"B": 1}  # row 5 has no song_title
+        assert index.facet_counts(rows, "artists").to_dict() == {"y": 1, "z": 1}
+        with pytest.raises(KeyError):
+            index.facet_counts(rows, "author")
+
+
+class TestPersistence:
+    def test_save_load_roundtrip(self, index, tmp_path):
+        index.save(tmp_path / "idx")
+        loaded = InvertedIndex.load(tmp_path / "idx")
+        assert isinstance(loaded._arrays["unigram_postings"], np.memmap)
+        assert loaded.n_rows == index.n_rows
+        assert loaded.phrase("sound the same").tolist() == [0, 2]
+        assert loaded.texts([1]) == ["this song is fire"]
+        assert loaded.facet_counts(loaded.postings("songs"), "artists").to_dict() == {
+            "x": 1, "y": 1,
+        }
+
+    def test_cli(self, df, tmp_path, capsys):
+        src = tmp_path / "results.jsonl"
+        df.to_json(src, orient="records", lines=True)
+        assert main(["index", str(src), "--out-dir", str(tmp_path / "idx")]) == 0
+        capsys.readouterr()
+        assert main(["query", str(tmp_path / "idx"), "--all", "sound the same",
+                     "--facet", "artists"]) == 0
+        out = capsys.readouterr().out
+        assert '"hits": 2' in out
+        assert '"x": 1' in out
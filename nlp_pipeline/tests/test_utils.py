@@ -0,0 +1,61 @@
+"""Tests for the shared utilities."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nlp_pipeline import utils
+from nlp_pipeline.utils import SharedArray, SharedTexts, resolve_copy
+
+
+class TestSharedTexts:
+    TEXTS = ["plain", "", "ünïcödé 🎵", None, float("nan"), "last"]
+
+    def test_round_trip(self):
+        with SharedTexts.create(self.TEXTS) as shared:
+            assert len(shared) == len(self.TEXTS)
+            assert [shared[i] for i in range(len(shared))] == [
+                "plain", "", "ünïcödé 🎵", "", "", "last",
+            ]
+
+    def test_attach_by_handle(self):
+        with SharedTexts.create(pd.Series(self.TEXTS)) as shared:
+            attached = SharedTexts.attach(shared.handle)
+            try:
+                assert attached[2] == "ünïcödé 🎵"
+                assert len(attached) == len(self.TEXTS)
+            finally:
+                attached.close()
+
+    def test_empty(self):
+        with SharedTexts.create([]) as shared:
+            assert len(shared) == 0
+
+
+class TestSharedArray:
+    def test_writes_are_visible_to_the_creator(self):
+        with SharedArray.create((3, 2), np.float32) as shared:
+            assert not shared.array.any()
+            attached = SharedArray.attach(shared.handle)
+            attached.array[1, 0] = 0.5
+            attached.close()
+            assert shared.array.dtype == np.float32
+            assert shared.array[1, 0] == pytest.approx(0.5)
+
+    def test_unlinked_on_close(self):
+        shared = SharedArray.create((2,), bool)
+        handle = shared.handle
+        shared.close()
+        with pytest.raises(FileNotFoundError):
+            SharedArray.attach(handle)
+
+
+class TestResolveCopy:
+    def test_views_under_copy_on_write(self):
+        assert utils.copy_on_write()
+        assert resolve_copy(False) is False
+        assert resolve_copy(True) is True
+
+    def test_copies_without_copy_on_write(self, monkeypatch):
+        monkeypatch.setattr(utils, "copy_on_write", lambda: False)
+        assert resolve_copy(False) is True
@@ -0,0 +1,425 @@
+"""Inverted index over preprocessed comments for fast phrase exploration.
+
+Maps every token and token bigram of ``clean_text`` to a posting list of row
+IDs (positions in the indexed DataFrame), stored in CSR form as NumPy arrays:
+``offsets[t]:offsets[t + 1]`` slices the sorted row IDs of term ``t`` out of
+one flat ``postings`` array.  The texts themselves are kept as one UTF-8
+buffer plus byte offsets, and facet columns (song, artist) as integer codes,
+so the whole index can be saved as ``.npy`` files and memory-mapped back.
+
+Queries (boolean, phrase, regex preview) and facet counts only touch the
+posting lists involved, so they return in milliseconds on the full corpus --
+much cheaper than a ``df.clean_text.str.contains(...)`` scan.
+
+Typical usage
+-------------
+>>> from nlp_pipeline.text_index import InvertedIndex
+>>> index = InvertedIndex.build(preprocess_dataframe(df))
+>>> rows = index.search(all_of=["sounds the same"], none_of=["not"])
+>>> index.facet_counts(rows, "song_title").head()
+>>> index.save("data/index")
+>>> index = InvertedIndex.load("data/index")  # memory-mapped
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .utils import ensure_dir, get_logger
+
+logger = get_logger(__name__)
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r"\w+")
+_DEFAULT_FACETS: tuple[str, ...] = ("song_title", "artists")
+_META_FILE = "meta.json"
+_ARRAYS: tuple[str, ...] = (
+    "unigram_offsets",
+    "unigram_postings",
+    "bigram_offsets",
+    "bigram_postings",
+    "text_offsets",
+    "text_data",
+)
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+# Letters re.IGNORECASE equates with "i" that str.casefold() keeps apart.
+_IGNORECASE_FIXES = str.maketrans({"\u0130": "i", "\u0131": "i"})
+
+
+def fold_case(text: str) -> str:
+    """Case-fold *text* the way ``re.IGNORECASE`` compares characters.
+
+    :meth:`str.casefold` already merges the letters ``IGNORECASE`` treats as
+    equal ("ſ" and "s", the Kelvin sign and "k", ...) except the Turkish
+    dotted and dotless i, which are mapped to "i" first.
+    """
+    return text.translate(_IGNORECASE_FIXES).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """Case-folded word tokens of *text*, as used by the index and queries."""
+    return _TOKEN_RE.findall(fold_case(text))
+
+
+# ---------------------------------------------------------------------------
+# Construction helpers
+# ---------------------------------------------------------------------------
+
+def _csr(term_ids: np.ndarray, rows: np.ndarray, n_terms: int, n_rows: int):
+    """Sorted, de-duplicated posting lists in CSR form."""
+    keys = np.unique(term_ids.astype(np.int64) * max(n_rows, 1) + rows)
+    terms = keys // max(n_rows, 1)
+    postings = (keys % max(n_rows, 1)).astype(np.int32)
+    offsets = np.zeros(n_terms + 1, dtype=np.int64)
+    np.cumsum(np.bincount(terms, minlength=n_terms), out=offsets[1:])
+    return offsets, postings
+
+
+def _intersect(arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """Intersection of sorted unique row-ID arrays, smallest first."""
+    if not arrays:
+        return _EMPTY
+    arrays = sorted(arrays, key=len)
+    result = np.asarray(arrays[0])
+    for arr in arrays[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, arr, assume_unique=True)
+    return result.astype(np.int32, copy=False)
+
+
+def _union(arrays: Sequence[np.ndarray]) -> np.ndarray:
+    if not arrays:
+        return _EMPTY
+    return np.unique(np.concatenate(arrays)).astype(np.int32, copy=False)
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+class InvertedIndex:
+    """Token / bigram inverted index with facet columns.
+
+    Build one with :meth:`build` or :meth:`load`; the constructor takes the
+    raw arrays.  Row IDs are positions ``0..n_rows-1`` in the indexed
+    DataFrame (use ``df.iloc[rows]`` to get the rows back).
+    """
+
+    def __init__(
+        self,
+        vocab: list[str],
+        bigrams: list[str],
+        arrays: dict[str, np.ndarray],
+        facets: dict[str, tuple[list[Any], np.ndarray]],
+        text_col: str = "clean_text",
+    ) -> None:
+        self.vocab = vocab
+        self.bigrams = bigrams
+        self.text_col = text_col
+        self.n_rows = len(arrays["text_offsets"]) - 1
+        self._arrays = arrays
+        self._facets = facets
+        self._term_ids = {term: i for i, term in enumerate(vocab)}
+        self._bigram_ids = {pair: i for i, pair in enumerate(bigrams)}
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        text_col: str = "clean_text",
+        facets: Iterable[str] = _DEFAULT_FACETS,
+    ) -> "InvertedIndex":
+        """Index *text_col* of *df* (typically ``preprocess_dataframe`` output).
+
+        Facet columns that are missing from *df* are skipped.
+
+        Raises
+        ------
+        KeyError
+            If *text_col* is not present in *df*.
+        """
+        if text_col not in df.columns:
+            raise KeyError(
+                f"Column '{text_col}' not found in DataFrame. "
+                f"Available columns: {list(df.columns)}"
+            )
+
+        texts = df[text_col].fillna("").astype(str).tolist()
+        n_rows = len(texts)
+
+        term_ids: dict[str, int] = {}
+        bigram_ids: dict[str, int] = {}
+        uni_terms: list[int] = []
+        uni_rows: list[int] = []
+        bi_terms: list[int] = []
+        bi_rows: list[int] = []
+
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            uni_terms.extend(term_ids.setdefault(tok, len(term_ids)) for tok in tokens)
+            uni_rows.extend([row] * len(tokens))
+            for a, b in zip(tokens, tokens[1:]):
+                # Tokens never contain spaces, so "a b" is unambiguous.
+                bi_terms.append(bigram_ids.setdefault(f"{a} {b}", len(bigram_ids)))
+                bi_rows.append(row)
+
+        vocab = list(term_ids)
+        bigrams = list(bigram_ids)
+        uni_offsets, uni_postings = _csr(
+            np.asarray(uni_terms, dtype=np.int64),
+            np.asarray(uni_rows, dtype=np.int64),
+            len(vocab),
+            n_rows,
+        )
+        bi_offsets, bi_postings = _csr(
+            np.asarray(bi_terms, dtype=np.int64),
+            np.asarray(bi_rows, dtype=np.int64),
+            len(bigrams),
+            n_rows,
+        )
+
+        encoded = [t.encode("utf-8") for t in texts]
+        text_offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=text_offsets[1:])
+        text_data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        facet_data: dict[str, tuple[list[Any], np.ndarray]] = {}
+        for col in facets:
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[col], use_na_sentinel=True)
+            facet_data[col] = (
+                [None if pd.isna(u) else u for u in uniques.tolist()],
+                codes.astype(np.int32),
+            )
+
+        index = cls(
+            vocab,
+            bigrams,
+            {
+                "unigram_offsets": uni_offsets,
+                "unigram_postings": uni_postings,
+                "bigram_offsets": bi_offsets,
+                "bigram_postings": bi_postings,
+                "text_offsets": text_offsets,
+                "text_data": text_data,
+            },
+            facet_data,
+            text_col=text_col,
+        )
+        logger.info(
+            "Indexed %d rows: %d terms, %d bigrams, %d postings",
+            n_rows,
+            len(vocab),
+            len(bigrams),
+            len(uni_postings) + len(bi_postings),
+        )
+        return index
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, directory: str | Path) -> Path:
+        """Write the index to *directory* (``meta.json`` plus ``.npy`` files)."""
+        directory = ensure_dir(directory)
+        for name in _ARRAYS:
+            np.save(directory / f"{name}.npy", np.asarray(self._arrays[name]))
+        facet_meta = {}
+        for col, (labels, codes) in self._facets.items():
+            file_name = f"facet_{len(facet_meta)}.npy"
+            np.save(directory / file_name, np.asarray(codes))
+            facet_meta[col] = {"labels": labels, "codes": file_name}
+        meta = {
+            "text_col": self.text_col,
+            "n_rows": self.n_rows,
+            "vocab": self.vocab,
+            "bigrams": self.bigrams,
+            "facets": facet_meta,
+        }
+        with open(directory / _META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+        logger.info("Saved index (%d rows) to %s", self.n_rows, directory)
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "InvertedIndex":
+        """Load an index written by :meth:`save`.
+
+        With *mmap* (the default) the arrays are memory-mapped read-only, so
+        loading is near-instant and pages are read on demand.
+        """
+        directory = Path(directory)
+        with open(directory / _META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mode)
+            for name in _ARRAYS
+        }
+        facets = {
+            col: (spec["labels"], np.load(directory / spec["codes"], mmap_mode=mode))
+            for col, spec in meta["facets"].items()
+        }
+        return cls(
+            meta["vocab"], meta["bigrams"], arrays, facets, text_col=meta["text_col"],
+        )
+
+    # ------------------------------------------------------------------
+    # Posting lists
+    # ------------------------------------------------------------------
+
+    def _slice(self, kind: str, term_id: Optional[int]) -> np.ndarray:
+        if term_id is None:
+            return _EMPTY
+        offsets = self._arrays[f"{kind}_offsets"]
+        return self._arrays[f"{kind}_postings"][offsets[term_id]:offsets[term_id + 1]]
+
+    def postings(self, term: str) -> np.ndarray:
+        """Sorted row IDs containing the single token *term*."""
+        tokens = tokenize(term)
+        if len(tokens) != 1:
+            raise ValueError(f"postings() takes a single token, got {term!r}.")
+        return self._slice("unigram", self._term_ids.get(tokens[0]))
+
+    def document_frequency(self, term: str) -> int:
+        """Number of rows containing *term* (token or phrase)."""
+        return len(self.phrase(term))
+
+    def phrase(self, text: str) -> np.ndarray:
+        """Sorted row IDs whose tokens contain *text*'s tokens consecutively.
+
+        One- and two-token phrases are answered from the posting lists
+        alone; longer phrases intersect the bigram lists and then verify
+        the candidates against the stored text.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return _EMPTY
+        if len(tokens) == 1:
+            return self._slice("unigram", self._term_ids.get(tokens[0]))
+
+        lists = [
+            self._slice("bigram", self._bigram_ids.get(f"{a} {b}"))
+            for a, b in zip(tokens, tokens[1:])
+        ]
+        candidates = _intersect(lists)
+        if len(tokens) == 2 or not len(candidates):
+            return candidates
+
+        width = len(tokens)
+        keep = []
+        for row in candidates.tolist():
+            row_tokens = tokenize(self.text(row))
+            if any(
+                row_tokens[i:i + width] == tokens
+                for i in range(len(row_tokens) - width + 1)
+            ):
+                keep.append(row)
+        return np.asarray(keep, dtype=np.int32)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = (),
+    ) -> np.ndarray:
+        """Boolean query; each term may be a single token or a phrase.
+
+        Rows must contain every *all_of* term, at least one *any_of* term
+        (if given), and no *none_of* term.  With neither *all_of* nor
+        *any_of*, the query starts from all rows.
+
+        Returns
+        -------
+        np.ndarray
+            Sorted row IDs.
+        """
+        all_of, any_of, none_of = list(all_of), list(any_of), list(none_of)
+        lists = [self.phrase(t) for t in all_of]
+        if any_of:
+            lists.append(_union([self.phrase(t) for t in any_of]))
+        if lists:
+            rows = _intersect(lists)
+        else:
+            rows = np.arange(self.n_rows, dtype=np.int32)
+        if none_of and len(rows):
+            excluded = _union([self.phrase(t) for t in none_of])
+            rows = np.setdiff1d(rows, excluded, assume_unique=True).astype(np.int32)
+        return rows
+
+    def preview_regex(
+        self,
+        pattern: str | re.Pattern,
+        rows: Optional[np.ndarray] = None,
+        flags: int = re.IGNORECASE,
+    ) -> np.ndarray:
+        """Rows among *rows* (default: all) whose text matches *pattern*.
+
+        Narrow *rows* with :meth:`search` first (e.g. on a literal word the
+        pattern requires) so the regex only runs on candidates.
+        """
+        regex = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        candidates = np.arange(self.n_rows) if rows is None else np.asarray(rows)
+        hits = [r for r in candidates.tolist() if regex.search(self.text(r))]
+        return np.asarray(hits, dtype=np.int32)
+
+    # ------------------------------------------------------------------
+    # Texts and facets
+    # ------------------------------------------------------------------
+
+    def text(self, row: int) -> str:
+        """The indexed text of *row*."""
+        offsets = self._arrays["text_offsets"]
+        start, end = int(offsets[row]), int(offsets[row + 1])
+        return bytes(self._arrays["text_data"][start:end]).decode("utf-8")
+
+    def texts(self, rows: Iterable[int]) -> list[str]:
+        """The indexed texts of *rows*."""
+        return [self.text(int(r)) for r in rows]
+
+    @property
+    def facets(self) -> list[str]:
+        """Names of the indexed facet columns."""
+        return list(self._facets)
+
+    def facet_counts(self, rows: np.ndarray, facet: str = "song_title") -> pd.Series:
+        """Count *rows* per value of *facet*, most frequent first.
+
+        Raises
+        ------
+        KeyError
+            If *facet* was not indexed.
+        """
+        if facet not in self._facets:
+            raise KeyError(f"Facet '{facet}' not indexed. Available: {self.facets}")
+        labels, codes = self._facets[facet]
+        selected = np.asarray(codes)[np.asarray(rows, dtype=np.int64)]
+        selected = selected[selected >= 0]
+        counts = np.bincount(selected, minlength=len(labels))
+        nonzero = np.flatnonzero(counts)
+        series = pd.Series(
+            counts[nonzero], index=pd.Index([labels[i] for i in nonzero], name=facet),
+            name="count",
+        )
+        return series.sort_values(ascending=False, kind="stable")
@@ -1,13 +1,17 @@
-"""Shared utilities: logging, YAML/JSON I/O, and path helpers."""
+"""Shared utilities: logging, text columns, shared memory, YAML/JSON I/O and paths."""
 
 from __future__ import annotations
 
 import json
 import logging
 import sys
+import threading
+from multiprocessing import shared_memory
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
+import numpy as np
+import pandas as pd
 import yaml
 
 
@@ -16,31 +20,250 @@ import yaml
 # ---------------------------------------------------------------------------
 
 _CONFIGURED = False
+_CONFIGURE_LOCK = threading.Lock()
 
 
 def get_logger(name: str, level: str | None = None) -> logging.Logger:
-    """Return a named logger with console handler."""
+    """Return a named logger with console handler.
+
+    Safe to call from several threads: the handler is installed once.
+    """
     global _CONFIGURED
 
     logger = logging.getLogger(name)
 
     if not _CONFIGURED:
-        log_level = getattr(logging, (level or "INFO").upper(), logging.INFO)
-        logger.setLevel(log_level)
-
-        console = logging.StreamHandler(sys.stderr)
-        console.setLevel(log_level)
-        fmt = logging.Formatter(
-            "[%(asctime)s] %(name)s %(levelname)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        console.setFormatter(fmt)
-        logger.addHandler(console)
-        _CONFIGURED = True
+        with _CONFIGURE_LOCK:
+            if not _CONFIGURED:
+                log_level = getattr(logging, (level or "INFO").upper(), logging.INFO)
+                logger.setLevel(log_level)
+
+                console = logging.StreamHandler(sys.stderr)
+                console.setLevel(log_level)
+                fmt = logging.Formatter(
+                    "[%(asctime)s] %(name)s %(levelname)s: %(message)s",
+                    datefmt="%Y-%m-%d %H:%M:%S",
+                )
+                console.setFormatter(fmt)
+                logger.addHandler(console)
+                _CONFIGURED = True
 
     return logger
 
 
+def set_log_level(level: str, prefix: str = "nlp_pipeline") -> None:
+    """Set *level* on every existing logger (and handler) under *prefix*."""
+    log_level = getattr(logging, level.upper(), logging.INFO)
+    for name in list(logging.root.manager.loggerDict):
+        if name == prefix or name.startswith(prefix + "."):
+            logger = logging.getLogger(name)
+            logger.setLevel(log_level)
+            for handler in logger.handlers:
+                handler.setLevel(log_level)
+
+
+def log_memo_ratio(
+    logger: logging.Logger, stage: str, n_rows: int, n_unique: int,
+) -> None:
+    """Log how many rows a memoized *stage* collapsed into unique texts."""
+    logger.info(
+        "%s: memoized %d rows -> %d unique texts (%.1f%% duplicates)",
+        stage,
+        n_rows,
+        n_unique,
+        (1 - n_unique / n_rows) * 100 if n_rows else 0.0,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Copy semantics
+# ---------------------------------------------------------------------------
+
+def copy_on_write() -> bool:
+    """Whether pandas copy-on-write is in effect (always, from pandas 3)."""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def resolve_copy(copy: bool) -> bool:
+    """The ``copy`` a stage must actually use.
+
+    ``copy=False`` hands out views that share the caller's columns, which is
+    only safe under copy-on-write; without it writing to a view could change
+    the caller's frame, so the stage copies after all.
+    """
+    if copy or copy_on_write():
+        return copy
+    logger = get_logger(__name__)
+    logger.debug("pandas copy-on-write is off; copy=False falls back to copying.")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Text columns
+# ---------------------------------------------------------------------------
+
+def to_arrow_strings(values: pd.Series) -> pd.Series:
+    """Return *values* as pandas' default string dtype.
+
+    With ``pyarrow`` installed that is an Arrow-backed column: one
+    contiguous buffer instead of a Python object per row, which pandas
+    shares (copy-on-write) between every column assigned from it.  Columns
+    that already have the dtype are returned without a copy.  Missing
+    values become ``NaN``.
+    """
+    if isinstance(values.dtype, pd.StringDtype) and values.dtype.na_value is not pd.NA:
+        return values
+    return values.astype("str")
+
+
+def factorize_texts(values: pd.Series) -> tuple[np.ndarray, pd.Series]:
+    """:func:`pandas.factorize` a text column for memoized processing.
+
+    Returns the codes and the distinct texts as an ``object`` Series (the
+    form the per-text stages iterate over); missing values form one group.
+    The column's values are hashed as Python objects even when it is
+    Arrow-backed: Arrow's dictionary encoding leaves several times the
+    column size resident in its memory pool, while the objects are needed
+    for the distinct texts anyway.
+    """
+    codes, uniques = pd.factorize(
+        values.to_numpy(dtype=object, na_value=None), use_na_sentinel=False,
+    )
+    return codes, pd.Series(uniques, dtype=object)
+
+
+# ---------------------------------------------------------------------------
+# Shared-memory transport
+# ---------------------------------------------------------------------------
+
+def _attach_shm(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment; the creating process owns and unlinks it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the segment with the resource
+        # tracker.  Child processes share the parent's tracker, which keeps
+        # a set of names, so the duplicate registration is harmless.
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedArray:
+    """A NumPy array backed by :mod:`multiprocessing.shared_memory`.
+
+    The creating process calls :meth:`create`, passes :attr:`handle` (a
+    small picklable tuple) to workers, which :meth:`attach` and write into
+    :attr:`array` in place.  Use as a context manager, or call
+    :meth:`close` -- the creator also unlinks the segment.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        shape: tuple[int, ...],
+        dtype: Any,
+        owner: bool,
+    ) -> None:
+        self._shm = shm
+        self._owner = owner
+        self.array: np.ndarray = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape: tuple[int, ...], dtype: Any) -> "SharedArray":
+        """Allocate a zero-filled shared array."""
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        shared = cls(shared_memory.SharedMemory(create=True, size=nbytes), shape, dtype, True)
+        shared.array.fill(0)
+        return shared
+
+    @classmethod
+    def attach(cls, handle: tuple[str, tuple[int, ...], str]) -> "SharedArray":
+        """Map the array described by *handle* (see :attr:`handle`)."""
+        name, shape, dtype = handle
+        return cls(_attach_shm(name), shape, np.dtype(dtype), False)
+
+    @property
+    def handle(self) -> tuple[str, tuple[int, ...], str]:
+        """``(segment name, shape, dtype)`` -- what workers need to attach."""
+        return self._shm.name, self.array.shape, self.array.dtype.str
+
+    def close(self) -> None:
+        """Unmap the array (and, for the creator, free the segment)."""
+        self.array = np.empty(0)  # drop the view before the buffer goes
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class SharedTexts:
+    """A column of strings packed into shared memory.
+
+    The texts are UTF-8 encoded back to back into one byte buffer, with an
+    ``int64`` offsets array (``n + 1`` entries) marking the boundaries.
+    Indexing decodes one slice straight from the shared buffer, so workers
+    never receive pickled strings.  Missing values are stored as ``""``.
+
+    >>> with SharedTexts.create(["a", "bé"]) as shared:
+    ...     worker_view = SharedTexts.attach(shared.handle)
+    ...     worker_view[1]
+    'bé'
+    """
+
+    def __init__(self, data: SharedArray, offsets: SharedArray) -> None:
+        self._data = data
+        self._offsets = offsets
+
+    @classmethod
+    def create(cls, texts: Iterable[Any]) -> "SharedTexts":
+        """Pack *texts* into new shared segments."""
+        encoded = [
+            (t if isinstance(t, str) else ("" if pd.isna(t) else str(t))).encode("utf-8")
+            for t in texts
+        ]
+        lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+        offsets = SharedArray.create((len(encoded) + 1,), np.int64)
+        np.cumsum(lengths, out=offsets.array[1:])
+        data = SharedArray.create((int(offsets.array[-1]),), np.uint8)
+        data.array[:] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(data, offsets)
+
+    @classmethod
+    def attach(cls, handle: tuple[tuple, tuple]) -> "SharedTexts":
+        """Map the texts described by *handle* (see :attr:`handle`)."""
+        data, offsets = handle
+        return cls(SharedArray.attach(data), SharedArray.attach(offsets))
+
+    @property
+    def handle(self) -> tuple[tuple, tuple]:
+        """Picklable handle for :meth:`attach`."""
+        return self._data.handle, self._offsets.handle
+
+    def __len__(self) -> int:
+        return len(self._offsets.array) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, stop = self._offsets.array[i], self._offsets.array[i + 1]
+        return str(self._data.array[start:stop].data, "utf-8")
+
+    def close(self) -> None:
+        """Unmap the texts (and, for the creator, free the segments)."""
+        self._data.close()
+        self._offsets.close()
+
+    def __enter__(self) -> "SharedTexts":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
 # ---------------------------------------------------------------------------
 # I/O helpers
 # ---------------------------------------------------------------------------